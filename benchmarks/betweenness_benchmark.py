@@ -0,0 +1,165 @@
+"""
+This module benchmarks the dependency accumulation of betweenness on a large
+random graph, comparing the level-by-level sweeps with solving the two
+triangular systems, both with scipy's spsolve_triangular and row by row in
+Python, as the spsolve_triangular of scipy 1.7.1 does.
+
+Run it with: python -m benchmarks.betweenness_benchmark
+"""
+
+import timeit
+from typing import Callable, Tuple
+import numpy as np
+from scipy import sparse  # type: ignore
+from scipy.sparse.linalg import spsolve_triangular  # type: ignore
+from sumgraph.algorithm.centrality import (
+    accumulate_dependencies,
+    iterate_distances,
+    shortest_path_matrix,
+)
+
+
+VERTEX_COUNT = 5000
+EDGE_COUNT = 25000
+SOURCE_COUNT = 50
+
+Edges = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def solve_rows(matrix: sparse.csr_matrix, vector: np.ndarray) -> np.ndarray:
+    """
+    Solve (I + matrix) x = vector for a strictly lower triangular matrix one
+    row at a time, as the spsolve_triangular of scipy 1.7.1 does
+    """
+    solution = vector.copy()
+
+    for row in range(matrix.shape[0]):
+        row_slice = slice(matrix.indptr[row], matrix.indptr[row + 1])
+        solution[row] -= np.dot(
+            solution[matrix.indices[row_slice]], matrix.data[row_slice]
+        )
+
+    return solution
+
+
+def triangular_accumulate_dependencies(
+    source: int,
+    distances: np.ndarray,
+    edges: Edges,
+    solve: Callable[[sparse.csr_matrix, np.ndarray, bool], np.ndarray],
+) -> np.ndarray:
+    """
+    The original accumulation, which solves (I - A^T) path counts = unit source
+    and (I - A) y = 1 / path counts for the shortest path graph A
+    """
+    (order, path_matrix) = shortest_path_matrix(source, distances, edges)
+
+    unit_source = np.zeros(len(order))
+    unit_source[0] = 1
+    path_counts = solve(-path_matrix.T.tocsr(), unit_source, True)
+    scaled_dependencies = solve(-path_matrix.tocsr(), 1 / path_counts, False)
+
+    dependencies = np.zeros(len(distances))
+    dependencies[order] = path_counts * scaled_dependencies - 1
+    dependencies[source] = 0
+
+    return dependencies
+
+
+def spsolve(matrix: sparse.csr_matrix, vector: np.ndarray, lower: bool) -> np.ndarray:
+    """
+    Solve a triangular system with a unit diagonal with scipy
+    """
+    return spsolve_triangular(matrix, vector, lower=lower, unit_diagonal=True)
+
+
+def row_solve(matrix: sparse.csr_matrix, vector: np.ndarray, lower: bool) -> np.ndarray:
+    """
+    Solve a triangular system with a unit diagonal row by row, reversing an
+    upper triangular system into a lower triangular one
+    """
+    if lower:
+        return solve_rows(matrix, vector)
+
+    return solve_rows(matrix[::-1, ::-1].tocsr(), vector[::-1])[::-1]
+
+
+def build_matrix(rng: np.random.Generator) -> sparse.csr_matrix:
+    """
+    Build a directed graph with random edges whose integer lengths give many
+    shortest paths of the same length
+    """
+    matrix = sparse.csr_matrix(
+        (
+            rng.integers(1, 4, EDGE_COUNT).astype(float),
+            (
+                rng.integers(0, VERTEX_COUNT, EDGE_COUNT),
+                rng.integers(0, VERTEX_COUNT, EDGE_COUNT),
+            ),
+        ),
+        shape=(VERTEX_COUNT, VERTEX_COUNT),
+    )
+    matrix.setdiag(0)
+    matrix.eliminate_zeros()
+
+    return matrix
+
+
+def main():
+    """
+    Time each way of accumulating the dependencies of the same sources and
+    print the results
+    """
+    rng = np.random.default_rng(0)
+    matrix = build_matrix(rng)
+    coo_matrix = matrix.tocoo()
+    edges = (coo_matrix.row, coo_matrix.col, coo_matrix.data)
+    sources = np.sort(rng.choice(VERTEX_COUNT, size=SOURCE_COUNT, replace=False))
+    source_distances = [
+        (source, distances)
+        for (block, block_distances) in iterate_distances(matrix, sources, True)
+        for (source, distances) in zip(block.tolist(), block_distances)
+    ]
+
+    def run(accumulate):
+        return sum(
+            accumulate(source, distances, edges)
+            for (source, distances) in source_distances
+        )
+
+    row_time = timeit.timeit(
+        lambda: run(
+            lambda *args: triangular_accumulate_dependencies(*args, solve=row_solve)
+        ),
+        number=1,
+    )
+    spsolve_time = timeit.timeit(
+        lambda: run(
+            lambda *args: triangular_accumulate_dependencies(*args, solve=spsolve)
+        ),
+        number=1,
+    )
+    level_time = timeit.timeit(lambda: run(accumulate_dependencies), number=1)
+
+    np.testing.assert_allclose(
+        run(accumulate_dependencies),
+        run(lambda *args: triangular_accumulate_dependencies(*args, solve=spsolve)),
+    )
+
+    print(
+        "%d sources on %d vertices and %d edges"
+        % (SOURCE_COUNT, VERTEX_COUNT, matrix.nnz)
+    )
+    print("  row-by-row solves:     %10.6f s" % row_time)
+    print(
+        "  spsolve_triangular:    %10.6f s (%.1fx)"
+        % (spsolve_time, row_time / spsolve_time)
+    )
+    print(
+        "  level sweeps:          %10.6f s (%.1fx)"
+        % (level_time, row_time / level_time)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+This module benchmarks closest_sorted_array_search on a large array of sample
+timestamps, comparing a slicing recursive search, the non-copying search, and
+the batched search.
+
+Run it with: python -m benchmarks.closest_sorted_array_search_benchmark
+"""
+
+import timeit
+from typing import List, Tuple
+import numpy as np
+from sumgraph.helper.closest_sorted_array_search import (
+    closest_sorted_array_search,
+    closest_sorted_array_search_batch,
+)
+
+
+SAMPLE_COUNT = 1_000_000
+QUERY_COUNT = 1_000
+
+
+def slicing_closest_sorted_array_search(
+    array: List[float], target: float
+) -> Tuple[int, float]:
+    """
+    The original recursive search, which slices the array at every level
+    """
+    array_length = len(array)
+
+    if array_length == 1:
+        return (0, array[0])
+
+    middle_index = int(array_length / 2)
+    middle_value = array[middle_index]
+
+    if target > middle_value:
+        (right_index, right_value) = slicing_closest_sorted_array_search(
+            array=array[middle_index:], target=target
+        )
+        if abs(middle_value - target) > abs(right_value - target):
+            return (right_index + middle_index, right_value)
+
+    if target < middle_value:
+        (left_index, left_value) = slicing_closest_sorted_array_search(
+            array=array[0:middle_index], target=target
+        )
+        if abs(middle_value - target) > abs(left_value - target):
+            return (left_index, left_value)
+
+    return (middle_index, middle_value)
+
+
+def main():
+    """
+    Time each search over the same queries and print the results
+    """
+    rng = np.random.default_rng(0)
+    timestamps = np.cumsum(rng.uniform(0.5, 1.5, SAMPLE_COUNT))
+    timestamp_list: List[float] = timestamps.tolist()
+    targets = rng.uniform(timestamps[0], timestamps[-1], QUERY_COUNT)
+
+    slicing_time = timeit.timeit(
+        lambda: [
+            slicing_closest_sorted_array_search(array=timestamp_list, target=target)
+            for target in targets
+        ],
+        number=1,
+    )
+    scalar_time = timeit.timeit(
+        lambda: [
+            closest_sorted_array_search(array=timestamp_list, target=target)
+            for target in targets
+        ],
+        number=1,
+    )
+    batch_time = timeit.timeit(
+        lambda: closest_sorted_array_search_batch(array=timestamps, targets=targets),
+        number=1,
+    )
+
+    print("%d queries on %d samples" % (QUERY_COUNT, SAMPLE_COUNT))
+    print("  slicing search:     %10.6f s" % slicing_time)
+    print(
+        "  non-copying search: %10.6f s (%.0fx)"
+        % (scalar_time, slicing_time / scalar_time)
+    )
+    print(
+        "  batched search:     %10.6f s (%.0fx)"
+        % (batch_time, slicing_time / batch_time)
+    )
+
+
+if __name__ == "__main__":
+    main()
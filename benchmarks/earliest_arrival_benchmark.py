@@ -0,0 +1,138 @@
+"""
+This module benchmarks the earliest-arrival engine on many departure times
+from one source of a large sampled graph, comparing run_many with one run per
+departure time and with relaxing every departure time together in rounds.
+
+Run it with: python -m benchmarks.earliest_arrival_benchmark
+"""
+
+import math
+import timeit
+import numpy as np
+from sumgraph.algorithm.earliest_arrival import EarliestArrivalEngine
+from sumgraph.model.dynamic_weighted_graph.dynamic_weighted_graph import (
+    DynamicWeightedGraph,
+)
+from sumgraph.model.dynamic_weighted_graph.edge_weight_fn import (
+    evaluate_edge_weight_fn,
+)
+from sumgraph.model.dynamic_weighted_graph.nearest_sample_edge_weight_fn import (
+    NearestSampleEdgeWeightFn,
+)
+
+
+VERTEX_COUNT = 500
+EDGE_COUNT = 2500
+SAMPLE_COUNT = 200
+DEPARTURE_COUNT = 64
+
+
+def round_based_run_many(
+    engine: EarliestArrivalEngine, source_vertex: str, departure_times: np.ndarray
+) -> np.ndarray:
+    """
+    The original run_many, which relaxes every departure time together, one
+    edge at a time over the whole array of departure times, until no arrival
+    time improves
+    """
+    source_id = engine.get_vertex_id(source_vertex)
+    arrival_times = np.full((len(engine.vertices), len(departure_times)), math.inf)
+    arrival_times[source_id] = departure_times
+
+    changed = [source_id]
+    while changed:
+        is_changed = np.zeros(len(engine.vertices), dtype=bool)
+
+        for vertex_id in changed:
+            departures = arrival_times[vertex_id]
+            is_reached = np.isfinite(departures)
+
+            for neighbor_id, weight_function in engine.edges[vertex_id]:
+                candidates = np.full(len(departures), math.inf)
+                candidates[is_reached] = departures[
+                    is_reached
+                ] + evaluate_edge_weight_fn(weight_function, departures[is_reached])
+
+                improved = candidates < arrival_times[neighbor_id]
+                if np.any(improved):
+                    arrival_times[neighbor_id, improved] = candidates[improved]
+                    is_changed[neighbor_id] = True
+
+        changed = list(np.flatnonzero(is_changed))
+
+    return arrival_times.T
+
+
+def build_graph(rng: np.random.Generator) -> DynamicWeightedGraph:
+    """
+    Build a directed graph with random edges whose traversal times are
+    sampled on a shared time grid
+    """
+    dwg = DynamicWeightedGraph(name="benchmark", directed=True)
+    vertices = ["V%d" % index for index in range(VERTEX_COUNT)]
+    for vertex in vertices:
+        dwg.add_vertex(vertex)
+
+    sample_times = np.linspace(0.0, 1000.0, SAMPLE_COUNT)
+    edge_count = 0
+    while edge_count < EDGE_COUNT:
+        (source_id, target_id) = rng.integers(0, VERTEX_COUNT, size=2).tolist()
+        if source_id == target_id or dwg.has_edge_weight(
+            vertices[source_id], vertices[target_id]
+        ):
+            continue
+
+        dwg.define_edge_weight(
+            source_vertex=vertices[source_id],
+            target_vertex=vertices[target_id],
+            weight_function=NearestSampleEdgeWeightFn(
+                sample_times, rng.uniform(1.0, 10.0, SAMPLE_COUNT)
+            ),
+        )
+        edge_count += 1
+
+    return dwg
+
+
+def main():
+    """
+    Time each way of answering the same departure times and print the
+    results
+    """
+    rng = np.random.default_rng(0)
+    engine = EarliestArrivalEngine(build_graph(rng))
+    departure_times = np.linspace(0.0, 500.0, DEPARTURE_COUNT)
+
+    round_time = timeit.timeit(
+        lambda: round_based_run_many(engine, "V0", departure_times), number=1
+    )
+    loop_time = timeit.timeit(
+        lambda: [
+            engine.run("V0", departure_time) for departure_time in departure_times
+        ],
+        number=1,
+    )
+    many_time = timeit.timeit(lambda: engine.run_many("V0", departure_times), number=1)
+
+    np.testing.assert_array_equal(
+        engine.run_many("V0", departure_times),
+        [engine.run("V0", departure_time)[0] for departure_time in departure_times],
+    )
+
+    print(
+        "%d departure times on %d vertices and %d edges"
+        % (DEPARTURE_COUNT, VERTEX_COUNT, EDGE_COUNT)
+    )
+    print("  round-based relaxation: %10.6f s" % round_time)
+    print(
+        "  one run per departure:  %10.6f s (%.1fx)"
+        % (loop_time, round_time / loop_time)
+    )
+    print(
+        "  run_many:               %10.6f s (%.1fx)"
+        % (many_time, round_time / many_time)
+    )
+
+
+if __name__ == "__main__":
+    main()
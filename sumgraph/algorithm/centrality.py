@@ -0,0 +1,470 @@
+"""
+This module computes centrality measures of the vertices of a summary graph
+and fills a CentralityMap with them. Every measure works on the graph as a
+sparse matrix whose entry (i, j) is the weight of the edge from vertex i to
+vertex j, leaving out edges with an infinite weight. Closeness and
+betweenness read weights as lengths, while strength, eigenvector centrality
+and PageRank read them as strengths.
+"""
+
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+import numpy as np
+from scipy import sparse  # type: ignore
+from scipy.sparse.csgraph import connected_components, dijkstra  # type: ignore
+from sumgraph.model.centrality_map.centrality_enum import CentralityEnum
+from sumgraph.model.centrality_map.centrality_map import CentralityMap
+from sumgraph.model.summary_graph.csr_summary_graph import CsrSummaryGraph
+from sumgraph.model.summary_graph.summary_graph import SummaryGraph
+
+
+Graph = Union[SummaryGraph, CsrSummaryGraph]
+
+# Shortest path distances are computed for a block of sources at a time, with
+# at most this many distances in memory at once
+MAX_DISTANCE_BLOCK_SIZE = 2**24
+
+
+def to_sparse_matrix(graph: Graph) -> Tuple[List[str], sparse.csr_matrix]:
+    """
+    This function converts a graph to a list of vertices and a sparse matrix
+    whose rows and columns follow that list
+    """
+
+    if isinstance(graph, SummaryGraph):
+        graph = CsrSummaryGraph.from_summary_graph(graph)
+
+    source_ids = np.repeat(np.arange(graph.vertex_count), graph.out_degrees())
+    is_finite = np.isfinite(graph.weights)
+    matrix = sparse.csr_matrix(
+        (
+            graph.weights[is_finite],
+            (source_ids[is_finite], graph.indices[is_finite]),
+        ),
+        shape=(graph.vertex_count, graph.vertex_count),
+    )
+
+    return (list(graph.vertices), matrix)
+
+
+def check_lengths(matrix: sparse.csr_matrix) -> None:
+    """
+    This function checks that edge weights can be read as lengths, which must
+    be non-negative
+    """
+
+    if np.any(matrix.data < 0):
+        raise ValueError("edge lengths must be non-negative")
+
+
+def iterate_distances(
+    matrix: sparse.csr_matrix, sources: np.ndarray, weighted: bool
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    This function yields blocks of sources along with the shortest path
+    distance from each of them to every vertex, as a (sources x vertices)
+    array where unreachable vertices are infinitely far
+    """
+    block_size = max(1, MAX_DISTANCE_BLOCK_SIZE // max(matrix.shape[0], 1))
+
+    for block_start in range(0, len(sources), block_size):
+        block = sources[block_start : block_start + block_size]
+        distances = dijkstra(
+            matrix, directed=True, indices=block, unweighted=not weighted
+        )
+
+        yield (block, np.atleast_2d(distances))
+
+
+def degree_centrality(matrix: sparse.csr_matrix, incoming: bool = False) -> np.ndarray:
+    """
+    This function counts the edges leaving, or entering, every vertex
+    """
+
+    return np.asarray(matrix.getnnz(axis=0 if incoming else 1), dtype=float)
+
+
+def strength_centrality(
+    matrix: sparse.csr_matrix, incoming: bool = False
+) -> np.ndarray:
+    """
+    This function sums the weights of the edges leaving, or entering, every
+    vertex
+    """
+
+    return np.asarray(matrix.sum(axis=0 if incoming else 1), dtype=float).ravel()
+
+
+def closeness_centrality(
+    matrix: sparse.csr_matrix, incoming: bool = False, weighted: bool = True
+) -> np.ndarray:
+    """
+    This function finds the closeness of every vertex: the number of other
+    vertices it reaches, or is reached from, over their total distance, scaled
+    by the fraction of all other vertices that it reaches (Wasserman and
+    Faust). A vertex that reaches no other vertex has a closeness of zero.
+    """
+    check_lengths(matrix)
+    vertex_count = matrix.shape[0]
+    closeness = np.zeros(vertex_count)
+
+    if incoming:
+        matrix = matrix.T.tocsr()
+
+    for sources, distances in iterate_distances(
+        matrix, np.arange(vertex_count), weighted
+    ):
+        is_reached = np.isfinite(distances)
+        reached_counts = is_reached.sum(axis=1) - 1
+        totals = np.where(is_reached, distances, 0.0).sum(axis=1)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            closeness[sources] = np.where(
+                totals > 0,
+                reached_counts / totals * reached_counts / max(vertex_count - 1, 1),
+                0.0,
+            )
+
+    return closeness
+
+
+def eigenvector_centrality(
+    matrix: sparse.csr_matrix, max_iterations: int = 100, tolerance: float = 1e-6
+) -> np.ndarray:
+    """
+    This function finds the eigenvector centrality of every vertex by power
+    iteration, where a vertex is central if it is pointed to by strong edges
+    from central vertices. The result has unit Euclidean norm.
+    """
+    vertex_count = matrix.shape[0]
+    transposed = matrix.T.tocsr()
+    centrality = np.full(vertex_count, 1.0 / max(vertex_count, 1))
+
+    # Iterating on the shifted matrix A + I converges on periodic graphs too
+    for _ in range(max_iterations):
+        previous = centrality
+        centrality = previous + transposed @ previous
+        norm = np.linalg.norm(centrality)
+        if norm > 0:
+            centrality = centrality / norm
+
+        if np.abs(centrality - previous).sum() < vertex_count * tolerance:
+            return centrality
+
+    raise RuntimeWarning(
+        "eigenvector centrality did not converge in %d iterations" % max_iterations
+    )
+
+
+def pagerank_centrality(
+    matrix: sparse.csr_matrix,
+    damping: float = 0.85,
+    max_iterations: int = 100,
+    tolerance: float = 1e-6,
+) -> np.ndarray:
+    """
+    This function finds the PageRank of every vertex by power iteration, where
+    a random walk follows each edge in proportion to its weight, and jumps to
+    a vertex chosen uniformly at random with probability 1 - damping or when
+    it reaches a vertex without outgoing weight
+    """
+    vertex_count = matrix.shape[0]
+    if vertex_count == 0:
+        return np.zeros(0)
+
+    out_strengths = np.asarray(matrix.sum(axis=1), dtype=float).ravel()
+    is_dangling = out_strengths == 0
+    inverse_strengths = np.zeros(vertex_count)
+    inverse_strengths[~is_dangling] = 1 / out_strengths[~is_dangling]
+    transitions = (sparse.diags(inverse_strengths) @ matrix).T.tocsr()
+
+    rank = np.full(vertex_count, 1.0 / vertex_count)
+    for _ in range(max_iterations):
+        previous = rank
+        rank = (
+            damping
+            * (transitions @ previous + previous[is_dangling].sum() / vertex_count)
+            + (1 - damping) / vertex_count
+        )
+
+        if np.abs(rank - previous).sum() < vertex_count * tolerance:
+            return rank
+
+    raise RuntimeWarning("PageRank did not converge in %d iterations" % max_iterations)
+
+
+def rank_components(
+    component_count: int, component_sources: np.ndarray, component_targets: np.ndarray
+) -> np.ndarray:
+    """
+    This function ranks the components of a DAG of components, so that every
+    edge goes from a lower rank to a higher one
+    """
+    ranks = np.zeros(component_count, dtype=np.int64)
+
+    # The longest chain of edges into every component settles within one pass
+    # per component
+    for _ in range(component_count):
+        next_ranks = ranks.copy()
+        np.maximum.at(next_ranks, component_targets, ranks[component_sources] + 1)
+        if np.array_equal(next_ranks, ranks):
+            break
+        ranks = next_ranks
+
+    return ranks
+
+
+def rank_ties(
+    source: int,
+    vertex_count: int,
+    path_sources: np.ndarray,
+    path_targets: np.ndarray,
+    is_tie: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    This function ranks vertices along the edges of a shortest path graph that
+    join two vertices at the same distance, which have zero length. The first
+    rank orders the cycles of such edges, and the vertices on none, so that
+    every edge between two of them goes to a higher rank. The second rank is
+    the number of edges within its cycle from a vertex entered from outside
+    it, so that every vertex of a cycle is entered from one ranked before it.
+    """
+    if not np.any(is_tie):
+        return (np.zeros(vertex_count, dtype=np.int64), np.zeros(vertex_count))
+
+    (tie_sources, tie_targets) = (path_sources[is_tie], path_targets[is_tie])
+    (component_count, labels) = connected_components(
+        sparse.csr_matrix(
+            (np.ones(len(tie_sources)), (tie_sources, tie_targets)),
+            shape=(vertex_count, vertex_count),
+        ),
+        directed=True,
+        connection="strong",
+    )
+    is_within = labels[tie_sources] == labels[tie_targets]
+    component_ranks = rank_components(
+        component_count,
+        labels[tie_sources[~is_within]],
+        labels[tie_targets[~is_within]],
+    )
+
+    is_entry = np.zeros(vertex_count, dtype=bool)
+    is_entry[path_targets[labels[path_sources] != labels[path_targets]]] = True
+    is_entry[source] = True
+    hops = dijkstra(
+        sparse.csr_matrix(
+            (
+                np.ones(np.count_nonzero(is_within)),
+                (tie_sources[is_within], tie_targets[is_within]),
+            ),
+            shape=(vertex_count, vertex_count),
+        ),
+        directed=True,
+        indices=np.flatnonzero(is_entry),
+        unweighted=True,
+        min_only=True,
+    )
+
+    return (component_ranks[labels], hops)
+
+
+def shortest_path_matrix(
+    source: int,
+    distances: np.ndarray,
+    edges: Tuple[np.ndarray, np.ndarray, np.ndarray],
+) -> Tuple[np.ndarray, sparse.csr_matrix]:
+    """
+    This function orders the vertices reached from a source by distance and
+    returns that order along with a strictly upper triangular matrix in it:
+    entry (i, j) is 1 when the edge from the i-th to the j-th vertex is on a
+    shortest path from the source. Vertices at the same distance are ordered
+    along the zero-length edges between them, and only the edges of a cycle
+    of zero-length edges that follow that order are kept.
+    """
+    (edge_sources, edge_targets, lengths) = edges
+
+    on_path = (
+        np.isfinite(distances[edge_sources])
+        & np.isclose(
+            distances[edge_sources] + lengths,
+            distances[edge_targets],
+            rtol=1e-12,
+            atol=0,
+        )
+        & (edge_targets != source)
+    )
+    (path_sources, path_targets) = (edge_sources[on_path], edge_targets[on_path])
+    (component_ranks, hops) = rank_ties(
+        source,
+        len(distances),
+        path_sources,
+        path_targets,
+        distances[path_sources] >= distances[path_targets],
+    )
+
+    reached = np.flatnonzero(np.isfinite(distances))
+    order = reached[
+        np.lexsort((hops[reached], component_ranks[reached], distances[reached]))
+    ]
+    positions = np.full(len(distances), -1, dtype=np.int64)
+    positions[order] = np.arange(len(order))
+    is_forward = positions[path_sources] < positions[path_targets]
+
+    return (
+        order,
+        sparse.csr_matrix(
+            (
+                np.ones(np.count_nonzero(is_forward)),
+                (
+                    positions[path_sources[is_forward]],
+                    positions[path_targets[is_forward]],
+                ),
+            ),
+            shape=(len(order), len(order)),
+        ),
+    )
+
+
+def split_levels(
+    path_matrix: sparse.csr_matrix,
+) -> Tuple[List[np.ndarray], List[sparse.csr_matrix]]:
+    """
+    This function splits the vertices of a shortest path graph into levels:
+    every vertex is in the level after the last of its predecessors, so that
+    every edge goes to a higher level. It returns the levels along with the
+    rows of the matrix for each of them.
+    """
+    in_degrees = np.bincount(path_matrix.indices, minlength=path_matrix.shape[0])
+    level = np.flatnonzero(in_degrees == 0)
+    levels: List[np.ndarray] = []
+    level_rows: List[sparse.csr_matrix] = []
+
+    while len(level) > 0:
+        rows = path_matrix[level]
+        levels.append(level)
+        level_rows.append(rows)
+
+        # A vertex joins the next level once the edges from all of its
+        # predecessors have been seen
+        np.subtract.at(in_degrees, rows.indices, 1)
+        targets = np.unique(rows.indices)
+        level = targets[in_degrees[targets] == 0]
+
+    return (levels, level_rows)
+
+
+def accumulate_dependencies(
+    source: int,
+    distances: np.ndarray,
+    edges: Tuple[np.ndarray, np.ndarray, np.ndarray],
+) -> np.ndarray:
+    """
+    This function finds the dependency of a source on every vertex, that is,
+    the fraction of shortest paths from the source through that vertex,
+    summed over all targets (Brandes). Rather than visiting vertices one by
+    one, it sweeps the shortest path graph a level at a time: forwards for
+    the number of shortest paths to every vertex, and backwards for the
+    dependencies.
+    """
+    (order, path_matrix) = shortest_path_matrix(source, distances, edges)
+    (levels, level_rows) = split_levels(path_matrix)
+
+    # The source comes first: every other vertex at distance zero is reached
+    # from it along zero-length edges, so it is ranked after it
+    path_counts = np.zeros(len(order))
+    path_counts[0] = 1
+    for level, rows in zip(levels, level_rows):
+        np.add.at(
+            path_counts,
+            rows.indices,
+            np.repeat(path_counts[level], np.diff(rows.indptr)),
+        )
+
+    # With y = (1 + dependency) / path count, Brandes' recurrence becomes
+    # y = 1 / path count + A y, which is settled one level at a time from the
+    # last level
+    scaled_dependencies = np.zeros(len(order))
+    for level, rows in zip(reversed(levels), reversed(level_rows)):
+        scaled_dependencies[level] = 1 / path_counts[level] + rows @ scaled_dependencies
+
+    dependencies = np.zeros(len(distances))
+    dependencies[order] = path_counts * scaled_dependencies - 1
+    dependencies[source] = 0
+
+    return dependencies
+
+
+def betweenness_centrality(
+    matrix: sparse.csr_matrix,
+    weighted: bool = True,
+    normalized: bool = True,
+    sample_count: Optional[int] = None,
+    seed: Optional[int] = None,
+) -> np.ndarray:
+    """
+    This function finds the betweenness of every vertex: the fraction of
+    shortest paths between other pairs of vertices that go through it. Given
+    a sample_count, only that many sources, chosen at random, are searched
+    and the result is scaled up to estimate the exact betweenness.
+    """
+    check_lengths(matrix)
+    vertex_count = matrix.shape[0]
+    betweenness = np.zeros(vertex_count)
+
+    if sample_count is None:
+        sources = np.arange(vertex_count)
+    else:
+        sources = np.sort(
+            np.random.default_rng(seed).choice(
+                vertex_count, size=min(sample_count, vertex_count), replace=False
+            )
+        )
+
+    coo_matrix = matrix.tocoo()
+    edges = (
+        coo_matrix.row,
+        coo_matrix.col,
+        coo_matrix.data if weighted else np.ones(coo_matrix.nnz),
+    )
+
+    for block, distances in iterate_distances(matrix, sources, weighted):
+        for source, source_distances in zip(block.tolist(), distances):
+            betweenness += accumulate_dependencies(source, source_distances, edges)
+
+    scale = 1.0
+    if normalized and vertex_count > 2:
+        scale /= (vertex_count - 1) * (vertex_count - 2)
+
+    if len(sources) > 0:
+        scale *= vertex_count / len(sources)
+
+    return betweenness * scale
+
+
+CENTRALITY_FUNCTIONS: Dict[CentralityEnum, Callable[..., np.ndarray]] = {
+    CentralityEnum.DEGREE: degree_centrality,
+    CentralityEnum.STRENGTH: strength_centrality,
+    CentralityEnum.CLOSENESS: closeness_centrality,
+    CentralityEnum.EIGENVECTOR: eigenvector_centrality,
+    CentralityEnum.PAGERANK: pagerank_centrality,
+    CentralityEnum.BETWEENNESS: betweenness_centrality,
+}
+
+
+def compute_centrality(
+    graph: Graph,
+    measure: CentralityEnum,
+    name: Optional[str] = None,
+    **options: Any,
+) -> CentralityMap:
+    """
+    This function computes a centrality measure for every vertex of a graph
+    and returns it as a CentralityMap, named after the graph unless a name is
+    given. Any options are passed on to the function for the measure.
+    """
+    (vertices, matrix) = to_sparse_matrix(graph)
+    values = CENTRALITY_FUNCTIONS[measure](matrix, **options)
+
+    return CentralityMap.from_vertex_weights(
+        name=graph.name if name is None else name,
+        vertex_weights=dict(zip(vertices, values.tolist())),
+    )
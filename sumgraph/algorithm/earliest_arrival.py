@@ -0,0 +1,269 @@
+"""
+This module computes earliest-arrival routes on a DynamicWeightedGraph whose
+edge weights are traversal times: leaving u at time t along the edge (u, v)
+arrives at v at time t + w_uv(t). Edges are assumed to be FIFO, so leaving
+later never arrives earlier and waiting at a vertex never helps.
+"""
+
+import heapq
+import math
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from sumgraph.helper.closest_sorted_array_search import closest_sorted_array_search
+from sumgraph.model.dynamic_weighted_graph.convention_enum import ConventionEnum
+from sumgraph.model.dynamic_weighted_graph.dynamic_weighted_graph import (
+    DynamicWeightedGraph,
+)
+from sumgraph.model.dynamic_weighted_graph.edge_weight_fn import EdgeWeightFn
+from sumgraph.model.dynamic_weighted_graph.nearest_sample_edge_weight_fn import (
+    NearestSampleEdgeWeightFn,
+)
+from sumgraph.model.dynamic_weighted_graph.sample_table import SampleTable
+
+
+NO_PREDECESSOR = -1
+
+
+class OutEdges:
+    """
+    This class holds the outgoing edges of one vertex and evaluates all of
+    their weights at a single time. Edges backed by samples on a shared time
+    grid resolve that time to a sample index once and then only look up
+    values, and edges that are columns of the same SampleTable read a single
+    row of it; every other edge is called one at a time.
+    """
+
+    def __init__(self, edges: Sequence[Tuple[int, EdgeWeightFn]]) -> None:
+        self.neighbor_ids = np.array(
+            [neighbor_id for (neighbor_id, _) in edges], dtype=np.int64
+        )
+
+        self._sampled_groups: Dict[int, Tuple[np.ndarray, List[int], List[np.ndarray]]]
+        self._sampled_groups = {}
+        self._table_groups: Dict[int, Tuple[SampleTable, List[int], List[int]]] = {}
+        self._other_edges: List[Tuple[int, EdgeWeightFn]] = []
+
+        for position, (_, weight_function) in enumerate(edges):
+            if (
+                isinstance(weight_function, NearestSampleEdgeWeightFn)
+                and weight_function.table is not None
+            ):
+                (_, positions, columns) = self._table_groups.setdefault(
+                    id(weight_function.table), (weight_function.table, [], [])
+                )
+                positions.append(position)
+                columns.append(weight_function.column)
+            elif isinstance(weight_function, NearestSampleEdgeWeightFn):
+                (_, positions, samples) = self._sampled_groups.setdefault(
+                    id(weight_function.sample_times),
+                    (weight_function.sample_times, [], []),
+                )
+                positions.append(position)
+                samples.append(weight_function.samples)
+            else:
+                self._other_edges.append((position, weight_function))
+
+    def __len__(self) -> int:
+        return len(self.neighbor_ids)
+
+    def evaluate(self, time: float) -> np.ndarray:
+        """
+        Evaluate the weight of every outgoing edge at a single time
+        """
+        weights = np.empty(len(self.neighbor_ids), dtype=float)
+
+        for table, positions, columns in self._table_groups.values():
+            weights[positions] = table.row(time)[columns]
+
+        for sample_times, positions, samples in self._sampled_groups.values():
+            (index, _) = closest_sorted_array_search(array=sample_times, target=time)
+            weights[positions] = [series[index] for series in samples]
+
+        for position, weight_function in self._other_edges:
+            weights[position] = weight_function(time)
+
+        return weights
+
+
+class EarliestArrivalEngine:
+    """
+    This class answers earliest-arrival queries on a DynamicWeightedGraph. It
+    builds an integer-indexed adjacency list once, so that queries do not go
+    through the vertex and edge validation of the graph.
+    """
+
+    def __init__(self, dwg: DynamicWeightedGraph) -> None:
+        if dwg.convention != ConventionEnum.TRAVERSAL_TIME:
+            raise ValueError(
+                "earliest arrival requires the TRAVERSAL_TIME convention, got %s"
+                % dwg.convention
+            )
+
+        self.vertex_index = dwg.get_vertex_index()
+        self.vertices = sorted(self.vertex_index, key=self.vertex_index.__getitem__)
+
+        edges: List[List[Tuple[int, EdgeWeightFn]]] = [[] for _ in self.vertices]
+        for source_vertex, target_vertex in dwg.get_edges():
+            weight_function = dwg.edge_set[source_vertex][target_vertex]
+            source_id = self.vertex_index[source_vertex]
+            target_id = self.vertex_index[target_vertex]
+
+            edges[source_id].append((target_id, weight_function))
+            if not dwg.directed and source_id != target_id:
+                edges[target_id].append((source_id, weight_function))
+
+        self.edges = edges
+        self.out_edges = [OutEdges(vertex_edges) for vertex_edges in edges]
+
+    def get_vertex_id(self, vertex: str) -> int:
+        """
+        This method returns the integer id of a vertex
+        """
+        if vertex not in self.vertex_index:
+            raise ValueError("vertex %s is not in graph" % vertex)
+
+        return self.vertex_index[vertex]
+
+    def run(
+        self,
+        source_vertex: str,
+        departure_time: float,
+        target_vertex: Optional[str] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        This method runs a time-dependent Dijkstra search from a source vertex,
+        stopping early once the target vertex, if any, is settled. It returns
+        the arrival time at every vertex id, which is infinite for unreached
+        vertices, and the predecessor of every vertex id on its route.
+        """
+        source_id = self.get_vertex_id(source_vertex)
+        target_id = None if target_vertex is None else self.get_vertex_id(target_vertex)
+
+        arrival_times = np.full(len(self.vertices), math.inf)
+        predecessors = np.full(len(self.vertices), NO_PREDECESSOR, dtype=np.int64)
+
+        arrival_times[source_id] = departure_time
+        frontier: List[Tuple[float, int]] = [(departure_time, source_id)]
+
+        while frontier:
+            (time, vertex_id) = heapq.heappop(frontier)
+
+            # A vertex is only pushed when its arrival time strictly improves,
+            # so any entry later than the best known arrival time is stale
+            if time > arrival_times[vertex_id]:
+                continue
+
+            if vertex_id == target_id:
+                break
+
+            (neighbor_ids, neighbor_times) = self._relax(vertex_id, time, arrival_times)
+            arrival_times[neighbor_ids] = neighbor_times
+            predecessors[neighbor_ids] = vertex_id
+
+            for neighbor_id, arrival_time in zip(
+                neighbor_ids.tolist(), neighbor_times.tolist()
+            ):
+                heapq.heappush(frontier, (arrival_time, neighbor_id))
+
+        return (arrival_times, predecessors)
+
+    def _relax(
+        self, vertex_id: int, time: float, arrival_times: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        This method evaluates every outgoing edge of a vertex reached at a time
+        at once, and returns the neighbor ids whose arrival times improve along
+        with their new arrival times
+        """
+        out_edges = self.out_edges[vertex_id]
+        if len(out_edges) == 0:
+            return (out_edges.neighbor_ids, np.zeros(0))
+
+        candidates = time + out_edges.evaluate(time)
+        improved = candidates < arrival_times[out_edges.neighbor_ids]
+
+        return (out_edges.neighbor_ids[improved], candidates[improved])
+
+    def run_many(
+        self, source_vertex: str, departure_times: Union[Sequence[float], np.ndarray]
+    ) -> np.ndarray:
+        """
+        This method finds the arrival time at every vertex id for many
+        departure times, as a (departure times x vertices) array. Every
+        departure time gets its own heap-ordered search, as in run(), and the
+        searches share the OutEdges of the engine, so edges backed by a
+        SampleTable also share its resolved sample times.
+        """
+        self.get_vertex_id(source_vertex)
+        departure_array = np.asarray(departure_times, dtype=float)
+        arrival_times = np.full((len(departure_array), len(self.vertices)), math.inf)
+
+        for row, departure_time in enumerate(departure_array.tolist()):
+            (arrival_times[row], _) = self.run(
+                source_vertex=source_vertex, departure_time=departure_time
+            )
+
+        return arrival_times
+
+
+def earliest_arrival_times(
+    dwg: DynamicWeightedGraph, source_vertex: str, departure_time: float
+) -> Dict[str, float]:
+    """
+    This function finds the earliest arrival time at every vertex when leaving
+    the source vertex at the departure time. Unreachable vertices get infinity.
+    """
+    engine = EarliestArrivalEngine(dwg)
+    (arrival_times, _) = engine.run(
+        source_vertex=source_vertex, departure_time=departure_time
+    )
+
+    return dict(zip(engine.vertices, arrival_times.tolist()))
+
+
+def earliest_arrival_path(
+    dwg: DynamicWeightedGraph,
+    source_vertex: str,
+    target_vertex: str,
+    departure_time: float,
+) -> Tuple[float, List[str]]:
+    """
+    This function finds the earliest arrival time at the target vertex when
+    leaving the source vertex at the departure time, along with the route. If
+    the target is unreachable, the arrival time is infinite and the route is
+    empty.
+    """
+    engine = EarliestArrivalEngine(dwg)
+    (arrival_times, predecessors) = engine.run(
+        source_vertex=source_vertex,
+        departure_time=departure_time,
+        target_vertex=target_vertex,
+    )
+
+    target_id = engine.get_vertex_id(target_vertex)
+    if math.isinf(arrival_times[target_id]):
+        return (math.inf, [])
+
+    path = [target_id]
+    while predecessors[path[-1]] != NO_PREDECESSOR:
+        path.append(int(predecessors[path[-1]]))
+
+    return (
+        float(arrival_times[target_id]),
+        [engine.vertices[vertex_id] for vertex_id in reversed(path)],
+    )
+
+
+def earliest_arrival_times_for_departures(
+    dwg: DynamicWeightedGraph,
+    source_vertex: str,
+    departure_times: Union[Sequence[float], np.ndarray],
+) -> np.ndarray:
+    """
+    This function finds the earliest arrival time at every vertex for each of
+    many departure times from the source vertex, as a (departure times x
+    vertices) array whose columns follow dwg.get_vertex_index()
+    """
+    engine = EarliestArrivalEngine(dwg)
+
+    return engine.run_many(source_vertex=source_vertex, departure_times=departure_times)
@@ -0,0 +1,97 @@
+"""
+This module walks a DynamicWeightedGraph through a sequence of times, such as
+the sample times of the data it was adapted from, and reports only the edges
+whose weight changed from one time to the next. Incremental algorithms can
+then do work in proportion to the changes rather than to the number of edges.
+"""
+
+from typing import Iterator, List, Optional, Sequence, TypedDict
+import numpy as np
+from sumgraph.model.dynamic_weighted_graph.dynamic_weighted_graph import (
+    DynamicWeightedGraph,
+    Edge,
+)
+from sumgraph.model.dynamic_weighted_graph.edge_weight_fn import (
+    TimeArray,
+    evaluate_edge_weight_fn,
+    get_default_edge_weight_fn,
+)
+
+
+# The number of times whose edge weights are evaluated together
+DEFAULT_TIME_CHUNK_SIZE = 256
+
+
+class EdgeDelta(TypedDict):
+    """
+    This class is a type declaration for the edges whose weight changed at a
+    time: edge_ids index the list of edges being walked, previous_weights are
+    the weights last reported for them and weights their weights at that time
+    """
+
+    time: float
+    edge_ids: np.ndarray
+    edges: List[Edge]
+    previous_weights: np.ndarray
+    weights: np.ndarray
+
+
+def iterate_edge_deltas(
+    dwg: DynamicWeightedGraph,
+    times: TimeArray,
+    tolerance: float = 0.0,
+    edges: Optional[Sequence[Edge]] = None,
+    time_chunk_size: int = DEFAULT_TIME_CHUNK_SIZE,
+) -> Iterator[EdgeDelta]:
+    """
+    This function yields one EdgeDelta per time, in order, with the edges
+    whose weight moved by more than the tolerance since it was last reported,
+    so that weights kept up to date from the deltas never drift from the graph
+    by more than the tolerance. Before the first time, every edge is taken to
+    have the default weight of the convention, so the first delta lists the
+    edges that differ from an empty graph. If no edges are given, every edge
+    from get_edges is walked. The weights of a chunk of times are evaluated
+    together with evaluate_edge_weights.
+    """
+    time_array = np.asarray(times, dtype=float)
+    if time_array.ndim != 1:
+        raise ValueError("times must be a one-dimensional array")
+
+    if time_chunk_size <= 0:
+        raise ValueError("time_chunk_size must be positive, got %d" % time_chunk_size)
+
+    edge_list = list(dwg.get_edges() if edges is None else edges)
+    if len(time_array) == 0:
+        return
+
+    reported_weights = np.full(
+        len(edge_list),
+        evaluate_edge_weight_fn(
+            get_default_edge_weight_fn(dwg.convention), time_array[:1]
+        )[0],
+    )
+
+    for chunk_start in range(0, len(time_array), time_chunk_size):
+        chunk_times = time_array[chunk_start : chunk_start + time_chunk_size]
+        # One row per time, so that every step reads contiguous weights
+        chunk_weights = np.ascontiguousarray(
+            dwg.evaluate_edge_weights(chunk_times, edges=edge_list).T
+        )
+
+        for time, weights in zip(chunk_times.tolist(), chunk_weights):
+            # Equal weights, including two infinite ones, never count as a
+            # change
+            with np.errstate(invalid="ignore"):
+                edge_ids = np.flatnonzero(
+                    (weights != reported_weights)
+                    & ~(np.abs(weights - reported_weights) <= tolerance)
+                )
+
+            yield {
+                "time": time,
+                "edge_ids": edge_ids,
+                "edges": [edge_list[edge_id] for edge_id in edge_ids.tolist()],
+                "previous_weights": reported_weights[edge_ids],
+                "weights": weights[edge_ids],
+            }
+            reported_weights[edge_ids] = weights[edge_ids]
@@ -0,0 +1,425 @@
+"""
+This module summarizes a DynamicWeightedGraph over a time window into a
+SummaryGraph, by reducing the weight function of every edge to a single
+weight. The edges are split into fixed-size chunks that can be reduced by a
+pool of worker processes.
+"""
+
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from sumgraph.helper.find_integral_bound import (
+    BatchIntegrand,
+    NumericalOptions,
+    find_integral_bounds,
+)
+from sumgraph.model.dynamic_weighted_graph.convention_enum import ConventionEnum
+from sumgraph.model.dynamic_weighted_graph.dynamic_weighted_graph import (
+    DynamicWeightedGraph,
+)
+from sumgraph.model.dynamic_weighted_graph.edge_weight_fn import (
+    EdgeWeightFn,
+    ExactlyIntegrableEdgeWeightFn,
+    evaluate_edge_weight_fn,
+    get_default_edge_weight_fn,
+)
+from sumgraph.model.dynamic_weighted_graph.piecewise_edge_weight_fn import (
+    PiecewiseConstantEdgeWeightFn,
+)
+from sumgraph.model.summary_graph.summary_graph import SummaryGraph
+
+
+DEFAULT_CHUNK_SIZE = 256
+
+
+class Reducer(ABC):  # pylint: disable=too-few-public-methods
+    """
+    This class reduces the weight functions of many edges over a time window to
+    a single weight per edge. A reducer must give every edge the same weight no
+    matter which other edges it is reduced with, and must be picklable to be
+    used by worker processes.
+    """
+
+    @abstractmethod
+    def reduce(
+        self,
+        weight_functions: Sequence[EdgeWeightFn],
+        convention: ConventionEnum,
+        start_time: float,
+        end_time: float,
+    ) -> np.ndarray:
+        """
+        Reduce every weight function over [start_time, end_time], returning an
+        array with one weight per weight function
+        """
+
+
+class TimeAverageReducer(Reducer):  # pylint: disable=too-few-public-methods
+    """
+    This reducer gives every edge its average weight over the window. Weight
+    functions with an exact integral are averaged exactly, and all others are
+    integrated numerically to within the given tolerance on the average.
+    """
+
+    def __init__(self, tolerance: float = 1e-6) -> None:
+        self.tolerance = tolerance
+
+    def reduce(
+        self,
+        weight_functions: Sequence[EdgeWeightFn],
+        convention: ConventionEnum,
+        start_time: float,
+        end_time: float,
+    ) -> np.ndarray:
+        width = end_time - start_time
+        averages = np.empty(len(weight_functions), dtype=float)
+        numerical_positions: List[int] = []
+
+        for position, weight_function in enumerate(weight_functions):
+            if isinstance(weight_function, ExactlyIntegrableEdgeWeightFn):
+                (lower_integral, upper_integral) = weight_function.cumulative_integral(
+                    np.array([start_time, end_time])
+                )
+                averages[position] = (upper_integral - lower_integral) / width
+            else:
+                numerical_positions.append(position)
+
+        if len(numerical_positions) > 0:
+            query_count = len(numerical_positions)
+            batch_integrand = BatchIntegrand(
+                integrable_functions=[weight_functions[i] for i in numerical_positions],
+                query_count=query_count,
+                tolerance=self.tolerance * width,
+            )
+            averages[numerical_positions] = (
+                batch_integrand.integrate(
+                    np.arange(query_count),
+                    np.full(query_count, start_time),
+                    np.full(query_count, end_time),
+                )
+                / width
+            )
+
+        return averages
+
+
+class ExistenceFractionReducer(Reducer):  # pylint: disable=too-few-public-methods
+    """
+    This reducer gives every edge the fraction of the window during which it
+    exists, that is, during which its weight differs from the default weight
+    of the convention. Step functions are measured exactly, and all others are
+    checked at sample_count evenly spaced times.
+    """
+
+    def __init__(self, sample_count: int = 1024) -> None:
+        if sample_count <= 0:
+            raise ValueError("sample_count must be positive, got %d" % sample_count)
+
+        self.sample_count = sample_count
+
+    def reduce(
+        self,
+        weight_functions: Sequence[EdgeWeightFn],
+        convention: ConventionEnum,
+        start_time: float,
+        end_time: float,
+    ) -> np.ndarray:
+        width = end_time - start_time
+        fractions = np.empty(len(weight_functions), dtype=float)
+        sample_times = (
+            start_time
+            + (np.arange(self.sample_count) + 0.5) * width / self.sample_count
+        )
+
+        for position, weight_function in enumerate(weight_functions):
+            step_function = get_step_function(weight_function)
+
+            if step_function is None:
+                fractions[position] = np.mean(
+                    edge_exists(
+                        convention,
+                        evaluate_edge_weight_fn(weight_function, sample_times),
+                    )
+                )
+                continue
+
+            # The edge exists on every step whose value is not the default, so
+            # integrating that indicator measures the time the edge exists
+            indicator = PiecewiseConstantEdgeWeightFn(
+                breakpoints=step_function.breakpoints,
+                values=edge_exists(convention, step_function.values),
+            )
+            (lower_integral, upper_integral) = indicator.cumulative_integral(
+                np.array([start_time, end_time])
+            )
+            fractions[position] = (upper_integral - lower_integral) / width
+
+        return fractions
+
+
+class EffectiveTraversalTimeReducer(Reducer):  # pylint: disable=too-few-public-methods
+    """
+    This reducer treats every edge weight as a rate, such as a capacity, and
+    gives every edge the average time needed to move target_value units across
+    it when leaving at departure_count evenly spaced times in the window. The
+    time for a single departure is found with find_integral_bounds, and a
+    transfer that cannot finish by the maximum upper bound, which defaults to
+    one window length after the window, takes infinitely long.
+    """
+
+    def __init__(
+        self,
+        target_value: float = 1.0,
+        departure_count: int = 16,
+        numerical_options: Optional[NumericalOptions] = None,
+    ) -> None:
+        if departure_count <= 0:
+            raise ValueError(
+                "departure_count must be positive, got %d" % departure_count
+            )
+
+        self.target_value = target_value
+        self.departure_count = departure_count
+        self.numerical_options = numerical_options
+
+    def reduce(
+        self,
+        weight_functions: Sequence[EdgeWeightFn],
+        convention: ConventionEnum,
+        start_time: float,
+        end_time: float,
+    ) -> np.ndarray:
+        width = end_time - start_time
+        departure_times = (
+            start_time
+            + (np.arange(self.departure_count) + 0.5) * width / self.departure_count
+        )
+
+        numerical_options: NumericalOptions = {"max_upper_bound": end_time + width}
+        numerical_options.update(self.numerical_options or {})
+
+        upper_bounds = find_integral_bounds(
+            integrable_functions=[
+                weight_function
+                for weight_function in weight_functions
+                for _ in range(self.departure_count)
+            ],
+            lower_bounds=np.tile(departure_times, len(weight_functions)),
+            target_values=np.full(
+                len(weight_functions) * self.departure_count, self.target_value
+            ),
+            numerical_options=numerical_options,
+        )
+
+        return np.mean(
+            upper_bounds.reshape(len(weight_functions), self.departure_count)
+            - departure_times,
+            axis=1,
+        )
+
+
+def get_step_function(
+    weight_function: EdgeWeightFn,
+) -> Optional[PiecewiseConstantEdgeWeightFn]:
+    """
+    This function returns a weight function as a PiecewiseConstantEdgeWeightFn
+    if it is a step function, or None otherwise. Weight functions that are
+    step functions in another form, such as NearestSampleEdgeWeightFn and
+    IntervalEdgeWeightFn, expose it as their piecewise_constant attribute.
+    """
+
+    if isinstance(weight_function, PiecewiseConstantEdgeWeightFn):
+        return weight_function
+
+    step_function = getattr(weight_function, "piecewise_constant", None)
+    if isinstance(step_function, PiecewiseConstantEdgeWeightFn):
+        return step_function
+
+    return None
+
+
+def edge_exists(convention: ConventionEnum, weights: np.ndarray) -> np.ndarray:
+    """
+    This function checks which weights stand for an existing edge under a
+    convention, which is every weight other than the constant default weight
+    of the convention
+    """
+    default_weight = get_default_edge_weight_fn(convention)(0.0)
+
+    return np.asarray(weights, dtype=float) != default_weight
+
+
+class SummaryTask:  # pylint: disable=too-few-public-methods
+    """
+    This class holds everything needed to reduce any chunk of the edges of a
+    graph, so that worker processes receive it once and each work unit only
+    names a range of edge positions
+    """
+
+    def __init__(
+        self,
+        weight_functions: Sequence[EdgeWeightFn],
+        reducer: Reducer,
+        convention: ConventionEnum,
+        window: Tuple[float, float],
+    ) -> None:
+        self.weight_functions = weight_functions
+        self.reducer = reducer
+        self.convention = convention
+        self.window = window
+
+    def run(self, chunk: Tuple[int, int]) -> np.ndarray:
+        """
+        Reduce the edges at positions [chunk[0], chunk[1])
+        """
+        (start_time, end_time) = self.window
+
+        return self.reducer.reduce(
+            weight_functions=self.weight_functions[chunk[0] : chunk[1]],
+            convention=self.convention,
+            start_time=start_time,
+            end_time=end_time,
+        )
+
+
+# The task of the current worker process, set once when the worker starts
+WORKER_TASK: Optional[SummaryTask] = None
+
+
+def initialize_worker(task: SummaryTask) -> None:
+    """
+    This function stores the task in a worker process when it starts
+    """
+    global WORKER_TASK  # pylint: disable=global-statement
+    WORKER_TASK = task
+
+
+def run_worker_chunk(chunk: Tuple[int, int]) -> np.ndarray:
+    """
+    This function reduces a chunk of edges with the task of the worker process
+    """
+    assert WORKER_TASK is not None
+
+    return WORKER_TASK.run(chunk)
+
+
+def reduce_edges(
+    task: SummaryTask, edge_count: int, jobs: int, chunk_size: int
+) -> np.ndarray:
+    """
+    This function reduces every edge of a task in chunks of chunk_size edges,
+    using a pool of worker processes when there is more than one job
+    """
+    chunks = [
+        (chunk_start, min(chunk_start + chunk_size, edge_count))
+        for chunk_start in range(0, edge_count, chunk_size)
+    ]
+
+    if jobs == 1 or len(chunks) <= 1:
+        chunk_weights = [task.run(chunk) for chunk in chunks]
+    else:
+        # The task is sent to each worker once, and map returns the chunks in
+        # order no matter which worker finishes first
+        with ProcessPoolExecutor(
+            max_workers=min(jobs, len(chunks)),
+            initializer=initialize_worker,
+            initargs=(task,),
+        ) as executor:
+            chunk_weights = list(executor.map(run_worker_chunk, chunks))
+
+    return np.concatenate(chunk_weights) if chunk_weights else np.zeros(0)
+
+
+def summarize(
+    dwg: DynamicWeightedGraph,
+    reducer: Reducer,
+    window: Tuple[float, float],
+    jobs: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> SummaryGraph:
+    """
+    This function summarizes a DynamicWeightedGraph over the time window
+    (start_time, end_time) into a SummaryGraph, where every edge gets the
+    weight the reducer assigns to its weight function and an undirected edge
+    is set in both directions. With more than one job, chunks of chunk_size
+    edges are reduced by a pool of worker processes, and every weight function
+    and the reducer must then be picklable. The chunks do not depend on the
+    number of jobs, so the summary does not either.
+    """
+    (start_time, end_time) = window
+
+    if not start_time < end_time:
+        raise ValueError(
+            "start_time must be before end_time, got %f and %f" % (start_time, end_time)
+        )
+
+    if jobs <= 0:
+        raise ValueError("jobs must be positive, got %d" % jobs)
+
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive, got %d" % chunk_size)
+
+    edges = dwg.get_edges()
+    task = SummaryTask(
+        weight_functions=[
+            dwg.edge_set[source_vertex][target_vertex]
+            for (source_vertex, target_vertex) in edges
+        ],
+        reducer=reducer,
+        convention=dwg.convention,
+        window=(start_time, end_time),
+    )
+    weights = reduce_edges(task, len(edges), jobs=jobs, chunk_size=chunk_size)
+
+    summary_graph = SummaryGraph(name=dwg.name)
+    for vertex in sorted(dwg.vertex_set):
+        summary_graph.add_vertex(vertex)
+
+    for (source_vertex, target_vertex), weight in zip(edges, weights.tolist()):
+        summary_graph.set_edge_weight(
+            source_vertex=source_vertex, target_vertex=target_vertex, weight=weight
+        )
+
+        if not dwg.directed and source_vertex != target_vertex:
+            summary_graph.set_edge_weight(
+                source_vertex=target_vertex, target_vertex=source_vertex, weight=weight
+            )
+
+    return summary_graph
+
+
+def summarize_time_average(
+    dwg: DynamicWeightedGraph, window: Tuple[float, float], jobs: int = 1
+) -> SummaryGraph:
+    """
+    This function summarizes a graph by the average weight of every edge
+    """
+
+    return summarize(dwg, TimeAverageReducer(), window, jobs=jobs)
+
+
+def summarize_existence_fraction(
+    dwg: DynamicWeightedGraph, window: Tuple[float, float], jobs: int = 1
+) -> SummaryGraph:
+    """
+    This function summarizes a graph by the fraction of time every edge exists
+    """
+
+    return summarize(dwg, ExistenceFractionReducer(), window, jobs=jobs)
+
+
+def summarize_effective_traversal_time(
+    dwg: DynamicWeightedGraph,
+    window: Tuple[float, float],
+    target_value: float = 1.0,
+    jobs: int = 1,
+) -> SummaryGraph:
+    """
+    This function summarizes a graph by the average time needed to move
+    target_value units across every edge
+    """
+
+    return summarize(
+        dwg, EffectiveTraversalTimeReducer(target_value=target_value), window, jobs=jobs
+    )
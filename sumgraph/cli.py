@@ -1,11 +1,509 @@
 """
-The main entrypoint to our CLI
+The main entrypoint to our CLI. It runs the batch pipeline from SOAP reports
+to centrality measures, one step per subcommand or all of them with run:
+ingest the reports and adapt them into a DynamicWeightedGraph, summarize it
+over a time window, compute a centrality measure of the summary, and export
+the results. Every step saves its output with sumgraph.model.binary_io, so
+the next one can pick up from it.
 """
 
+import argparse
+import csv
+import glob
+import os
+import sys
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from sumgraph.algorithm.centrality import Graph, compute_centrality
+from sumgraph.algorithm.summarize import (
+    EffectiveTraversalTimeReducer,
+    ExistenceFractionReducer,
+    Reducer,
+    TimeAverageReducer,
+    summarize,
+)
+from sumgraph.data_handler.data_accessor.connections_soap_accessor import (
+    ConnectionsSoapAccessor,
+)
+from sumgraph.data_handler.data_accessor.data_type import (
+    ConnectionsSoapAccessorData,
+    SatelliteName,
+)
+from sumgraph.data_handler.data_accessor.distances_soap_accessor import (
+    DistancesSoapAccessor,
+)
+from sumgraph.data_handler.data_accessor.multi_file_distances_soap_accessor import (
+    MultiFileDistancesSoapAccessor,
+)
+from sumgraph.data_handler.data_accessor.parsed_data_cache import ParsedDataCache
+from sumgraph.data_handler.data_adapter.connections_soap_to_dynamic_weighted_graph_adapter import (
+    ConnectionsSoapToDynamicWeightedGraphAdapter,
+)
+from sumgraph.data_handler.data_adapter.distances_soap_to_dynamic_weighted_graph_adapter import (
+    DistancesSoapToDynamicWeightedGraphAdapter,
+)
+from sumgraph.helper.binary_container import read_header
+from sumgraph.helper.stage_profiler import StageProfiler
+from sumgraph.model.binary_io import (
+    CENTRALITY_MAP_KIND,
+    SUMMARY_GRAPH_KIND,
+    load_centrality_map,
+    load_dynamic_weighted_graph,
+    load_summary_graph,
+    save_centrality_map,
+    save_dynamic_weighted_graph,
+    save_summary_graph,
+)
+from sumgraph.model.centrality_map.centrality_enum import CentralityEnum
+from sumgraph.model.centrality_map.centrality_map import CentralityMap
+from sumgraph.model.dynamic_weighted_graph.dynamic_weighted_graph import (
+    DynamicWeightedGraph,
+)
+from sumgraph.model.summary_graph.csr_summary_graph import CsrSummaryGraph
+from sumgraph.model.summary_graph.summary_graph import SummaryGraph
 
-def main():
+
+REDUCERS: Dict[str, Callable[[], Reducer]] = {
+    "time-average": TimeAverageReducer,
+    "existence-fraction": ExistenceFractionReducer,
+    "effective-traversal-time": EffectiveTraversalTimeReducer,
+}
+
+MEASURES = [measure.name.lower() for measure in CentralityEnum]
+
+# The files run writes to its output directory
+GRAPH_FILENAME = "graph.bin"
+SUMMARY_FILENAME = "summary.bin"
+CENTRALITY_FILENAME = "centrality.bin"
+SUMMARY_CSV_FILENAME = "summary.csv"
+CENTRALITY_CSV_FILENAME = "centrality.csv"
+
+
+def expand_filepaths(patterns: Sequence[str]) -> List[str]:
+    """
+    This function expands every glob pattern in a list of paths, in order,
+    leaving plain paths as they are
+    """
+    filepaths: List[str] = []
+
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern))
+            if len(matches) == 0:
+                raise ValueError("no files match %s" % pattern)
+            filepaths.extend(matches)
+        else:
+            filepaths.append(pattern)
+
+    return filepaths
+
+
+def parse_satellites(satellites: Optional[str]) -> Optional[List[SatelliteName]]:
+    """
+    This function splits a comma-separated list of satellites
+    """
+    if satellites is None:
+        return None
+
+    return [satellite.strip() for satellite in satellites.split(",") if satellite]
+
+
+def select_connections(
+    data: ConnectionsSoapAccessorData,
+    satellites: Optional[List[SatelliteName]] = None,
+    time_window: Optional[Tuple[float, float]] = None,
+) -> ConnectionsSoapAccessorData:
+    """
+    This function keeps the connections between the selected satellites, with
+    their windows clipped to the time window
+    """
+    kept = data["satellites"] if satellites is None else satellites
+    (window_start, window_end) = (
+        (-np.inf, np.inf) if time_window is None else time_window
+    )
+
+    return {
+        "satellites": [
+            satellite for satellite in data["satellites"] if satellite in kept
+        ],
+        "connections": {
+            source: {
+                target: [
+                    (max(rise, window_start), min(set_, window_end))
+                    for (rise, set_) in windows
+                    if rise < window_end and set_ > window_start
+                ]
+                for (target, windows) in targets.items()
+                if target in kept
+            }
+            for (source, targets) in data["connections"].items()
+            if source in kept
+        },
+    }
+
+
+def ingest_and_adapt(
+    args: argparse.Namespace, profiler: StageProfiler
+) -> DynamicWeightedGraph:
+    """
+    This function reads the SOAP reports named on the command line, restricted
+    to the selected satellites and time window, and adapts them into a graph
+    """
+    filepaths = expand_filepaths(args.inputs)
+    cache = None if args.cache_dir is None else ParsedDataCache(args.cache_dir)
+    satellites = parse_satellites(args.satellites)
+    time_window = None if args.time_window is None else tuple(args.time_window)
+
+    if args.source == "connections":
+        if len(filepaths) != 1:
+            raise ValueError("connections are read from a single report")
+
+        with profiler.stage("ingest", "windows") as record:
+            data = select_connections(
+                ConnectionsSoapAccessor(filepaths[0], cache=cache).run().data,
+                satellites=satellites,
+                time_window=time_window,
+            )
+            record["items"] = sum(
+                len(windows)
+                for targets in data["connections"].values()
+                for windows in targets.values()
+            )
+
+        with profiler.stage("adapt", "edges") as record:
+            dwg = ConnectionsSoapToDynamicWeightedGraphAdapter.adapt_data_to_model(data)
+            record["items"] = len(dwg.get_edges())
+
+        return dwg
+
+    with profiler.stage("ingest", "samples") as record:
+        accessor: Union[DistancesSoapAccessor, MultiFileDistancesSoapAccessor] = (
+            DistancesSoapAccessor(filepaths[0], cache=cache)
+            if len(filepaths) == 1
+            else MultiFileDistancesSoapAccessor(filepaths, jobs=args.jobs, cache=cache)
+        )
+        columnar_data = (
+            accessor.select(satellites=satellites, time_range=time_window)
+            .run()
+            .columnar_data
+        )
+        record["items"] = int(columnar_data["distances"].size)
+
+    with profiler.stage("adapt", "edges") as record:
+        dwg = DistancesSoapToDynamicWeightedGraphAdapter.adapt_columnar_data_to_model(
+            columnar_data
+        )
+        record["items"] = len(dwg.get_edges())
+
+    return dwg
+
+
+def summarize_graph(
+    args: argparse.Namespace, dwg: DynamicWeightedGraph, profiler: StageProfiler
+) -> SummaryGraph:
+    """
+    This function summarizes a graph over the time window with the reducer
+    named on the command line
+    """
+    with profiler.stage("summarize", "edges") as record:
+        summary_graph = summarize(
+            dwg,
+            REDUCERS[args.reducer](),
+            window=tuple(args.time_window),
+            jobs=args.jobs,
+        )
+        record["items"] = len(dwg.get_edges())
+
+    return summary_graph
+
+
+def compute_centrality_map(
+    args: argparse.Namespace,
+    summary_graph: Graph,
+    profiler: StageProfiler,
+) -> CentralityMap:
+    """
+    This function computes the centrality measure named on the command line
+    """
+    with profiler.stage("centrality", "vertices") as record:
+        centrality_map = compute_centrality(
+            summary_graph, CentralityEnum[args.measure.upper()]
+        )
+        record["items"] = len(centrality_map.vertex_set)
+
+    return centrality_map
+
+
+def export_summary_graph(summary_graph: Graph, filepath: str) -> int:
+    """
+    This function writes every edge of a summary graph as a row of a CSV file
+    and returns the number of rows
+    """
+    if isinstance(summary_graph, SummaryGraph):
+        summary_graph = CsrSummaryGraph.from_summary_graph(summary_graph)
+
+    vertices = np.array(summary_graph.vertices, dtype=object)
+    sources = vertices[
+        np.repeat(np.arange(summary_graph.vertex_count), np.diff(summary_graph.offsets))
+    ]
+    targets = vertices[summary_graph.indices]
+
+    with open(filepath, "w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["source", "target", "weight"])
+        writer.writerows(zip(sources, targets, summary_graph.weights.tolist()))
+
+    return summary_graph.edge_count
+
+
+def export_centrality_map(centrality_map: CentralityMap, filepath: str) -> int:
+    """
+    This function writes the weight of every vertex of a centrality map as a
+    row of a CSV file and returns the number of rows
+    """
+    with open(filepath, "w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["vertex", "weight"])
+        writer.writerows(sorted(centrality_map.vertex_weights.items()))
+
+    return len(centrality_map.vertex_weights)
+
+
+def run_adapt(args: argparse.Namespace, profiler: StageProfiler) -> None:
+    """
+    This function runs the adapt subcommand
+    """
+    dwg = ingest_and_adapt(args, profiler)
+
+    with profiler.stage("save", "edges") as record:
+        save_dynamic_weighted_graph(dwg, args.output)
+        record["items"] = len(dwg.get_edges())
+
+
+def run_summarize(args: argparse.Namespace, profiler: StageProfiler) -> None:
+    """
+    This function runs the summarize subcommand
+    """
+    with profiler.stage("load", "edges") as record:
+        dwg = load_dynamic_weighted_graph(args.graph)
+        record["items"] = len(dwg.get_edges())
+
+    summary_graph = summarize_graph(args, dwg, profiler)
+
+    with profiler.stage("save", "edges") as record:
+        save_summary_graph(summary_graph, args.output)
+        record["items"] = sum(
+            len(targets) for targets in summary_graph.edge_set.values()
+        )
+
+
+def run_centrality(args: argparse.Namespace, profiler: StageProfiler) -> None:
+    """
+    This function runs the centrality subcommand
+    """
+    with profiler.stage("load", "edges") as record:
+        summary_graph = load_summary_graph(args.summary)
+        record["items"] = summary_graph.edge_count
+
+    centrality_map = compute_centrality_map(args, summary_graph, profiler)
+
+    with profiler.stage("save", "vertices") as record:
+        save_centrality_map(centrality_map, args.output)
+        record["items"] = len(centrality_map.vertex_set)
+
+
+def run_export(args: argparse.Namespace, profiler: StageProfiler) -> None:
+    """
+    This function runs the export subcommand, on a summary graph or a
+    centrality map
+    """
+    with profiler.stage("export", "rows") as record:
+        kind = read_header(args.input)["kind"]
+
+        if kind == SUMMARY_GRAPH_KIND:
+            record["items"] = export_summary_graph(
+                load_summary_graph(args.input), args.output
+            )
+        elif kind == CENTRALITY_MAP_KIND:
+            record["items"] = export_centrality_map(
+                load_centrality_map(args.input), args.output
+            )
+        else:
+            raise ValueError(
+                "%s holds a %s, which cannot be exported" % (args.input, kind)
+            )
+
+
+def run_pipeline(args: argparse.Namespace, profiler: StageProfiler) -> None:
+    """
+    This function runs the run subcommand: every step in turn, saving the
+    output of each one to the output directory
+    """
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    dwg = ingest_and_adapt(args, profiler)
+    summary_graph = summarize_graph(args, dwg, profiler)
+    centrality_map = compute_centrality_map(args, summary_graph, profiler)
+
+    with profiler.stage("save", "edges") as record:
+        save_dynamic_weighted_graph(dwg, os.path.join(args.output_dir, GRAPH_FILENAME))
+        save_summary_graph(
+            summary_graph, os.path.join(args.output_dir, SUMMARY_FILENAME)
+        )
+        save_centrality_map(
+            centrality_map, os.path.join(args.output_dir, CENTRALITY_FILENAME)
+        )
+        record["items"] = len(dwg.get_edges())
+
+    with profiler.stage("export", "rows") as record:
+        record["items"] = export_summary_graph(
+            summary_graph, os.path.join(args.output_dir, SUMMARY_CSV_FILENAME)
+        ) + export_centrality_map(
+            centrality_map, os.path.join(args.output_dir, CENTRALITY_CSV_FILENAME)
+        )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    This function builds the parser for every subcommand
+    """
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "--profile",
+        action="store_true",
+        help="print the wall time, peak RSS and throughput of every stage",
+    )
+
+    ingest = argparse.ArgumentParser(add_help=False)
+    ingest.add_argument(
+        "inputs", nargs="+", help="SOAP reports to read, as paths or glob patterns"
+    )
+    ingest.add_argument(
+        "--source",
+        choices=["distances", "connections"],
+        default="distances",
+        help="the kind of SOAP report (default: distances)",
+    )
+    ingest.add_argument(
+        "--cache-dir", help="keep parsed reports in this directory for reuse"
+    )
+    ingest.add_argument(
+        "--satellites", help="a comma-separated list of the satellites to keep"
+    )
+
+    jobs = argparse.ArgumentParser(add_help=False)
+    jobs.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="the number of worker processes (default: 1)",
+    )
+
+    window = argparse.ArgumentParser(add_help=False)
+    window.add_argument(
+        "--time-window",
+        nargs=2,
+        type=float,
+        metavar=("START", "END"),
+        required=True,
+        help="the time window to summarize over",
+    )
+
+    reducer = argparse.ArgumentParser(add_help=False)
+    reducer.add_argument(
+        "--reducer",
+        choices=sorted(REDUCERS),
+        default="time-average",
+        help="how every edge is summarized (default: time-average)",
+    )
+
+    measure = argparse.ArgumentParser(add_help=False)
+    measure.add_argument(
+        "--measure",
+        choices=MEASURES,
+        default="degree",
+        help="the centrality measure (default: degree)",
+    )
+
+    parser = argparse.ArgumentParser(
+        prog="sumgraph", description="Summarize satellite constellation graphs."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    adapt_parser = subparsers.add_parser(
+        "adapt",
+        parents=[common, ingest, jobs],
+        help="read SOAP reports into a dynamic weighted graph",
+    )
+    adapt_parser.add_argument(
+        "--time-window",
+        nargs=2,
+        type=float,
+        metavar=("START", "END"),
+        help="only read the samples in this time window",
+    )
+    adapt_parser.add_argument("--output", required=True, help="the graph file")
+    adapt_parser.set_defaults(handler=run_adapt)
+
+    summarize_parser = subparsers.add_parser(
+        "summarize",
+        parents=[common, jobs, window, reducer],
+        help="summarize a dynamic weighted graph over a time window",
+    )
+    summarize_parser.add_argument("graph", help="a graph file written by adapt")
+    summarize_parser.add_argument("--output", required=True, help="the summary file")
+    summarize_parser.set_defaults(handler=run_summarize)
+
+    centrality_parser = subparsers.add_parser(
+        "centrality",
+        parents=[common, measure],
+        help="compute a centrality measure of a summary graph",
+    )
+    centrality_parser.add_argument("summary", help="a summary file")
+    centrality_parser.add_argument(
+        "--output", required=True, help="the centrality file"
+    )
+    centrality_parser.set_defaults(handler=run_centrality)
+
+    export_parser = subparsers.add_parser(
+        "export",
+        parents=[common],
+        help="write a summary or centrality file as CSV",
+    )
+    export_parser.add_argument("input", help="a summary or centrality file")
+    export_parser.add_argument("--output", required=True, help="the CSV file")
+    export_parser.set_defaults(handler=run_export)
+
+    run_parser = subparsers.add_parser(
+        "run",
+        parents=[common, ingest, jobs, window, reducer, measure],
+        help="run every step, from SOAP reports to CSV files",
+    )
+    run_parser.add_argument(
+        "--output-dir", required=True, help="the directory to write every output to"
+    )
+    run_parser.set_defaults(handler=run_pipeline)
+
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
     """
     The main entrypoint to our CLI
     """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if getattr(args, "jobs", 1) <= 0:
+        parser.error("--jobs must be positive")
+
+    profiler = StageProfiler()
+    try:
+        args.handler(args, profiler)
+    except (OSError, ValueError) as error:
+        parser.exit(1, "%s: error: %s\n" % (parser.prog, error))
+    finally:
+        if args.profile:
+            print(profiler.format_report(), file=sys.stderr)
 
-    print("sumgraph!")
+    return 0
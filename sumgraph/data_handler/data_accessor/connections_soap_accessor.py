@@ -2,14 +2,18 @@
 This module handles SOAP data that tracks connections between satellites.
 """
 
-import linecache
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+import numpy as np
 import pandas as pd
 from sumgraph.data_handler.data_accessor.data_type import (
     ConnectionsSoapAccessorData,
     SatelliteName,
 )
 from sumgraph.data_handler.data_accessor.file_based_accessor import FileBasedAccessor
+from sumgraph.data_handler.data_accessor.parsed_data_cache import (
+    CacheEntry,
+    ParsedDataCache,
+)
 from sumgraph.logger.logger import setup_logger
 
 
@@ -23,8 +27,8 @@ class ConnectionsSoapAccessor(FileBasedAccessor):
     This class is an accessor for SOAP connections data
     """
 
-    def __init__(self, filepath: str) -> None:
-        super().__init__(filepath)
+    def __init__(self, filepath: str, cache: Optional[ParsedDataCache] = None) -> None:
+        super().__init__(filepath, cache)
         self._dataframe: pd.DataFrame
         self._data: ConnectionsSoapAccessorData = {
             "satellites": [],
@@ -38,6 +42,52 @@ class ConnectionsSoapAccessor(FileBasedAccessor):
         """
         return self._data
 
+    def get_cache_entry(self) -> CacheEntry:
+        """
+        This method returns the connections as a cache entry: one row per
+        connection window, stored once for both directions
+        """
+        satellite_ids = {
+            satellite: index
+            for (index, satellite) in enumerate(self._data["satellites"])
+        }
+        rows: List[Tuple[int, int, float, float]] = []
+        for source, targets in self._data["connections"].items():
+            for target, windows in targets.items():
+                # A satellite that sees itself gets each window twice, once
+                # for each direction
+                if source == target:
+                    windows = windows[0::2]
+
+                if satellite_ids[source] <= satellite_ids[target]:
+                    rows.extend(
+                        (satellite_ids[source], satellite_ids[target], rise, set_)
+                        for (rise, set_) in windows
+                    )
+
+        return {
+            "arrays": {
+                "source_ids": np.array([row[0] for row in rows], dtype=np.int64),
+                "target_ids": np.array([row[1] for row in rows], dtype=np.int64),
+                "rise_times": np.array([row[2] for row in rows], dtype=float),
+                "set_times": np.array([row[3] for row in rows], dtype=float),
+            },
+            "metadata": {"satellites": self._data["satellites"]},
+        }
+
+    def set_cache_entry(self, entry: CacheEntry) -> None:
+        """
+        This method restores the connections from a cache entry
+        """
+        arrays = entry["arrays"]
+        self._data = ConnectionsSoapAccessor.convert_arrays_to_data(
+            satellites=list(entry["metadata"]["satellites"]),
+            source_ids=np.asarray(arrays["source_ids"]),
+            target_ids=np.asarray(arrays["target_ids"]),
+            rise_times=np.asarray(arrays["rise_times"]),
+            set_times=np.asarray(arrays["set_times"]),
+        )
+
     def run_read_file(self):
         """
         This method reads in the datafile
@@ -52,9 +102,7 @@ class ConnectionsSoapAccessor(FileBasedAccessor):
         #   6: the line that defines what units the data is in
         skiprows = [0, 1, 2, 3, 4, 6]
 
-        header_row = linecache.getline(
-            filename=self.filepath, lineno=0 + 1
-        )  # lineno indexing begins at 1, not 0
+        header_row = self.read_header_row()
         logger.info("parsing distances SOAP file: %s", header_row)
 
         # We only keep the first four columns, as we do not need the adjacency matrix
@@ -90,56 +138,104 @@ class ConnectionsSoapAccessor(FileBasedAccessor):
         dataframe: pd.DataFrame,
     ) -> ConnectionsSoapAccessorData:
         """
-        This method converts a datafram into the data expcted from this class
+        This method converts a datafram into the data expcted from this class.
+        Every column is converted as a whole rather than row by row.
         """
+        # Reports repeat the same few headers over many rows, so every distinct
+        # header is only parsed once
+        (header_ids, headers) = pd.factorize(dataframe["Analysis"])  # type: ignore
+        header_names = [
+            satellite
+            for header in headers
+            for satellite in ConnectionsSoapAccessor.extract_satellite_names_from_header(
+                header
+            )
+        ]
+
+        # Distinct headers are in order of first appearance, so numbering their
+        # satellites in turn numbers them in the order they appear row by row
+        (satellite_ids, satellites) = pd.factorize(  # type: ignore
+            np.array(header_names, dtype=object)
+        )
+
+        return ConnectionsSoapAccessor.convert_arrays_to_data(
+            satellites=list(satellites),
+            source_ids=satellite_ids[0::2][header_ids],
+            target_ids=satellite_ids[1::2][header_ids],
+            rise_times=dataframe["Rise"].to_numpy(dtype=float),
+            set_times=dataframe["Set"].to_numpy(dtype=float),
+        )
+
+    @staticmethod
+    def convert_arrays_to_data(
+        satellites: List[SatelliteName],
+        source_ids: np.ndarray,
+        target_ids: np.ndarray,
+        rise_times: np.ndarray,
+        set_times: np.ndarray,
+    ) -> ConnectionsSoapAccessorData:
+        """
+        This method converts connection windows, given as the ids of their
+        satellites and their rise and set times, into the data expected from
+        this class. Every window belongs to both directions of its pair, and
+        the windows of each are kept in the order they are given.
+        """
+        (order, groups) = ConnectionsSoapAccessor.group_windows_by_pair(
+            source_ids, target_ids
+        )
+        windows = list(
+            zip(
+                np.tile(rise_times, 2)[order].tolist(),
+                np.tile(set_times, 2)[order].tolist(),
+            )
+        )
 
-        satellites: List[str] = []
         connections: Dict[
             SatelliteName, Dict[SatelliteName, List[Tuple[float, float]]]
-        ] = {}
-
-        # Parse headers to get satellite names
-        headers: List[str] = list(dataframe["Analysis"])
-        for header in headers:
-            (
-                source,
-                target,
-            ) = ConnectionsSoapAccessor.extract_satellite_names_from_header(header)
-
-            if source not in satellites:
-                satellites.append(source)
-
-            if target not in satellites:
-                satellites.append(target)
-
-            if source not in connections:
-                connections[source] = {}
-
-            if target not in connections:
-                connections[target] = {}
-
-        # Parse rows for rise/set times
-        for _, row in dataframe.iterrows():
-            (
-                source,
-                target,
-            ) = ConnectionsSoapAccessor.extract_satellite_names_from_header(
-                row["Analysis"]  # type: ignore
-            )
-            rise_time: float = float(row["Rise"])  # type: ignore
-            set_time: float = float(row["Set"])  # type: ignore
-            time_tuple: Tuple[float, float] = (rise_time, set_time)
+        ] = {satellite: {} for satellite in satellites}
 
-            if target not in connections[source]:
-                connections[source][target] = []
+        for source_id, target_id, start, end in groups:
+            connections[satellites[source_id]][satellites[target_id]] = windows[
+                start:end
+            ]
 
-            if source not in connections[target]:
-                connections[target][source] = []
+        return {"satellites": list(satellites), "connections": connections}
 
-            connections[source][target].append(time_tuple)
-            connections[target][source].append(time_tuple)
+    @staticmethod
+    def group_windows_by_pair(
+        source_ids: np.ndarray, target_ids: np.ndarray
+    ) -> Tuple[np.ndarray, List[Tuple[int, int, int, int]]]:
+        """
+        This method sorts the windows of both directions of every pair, that
+        is, the windows followed by the same windows reversed, by pair and then
+        by row. It returns that order along with the source, target, start and
+        end of every pair within it, with pairs in order of their first window.
+        """
+        row_count = len(source_ids)
+        rows = np.tile(np.arange(row_count), 2)
+        sources = np.concatenate([source_ids, target_ids])
+        targets = np.concatenate([target_ids, source_ids])
+
+        order = np.lexsort((np.repeat([0, 1], row_count), rows, targets, sources))
+        (sources, targets) = (sources[order], targets[order])
+        group_starts = np.flatnonzero(
+            np.diff(sources, prepend=-1) | np.diff(targets, prepend=-1)
+        )
+        group_ends = np.append(group_starts[1:], len(order))
+
+        # Pairs are added in order of their first window, as when the windows
+        # are added one by one
+        group_order = np.argsort(rows[order][group_starts], kind="stable")
+        groups = list(
+            zip(
+                sources[group_starts][group_order].tolist(),
+                targets[group_starts][group_order].tolist(),
+                group_starts[group_order].tolist(),
+                group_ends[group_order].tolist(),
+            )
+        )
 
-        return {"satellites": satellites, "connections": connections}
+        return (order, groups)
 
     @staticmethod
     def extract_satellite_names_from_header(
@@ -2,12 +2,16 @@
 The modules provides type information on the data provided by data accessors.
 """
 
-from typing import Dict, List, Tuple, TypedDict, Union
+from typing import Dict, List, Mapping, Optional, Tuple, TypedDict, Union
+import numpy as np
 
 
 SatelliteName = str
 VisibilityPercentage = float
 
+# Samples are either Python lists or views of numeric arrays
+SampleSeries = Union[List[float], np.ndarray]
+
 
 class ParedDownSoapAccessorData(TypedDict):
     """
@@ -15,7 +19,18 @@ class ParedDownSoapAccessorData(TypedDict):
     """
 
     satellites: List[SatelliteName]
-    visibility: Dict[SatelliteName, Dict[SatelliteName, VisibilityPercentage]]
+    visibility: Mapping[SatelliteName, Mapping[SatelliteName, VisibilityPercentage]]
+
+
+class MatrixParedDownSoapAccessorData(TypedDict):
+    """
+    This class is a type declaration for the data provided by ParedDownSoapAccessor
+    in matrix form: visibility[i, j] is the visibility between satellites[i]
+    and satellites[j]
+    """
+
+    satellites: List[SatelliteName]
+    visibility: np.ndarray
 
 
 class DistancesSoapAccessorData(TypedDict):
@@ -24,8 +39,32 @@ class DistancesSoapAccessorData(TypedDict):
     """
 
     satellites: List[SatelliteName]
-    distances: Dict[SatelliteName, Dict[SatelliteName, List[float]]]
-    distance_sample_timestamps: List[float]
+    distances: Dict[SatelliteName, Dict[SatelliteName, SampleSeries]]
+    distance_sample_timestamps: SampleSeries
+
+
+class ColumnarDistancesSoapAccessorData(TypedDict):
+    """
+    This class is a type declaration for the data provided by DistancesSoapAccessor
+    in columnar form: distances[i, j] is the distance between the satellites in
+    pairs[j] at distance_sample_timestamps[i]
+    """
+
+    satellites: List[SatelliteName]
+    pairs: List[Tuple[SatelliteName, SatelliteName]]
+    distances: np.ndarray
+    distance_sample_timestamps: np.ndarray
+
+
+class DistancesSoapSelection(TypedDict):
+    """
+    This class is a type declaration for the part of a distances file to read:
+    the pairs whose satellites are both in an allow-list, and the samples
+    within an inclusive time range. None selects everything.
+    """
+
+    satellites: Optional[List[SatelliteName]]
+    time_range: Optional[Tuple[float, float]]
 
 
 class ConnectionsSoapAccessorData(TypedDict):
@@ -39,6 +78,8 @@ class ConnectionsSoapAccessorData(TypedDict):
 
 AccessorData = Union[
     ParedDownSoapAccessorData,
+    MatrixParedDownSoapAccessorData,
     DistancesSoapAccessorData,
+    ColumnarDistancesSoapAccessorData,
     ConnectionsSoapAccessorData,
 ]
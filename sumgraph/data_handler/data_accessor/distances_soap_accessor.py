@@ -2,14 +2,26 @@
 This module handles distances data from SOAP.
 """
 
-import linecache
-from typing import Dict, List, Tuple
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
 import pandas as pd
 from sumgraph.data_handler.data_accessor.data_type import (
+    ColumnarDistancesSoapAccessorData,
     DistancesSoapAccessorData,
+    DistancesSoapSelection,
+    SampleSeries,
     SatelliteName,
 )
 from sumgraph.data_handler.data_accessor.file_based_accessor import FileBasedAccessor
+from sumgraph.data_handler.data_accessor.parsed_data_cache import (
+    CacheEntry,
+    ParsedDataCache,
+)
+from sumgraph.helper.growable_array import GrowableArray
 from sumgraph.logger.logger import setup_logger
 
 
@@ -17,17 +29,80 @@ logger = setup_logger(__name__)
 
 HEADER_PREFIX_FOR_SATELLITE_NAME = "Dist:"
 SEPARATOR_FOR_SATELLITE_NAMES = "_"
+TIMESTAMP_COLUMN = "TIME_UNITS"
+
+# Certain lines of the original file cannot be parsed, so we handle them
+# specifically and skip them when importing through pandas:
+#   0: the header row that defines the file
+#   1: the row that gives the timestamp of when the data is for
+#   2: a blank line
+#   3: the row that gives the timestamp of when the data was generated
+#   4: the start and stop time of the simulation
+#   6: the line that defines what units the data is in
+SKIPROWS = [0, 1, 2, 3, 4, 6]
+
+# The line of the file that holds the first sample
+FIRST_SAMPLE_LINE = 7
+
+# Memory-mapped distances are stored pair-major, so that the samples of every
+# pair are contiguous on disk, and in single precision to halve their size
+MMAP_FORMAT_VERSION = 1
+MMAP_DTYPE = np.float32
+DISTANCES_SUFFIX = ".distances.npy"
+TIMESTAMPS_SUFFIX = ".timestamps.npy"
+METADATA_SUFFIX = ".json"
+
+# Without a chunksize, the file is converted a chunk of about this many
+# distances at a time
+MMAP_CHUNK_VALUES = 2**25
 
 
 class DistancesSoapAccessor(FileBasedAccessor):
     """
     The DistancesSoapAccessor accepts distances data from SOAP that is an
     augmented csv file of sampled satellite-to-satellite link distance data.
+    The data is held in columnar form, as one (samples x pairs) array, and the
+    nested dict form is built out of views of its columns. Given a chunksize,
+    the file is streamed that many rows at a time into that array instead of
+    being loaded into a single dataframe. Given an mmap_dir, the file is
+    converted once into a memory-mapped array in that directory, and later
+    runs open the array instead of parsing the file again, so only the pages
+    of the pairs and samples that are read are loaded into memory. select()
+    restricts the data to some satellites and a time range: only the columns
+    of the selected pairs are parsed, and reading in chunks stops after the
+    time range.
     """
 
-    def __init__(self, filepath: str) -> None:
-        super().__init__(filepath)
-        self._dataframe: pd.DataFrame
+    def __init__(
+        self,
+        filepath: str,
+        chunksize: Optional[int] = None,
+        cache: Optional[ParsedDataCache] = None,
+        mmap_dir: Optional[str] = None,
+    ) -> None:
+        super().__init__(filepath, cache)
+
+        if chunksize is not None and chunksize <= 0:
+            raise ValueError("chunksize must be positive, got %d" % chunksize)
+
+        if cache is not None and mmap_dir is not None:
+            raise ValueError(
+                "memory-mapped distances are already stored on disk, "
+                "so they cannot also be cached"
+            )
+
+        self.chunksize = chunksize
+        self.mmap_dir = mmap_dir
+        self.selection: DistancesSoapSelection = {
+            "satellites": None,
+            "time_range": None,
+        }
+        self._dataframe: pd.DataFrame = pd.DataFrame()
+        self._columnar_data: ColumnarDistancesSoapAccessorData = (
+            DistancesSoapAccessor.convert_arrays_to_columnar_data(
+                [], np.zeros(0), np.zeros((0, 0))
+            )
+        )
         self._data: DistancesSoapAccessorData = {
             "satellites": [],
             "distances": {},
@@ -37,43 +112,320 @@ class DistancesSoapAccessor(FileBasedAccessor):
     @property
     def data(self) -> DistancesSoapAccessorData:
         """
-        The main data for this accessor
+        The main data for this accessor, where every series is a view of the
+        columnar data
         """
         return self._data
 
+    @property
+    def columnar_data(self) -> ColumnarDistancesSoapAccessorData:
+        """
+        The main data for this accessor in columnar form
+        """
+        return self._columnar_data
+
+    def select(
+        self,
+        satellites: Optional[Iterable[SatelliteName]] = None,
+        time_range: Optional[Tuple[float, float]] = None,
+    ):
+        """
+        This method restricts the data read to the pairs whose satellites are
+        both in an allow-list, and to the samples within an inclusive time
+        range. It returns the accessor, so that it can be chained with run().
+        """
+        self.selection = make_selection(satellites=satellites, time_range=time_range)
+
+        return self
+
+    def get_cache_options(self) -> Dict[str, Any]:
+        satellites = self.selection["satellites"]
+
+        return {
+            "satellites": None if satellites is None else sorted(satellites),
+            "time_range": self.selection["time_range"],
+        }
+
+    def get_cache_entry(self) -> CacheEntry:
+        """
+        This method returns the columnar data as a cache entry
+        """
+        return {
+            "arrays": {
+                "distances": self._columnar_data["distances"],
+                "distance_sample_timestamps": self._columnar_data[
+                    "distance_sample_timestamps"
+                ],
+            },
+            "metadata": {
+                "satellites": self._columnar_data["satellites"],
+                "pairs": self._columnar_data["pairs"],
+            },
+        }
+
+    def set_cache_entry(self, entry: CacheEntry) -> None:
+        """
+        This method restores the columnar data, and its nested dict form, from
+        a cache entry
+        """
+        self._columnar_data = {
+            "satellites": list(entry["metadata"]["satellites"]),
+            # JSON gives the pairs back as lists
+            "pairs": [tuple(pair) for pair in entry["metadata"]["pairs"]],
+            "distances": entry["arrays"]["distances"],
+            "distance_sample_timestamps": entry["arrays"]["distance_sample_timestamps"],
+        }
+        self._data = DistancesSoapAccessor.convert_columnar_data_to_data(
+            self._columnar_data
+        )
+
     def run_read_file(self):
         """
         This method reads in the datafile
         """
 
-        # Certain lines of the original file cannot be parsed, so we handle them
-        # specifically and skip them when importing through pandas:
-        #   0: the header row that defines the file
-        #   1: the row that gives the timestamp of when the data is for
-        #   2: a blank line
-        #   3: the row that gives the timestamp of when the data was generated
-        #   4: the start and stop time of the simulation
-        #   6: the line that defines what units the data is in
-        skiprows = [0, 1, 2, 3, 4, 6]
-
-        header_row = linecache.getline(
-            filename=self.filepath, lineno=0 + 1
-        )  # lineno indexing begins at 1, not 0
+        header_row = self.read_header_row()
         logger.info("parsing distances SOAP file: %s", header_row)
 
-        # We have to drop the last column of data, as it is not valid data
+        if self.mmap_dir is not None:
+            self.read_file_into_mmap()
+
+            return self
+
+        if self.chunksize is not None:
+            self.read_file_in_chunks()
+
+            return self
+
         self._dataframe = pd.read_csv(  # type: ignore
-            filepath_or_buffer=self._filepath, skiprows=skiprows
-        ).iloc[:, :-1]
+            filepath_or_buffer=self._filepath,
+            **get_read_options(
+                self._filepath, self.get_selected_columns(), self.selection
+            ),
+        )
 
         return self
 
+    def get_selected_columns(self) -> List[str]:
+        """
+        This method reads the header of the datafile and returns the timestamp
+        column followed by the columns of the selected pairs. The last column
+        is never selected, as it is not valid data.
+        """
+        columns = read_column_names(self._filepath)[1:-1]
+        satellites = self.selection["satellites"]
+
+        if satellites is not None:
+            allowed_satellites = set(satellites)
+            columns = [
+                column
+                for column in columns
+                if allowed_satellites.issuperset(
+                    DistancesSoapAccessor.extract_satellite_names_from_header(column)
+                )
+            ]
+
+        return [TIMESTAMP_COLUMN] + columns
+
+    def read_file_in_chunks(self) -> None:
+        """
+        This method streams the datafile chunksize rows at a time into the
+        columnar data, so that only one chunk is parsed in memory at once
+        """
+        assert self.chunksize is not None
+
+        read_options = get_read_options(
+            self._filepath, self.get_selected_columns(), self.selection
+        )
+        columns = read_options["usecols"]
+        timestamps = GrowableArray(column_count=1, initial_capacity=self.chunksize)
+        distances = GrowableArray(
+            column_count=len(columns) - 1, initial_capacity=self.chunksize
+        )
+        start_time = time.perf_counter()
+
+        with pd.read_csv(  # type: ignore
+            filepath_or_buffer=self._filepath,
+            chunksize=self.chunksize,
+            **read_options,
+        ) as reader:
+            for chunk in reader:
+                chunk_timestamps = chunk[TIMESTAMP_COLUMN].to_numpy(dtype=float)
+                timestamps.append(chunk_timestamps[:, np.newaxis])
+                distances.append(chunk.iloc[:, 1:].to_numpy(dtype=float))
+
+                elapsed_time = time.perf_counter() - start_time
+                logger.info(
+                    "read %d rows of %s (%.0f rows/sec)",
+                    len(distances),
+                    self.filepath,
+                    len(distances) / elapsed_time if elapsed_time > 0 else 0.0,
+                )
+
+        self._columnar_data = DistancesSoapAccessor.convert_arrays_to_columnar_data(
+            columns[1:], timestamps.finish().ravel(), distances.finish()
+        )
+
+    def get_mmap_path(self, suffix: str) -> str:
+        """
+        This method returns the path of one of the memory-mapped files for the
+        datafile, named after the datafile and a hash of its absolute path
+        """
+        assert self.mmap_dir is not None
+
+        path_hash = hashlib.sha256(
+            os.path.abspath(self.filepath).encode("utf-8")
+        ).hexdigest()[:16]
+
+        return os.path.join(
+            self.mmap_dir,
+            "%s-%s%s" % (os.path.basename(self.filepath), path_hash, suffix),
+        )
+
+    def get_mmap_identity(self) -> Dict[str, Any]:
+        """
+        This method describes the datafile, and the layout it is converted to,
+        so that a conversion of an older version of the file is not read
+        """
+        file_stat = os.stat(self.filepath)
+
+        return {
+            "format_version": MMAP_FORMAT_VERSION,
+            "dtype": np.dtype(MMAP_DTYPE).str,
+            "size": file_stat.st_size,
+            "mtime_ns": file_stat.st_mtime_ns,
+        }
+
+    def read_file_into_mmap(self) -> None:
+        """
+        This method opens the memory-mapped conversion of the datafile,
+        converting it first if there is no conversion of its current version
+        """
+        metadata_path = self.get_mmap_path(METADATA_SUFFIX)
+        metadata: Optional[Dict[str, Any]] = None
+
+        if os.path.exists(metadata_path):
+            with open(metadata_path, encoding="utf-8") as metadata_file:
+                metadata = json.load(metadata_file)
+
+        if metadata is None or metadata["identity"] != self.get_mmap_identity():
+            metadata = self.convert_file_to_mmap()
+        else:
+            logger.info("reusing memory-mapped distances: %s", metadata_path)
+
+        sample_count = metadata["sample_count"]
+        distances = np.load(self.get_mmap_path(DISTANCES_SUFFIX), mmap_mode="r")
+        timestamps = np.load(self.get_mmap_path(TIMESTAMPS_SUFFIX))
+
+        # The transpose of the pair-major array is the usual (samples x pairs)
+        # array, whose columns are contiguous
+        self._columnar_data = DistancesSoapAccessor.convert_arrays_to_columnar_data(
+            metadata["columns"],
+            timestamps[:sample_count],
+            distances[:, :sample_count].T,
+        )
+
+    def convert_file_to_mmap(self) -> Dict[str, Any]:
+        """
+        This method streams the datafile into a pair-major memory-mapped
+        array and returns the metadata that describes it. The number of rows is
+        bounded by counting lines first, so the array never has to grow.
+        """
+        assert self.mmap_dir is not None
+        os.makedirs(self.mmap_dir, exist_ok=True)
+
+        identity = self.get_mmap_identity()
+        columns = read_column_names(self._filepath)[1:-1]
+        capacity = max(count_lines(self.filepath) - len(SKIPROWS) - 1, 0)
+
+        distances_path = self.get_mmap_path(DISTANCES_SUFFIX)
+        distances = np.lib.format.open_memmap(
+            distances_path + ".tmp",
+            mode="w+",
+            dtype=MMAP_DTYPE,
+            shape=(len(columns), capacity),
+        )
+        timestamps = np.zeros(capacity)
+        sample_count = self.stream_file_into_arrays(
+            timestamps=timestamps,
+            distances=distances,
+            chunksize=self.chunksize
+            or max(1, MMAP_CHUNK_VALUES // max(len(columns), 1)),
+        )
+
+        distances.flush()
+        del distances
+        os.replace(distances_path + ".tmp", distances_path)
+        np.save(self.get_mmap_path(TIMESTAMPS_SUFFIX), timestamps[:sample_count])
+
+        # The metadata is written last, so that it only exists for a complete
+        # conversion
+        metadata = {
+            "identity": identity,
+            "columns": columns,
+            "sample_count": sample_count,
+        }
+        with open(
+            self.get_mmap_path(METADATA_SUFFIX), "w", encoding="utf-8"
+        ) as metadata_file:
+            json.dump(metadata, metadata_file)
+
+        return metadata
+
+    def stream_file_into_arrays(
+        self, timestamps: np.ndarray, distances: np.ndarray, chunksize: int
+    ) -> int:
+        """
+        This method streams the datafile chunksize rows at a time into an array
+        of timestamps and a pair-major array of distances, which must have room
+        for every row, and returns the number of rows
+        """
+        sample_count = 0
+        start_time = time.perf_counter()
+
+        with pd.read_csv(  # type: ignore
+            filepath_or_buffer=self._filepath, skiprows=SKIPROWS, chunksize=chunksize
+        ) as reader:
+            for chunk in reader:
+                end = sample_count + len(chunk)
+                timestamps[sample_count:end] = chunk[TIMESTAMP_COLUMN].to_numpy(
+                    dtype=float
+                )
+                # We have to drop the last column of data, as it is not valid data
+                distances[:, sample_count:end] = (
+                    chunk.iloc[:, 1:-1].to_numpy(dtype=float).T
+                )
+                sample_count = end
+
+                elapsed_time = time.perf_counter() - start_time
+                logger.info(
+                    "converted %d rows of %s (%.0f rows/sec)",
+                    sample_count,
+                    self.filepath,
+                    sample_count / elapsed_time if elapsed_time > 0 else 0.0,
+                )
+
+        return sample_count
+
     def run_analyze_file(self):
         """
         This method converts the dataframe into data
         """
 
-        self._data = DistancesSoapAccessor.convert_dataframe_to_data(self._dataframe)
+        if self.chunksize is None and self.mmap_dir is None:
+            self._columnar_data = (
+                DistancesSoapAccessor.convert_dataframe_to_columnar_data(
+                    self._dataframe
+                )
+            )
+
+            # The columnar data holds its own copy of the samples
+            self._dataframe = pd.DataFrame()
+
+        self._columnar_data = select_columnar_data(self._columnar_data, self.selection)
+        self._data = DistancesSoapAccessor.convert_columnar_data_to_data(
+            self._columnar_data
+        )
 
         return self
 
@@ -83,47 +435,83 @@ class DistancesSoapAccessor(FileBasedAccessor):
         This method converts a datafram into the data expcted from this class
         """
 
-        # Skip the first column, as this corresponds to samples
-        columns_with_satellite_distances: List[str] = list(dataframe.columns[1:])
-
-        # 1. Get the names of satellites
-        satellites_nested_arrays = [
-            DistancesSoapAccessor.extract_satellite_names_from_header(x)
-            for x in columns_with_satellite_distances
-        ]
-        satellite_names_with_duplicates = [
-            item for sublist in satellites_nested_arrays for item in sublist
-        ]
-        satellites: List[SatelliteName] = list(set(satellite_names_with_duplicates))
+        return DistancesSoapAccessor.convert_columnar_data_to_data(
+            DistancesSoapAccessor.convert_dataframe_to_columnar_data(dataframe)
+        )
 
-        # 2. Extract pairwise distance data
-        distances: Dict[SatelliteName, Dict[SatelliteName, List[float]]] = {}
-        for column_header in columns_with_satellite_distances:
-            (
-                source,
-                target,
-            ) = DistancesSoapAccessor.extract_satellite_names_from_header(column_header)
-            distance_list: List[float] = list(dataframe[column_header])
-
-            if source not in distances:
-                distances[source] = {}
+    @staticmethod
+    def convert_dataframe_to_columnar_data(
+        dataframe: pd.DataFrame,
+    ) -> ColumnarDistancesSoapAccessorData:
+        """
+        This method converts a dataframe into the columnar data expected from
+        this class
+        """
+        if len(dataframe.columns) == 0:
+            return DistancesSoapAccessor.convert_arrays_to_columnar_data(
+                [], np.zeros(0), np.zeros((0, 0))
+            )
 
-            if target not in distances:
-                distances[target] = {}
+        # Skip the first column, as this corresponds to samples. Pandas may
+        # return views of its own column-major blocks, so we copy into arrays
+        # that do not keep the dataframe alive.
+        return DistancesSoapAccessor.convert_arrays_to_columnar_data(
+            list(dataframe.columns[1:]),
+            np.array(dataframe[TIMESTAMP_COLUMN].to_numpy(dtype=float)),
+            np.ascontiguousarray(dataframe.iloc[:, 1:].to_numpy(dtype=float)),
+        )
 
-            distances[source][target] = distance_list
-            distances[target][source] = distance_list
+    @staticmethod
+    def convert_arrays_to_columnar_data(
+        columns: List[str], timestamps: np.ndarray, distances: np.ndarray
+    ) -> ColumnarDistancesSoapAccessorData:
+        """
+        This method builds the columnar data out of the sample timestamps, a
+        (samples x pairs) array of distances and the header of every column of
+        that array
+        """
+        if distances.shape != (len(timestamps), len(columns)):
+            raise ValueError(
+                "expected distances of shape %s but got %s"
+                % ((len(timestamps), len(columns)), distances.shape)
+            )
 
-        # 3. Get the sample timestamps
-        distance_sample_timestamps: List[float] = list(dataframe["TIME_UNITS"])
+        pairs = [
+            DistancesSoapAccessor.extract_satellite_names_from_header(column)
+            for column in columns
+        ]
+        satellites: List[SatelliteName] = list(
+            dict.fromkeys(satellite for pair in pairs for satellite in pair)
+        )
 
-        data: DistancesSoapAccessorData = {
+        return {
             "satellites": satellites,
+            "pairs": pairs,
             "distances": distances,
-            "distance_sample_timestamps": distance_sample_timestamps,
+            "distance_sample_timestamps": timestamps,
         }
 
-        return data
+    @staticmethod
+    def convert_columnar_data_to_data(
+        columnar_data: ColumnarDistancesSoapAccessorData,
+    ) -> DistancesSoapAccessorData:
+        """
+        This method gives the columnar data the nested dict form, where every
+        series is a view of a column, so no samples are copied
+        """
+        distance_matrix = columnar_data["distances"]
+        distances: Dict[SatelliteName, Dict[SatelliteName, SampleSeries]] = {}
+
+        for pair_index, (source, target) in enumerate(columnar_data["pairs"]):
+            distance_series = distance_matrix[:, pair_index]
+            distances.setdefault(source, {})[target] = distance_series
+            distances.setdefault(target, {})[source] = distance_series
+
+        return {
+            "satellites": list(columnar_data["satellites"]),
+            "distances": distances,
+            "distance_sample_timestamps": columnar_data["distance_sample_timestamps"],
+        }
 
     @staticmethod
     def extract_satellite_names_from_header(
@@ -142,3 +530,144 @@ class DistancesSoapAccessor(FileBasedAccessor):
         target = satellite_names[1]
 
         return (source, target)
+
+
+def count_lines(filepath: str) -> int:
+    """
+    This function counts the lines of a file without parsing it
+    """
+    line_count = 0
+    last_block = b""
+
+    with open(filepath, "rb") as file:
+        for block in iter(lambda: file.read(2**20), b""):
+            line_count += block.count(b"\n")
+            last_block = block
+
+    if last_block and not last_block.endswith(b"\n"):
+        line_count += 1
+
+    return line_count
+
+
+def read_column_names(filepath: str) -> List[str]:
+    """
+    This function reads the name of every column from the header of a
+    distances file
+    """
+    return list(
+        pd.read_csv(  # type: ignore
+            filepath_or_buffer=filepath, skiprows=SKIPROWS, nrows=0
+        ).columns
+    )
+
+
+def get_sample_range(
+    filepath: str, time_range: Optional[Tuple[float, float]]
+) -> Tuple[int, Optional[int]]:
+    """
+    This function returns the index of the first sample of a distances file
+    within the time range and the number of samples in it, or None to read
+    every sample. Only the timestamp column is parsed to find them.
+    """
+    if time_range is None:
+        return (0, None)
+
+    timestamps = pd.read_csv(  # type: ignore
+        filepath_or_buffer=filepath, skiprows=SKIPROWS, usecols=[TIMESTAMP_COLUMN]
+    )[TIMESTAMP_COLUMN].to_numpy(dtype=float)
+    (first_sample, end_sample) = (
+        int(np.searchsorted(timestamps, time_range[0], side="left")),
+        int(np.searchsorted(timestamps, time_range[1], side="right")),
+    )
+
+    return (first_sample, end_sample - first_sample)
+
+
+def get_read_options(
+    filepath: str, columns: List[str], selection: DistancesSoapSelection
+) -> Dict[str, Any]:
+    """
+    This function returns the options of pd.read_csv that parse only the
+    given columns of the samples within the time range of the selection
+    """
+    (first_sample, sample_count) = get_sample_range(filepath, selection["time_range"])
+
+    if first_sample == 0:
+        return {"skiprows": SKIPROWS, "usecols": columns, "nrows": sample_count}
+
+    # The header is skipped along with the samples before the time range, so
+    # the columns are named explicitly
+    return {
+        "skiprows": FIRST_SAMPLE_LINE + first_sample,
+        "header": None,
+        "names": read_column_names(filepath),
+        "usecols": columns,
+        "nrows": sample_count,
+    }
+
+
+def make_selection(
+    satellites: Optional[Iterable[SatelliteName]] = None,
+    time_range: Optional[Tuple[float, float]] = None,
+) -> DistancesSoapSelection:
+    """
+    This function checks a selection of satellites and a time range
+    """
+    if time_range is not None and time_range[0] > time_range[1]:
+        raise ValueError(
+            "time_range must not end before it starts, got (%g, %g)" % time_range
+        )
+
+    return {
+        "satellites": None if satellites is None else list(satellites),
+        "time_range": time_range,
+    }
+
+
+def select_columnar_data(
+    columnar_data: ColumnarDistancesSoapAccessorData,
+    selection: DistancesSoapSelection,
+) -> ColumnarDistancesSoapAccessorData:
+    """
+    This function restricts columnar data to a selection. The samples within
+    the time range are found by binary search, and the selected pairs are
+    gathered into a new array, which for a pair-major memory-mapped array only
+    reads the pages of those pairs.
+    """
+    timestamps = columnar_data["distance_sample_timestamps"]
+    distances = columnar_data["distances"]
+    pairs = columnar_data["pairs"]
+    satellites = columnar_data["satellites"]
+
+    if selection["time_range"] is not None:
+        (first_sample, end_sample) = (
+            np.searchsorted(timestamps, selection["time_range"][0], side="left"),
+            np.searchsorted(timestamps, selection["time_range"][1], side="right"),
+        )
+        timestamps = timestamps[first_sample:end_sample]
+        distances = distances[first_sample:end_sample]
+
+        # A view of an array in memory would keep every sample alive
+        if not isinstance(distances, np.memmap):
+            (timestamps, distances) = (timestamps.copy(), distances.copy())
+
+    if selection["satellites"] is not None:
+        allowed_satellites = set(selection["satellites"])
+        pair_indices = [
+            pair_index
+            for (pair_index, pair) in enumerate(pairs)
+            if allowed_satellites.issuperset(pair)
+        ]
+        if len(pair_indices) < len(pairs):
+            distances = distances[:, pair_indices]
+            pairs = [pairs[pair_index] for pair_index in pair_indices]
+
+        satellites = list(dict.fromkeys(name for pair in pairs for name in pair))
+
+    return {
+        "satellites": list(satellites),
+        "pairs": list(pairs),
+        "distances": distances,
+        "distance_sample_timestamps": timestamps,
+    }
@@ -4,17 +4,25 @@ This module defines an Accessor that is backed by some type of datafile.
 
 from __future__ import annotations
 from abc import abstractmethod
+from typing import Any, Dict, Optional
 from sumgraph.data_handler.data_accessor.accessor import Accessor
+from sumgraph.data_handler.data_accessor.parsed_data_cache import (
+    CacheEntry,
+    ParsedDataCache,
+)
 
 
 class FileBasedAccessor(Accessor):
     """
-    This class defines accessors that are based on a particular file
+    This class defines accessors that are based on a particular file. Given a
+    cache, the analyzed data is stored after the file is first read, and read
+    back instead of the file for as long as the file does not change.
     """
 
-    def __init__(self, filepath: str) -> None:
+    def __init__(self, filepath: str, cache: Optional[ParsedDataCache] = None) -> None:
         super().__init__()
         self.filepath = filepath
+        self.cache = cache
 
     @property
     def filepath(self) -> str:
@@ -29,14 +37,59 @@ class FileBasedAccessor(Accessor):
 
         return self._filepath
 
+    def read_header_row(self) -> str:
+        """
+        This method reads the first line of the datafile. Unlike linecache, it
+        does not keep every line of the file in memory afterwards.
+        """
+        with open(self.filepath, encoding="utf-8") as file:
+            return file.readline()
+
     def run(self):
         """
         The main run method of a file based accessor
         """
+        if self.cache is None:
+            self.run_read_file().run_analyze_file()
+
+            return self
+
+        key = self.cache.get_key(
+            filepath=self.filepath,
+            accessor_name=type(self).__name__,
+            options=self.get_cache_options(),
+        )
+        entry = self.cache.load(key)
+
+        if entry is not None:
+            self.set_cache_entry(entry)
+
+            return self
+
         self.run_read_file().run_analyze_file()
+        self.cache.store(key, self.get_cache_entry())
 
         return self
 
+    def get_cache_options(self) -> Dict[str, Any]:
+        """
+        This method returns the options of this accessor that change the data
+        it produces, as part of the key of its cache entry
+        """
+        return {}
+
+    @abstractmethod
+    def get_cache_entry(self) -> CacheEntry:
+        """
+        This method returns the analyzed data as a cache entry
+        """
+
+    @abstractmethod
+    def set_cache_entry(self, entry: CacheEntry) -> None:
+        """
+        This method restores the analyzed data from a cache entry
+        """
+
     @abstractmethod
     def run_read_file(self) -> FileBasedAccessor:
         """
@@ -0,0 +1,61 @@
+"""
+This module exposes a square numeric matrix with labeled rows and columns
+through the read-only interface of a nested dict, without copying it.
+"""
+
+from typing import Dict, Iterator, List, Mapping
+import numpy as np
+
+
+class LabeledRowView(Mapping[str, float]):
+    """
+    This class is a row of a labeled matrix, read as a dict from the label of
+    every column to its value
+    """
+
+    def __init__(self, index: Dict[str, int], row: np.ndarray) -> None:
+        self._index = index
+        self._row = row
+
+    def __getitem__(self, label: str) -> float:
+        return float(self._row[self._index[label]])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+
+class LabeledMatrixView(Mapping[str, LabeledRowView]):
+    """
+    This class is a square matrix whose rows and columns follow a list of
+    labels, read as a dict of dicts so that view[a][b] is the entry in the row
+    of a and the column of b. It compares equal to a nested dict with the same
+    entries.
+    """
+
+    def __init__(self, labels: List[str], matrix: np.ndarray) -> None:
+        if matrix.shape != (len(labels), len(labels)):
+            raise ValueError(
+                "expected a matrix of shape %s but got %s"
+                % ((len(labels), len(labels)), matrix.shape)
+            )
+
+        self._index = {label: index for (index, label) in enumerate(labels)}
+        self._matrix = matrix
+
+    def __getitem__(self, label: str) -> LabeledRowView:
+        return LabeledRowView(self._index, self._matrix[self._index[label]])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __repr__(self) -> str:
+        return repr({label: dict(row.items()) for (label, row) in self.items()})
@@ -0,0 +1,273 @@
+"""
+This module handles distances data from SOAP that is split across several
+files, for instance one per orbital plane and per day.
+"""
+
+import glob
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import (
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+import numpy as np
+from sumgraph.data_handler.data_accessor.accessor import Accessor
+from sumgraph.data_handler.data_accessor.data_type import (
+    ColumnarDistancesSoapAccessorData,
+    DistancesSoapAccessorData,
+    DistancesSoapSelection,
+    SatelliteName,
+)
+from sumgraph.data_handler.data_accessor.distances_soap_accessor import (
+    DistancesSoapAccessor,
+    make_selection,
+)
+from sumgraph.data_handler.data_accessor.parsed_data_cache import ParsedDataCache
+from sumgraph.logger.logger import setup_logger
+
+
+logger = setup_logger(__name__)
+
+# The distance between satellites that no file has a sample for at some time,
+# which is the default for a missing edge
+MISSING_DISTANCE = np.inf
+
+
+class MultiFileDistancesSoapAccessor(Accessor):
+    """
+    The MultiFileDistancesSoapAccessor reads several SOAP distances files,
+    given as a list of paths or a glob pattern, with one DistancesSoapAccessor
+    each, and merges them into a single dataset in the same columnar form.
+    Files with the same sample times are joined side by side and must not
+    share a pair of satellites. Files with different sample times are
+    concatenated in time and must not overlap. A pair of satellites that is
+    missing from the files for some time range is infinitely far apart then.
+    With more than one job, the files are parsed by a pool of worker
+    processes, each of which sends back the columnar data of its file.
+    """
+
+    def __init__(
+        self,
+        filepaths: Union[str, Sequence[str]],
+        jobs: int = 1,
+        chunksize: Optional[int] = None,
+        cache: Optional[ParsedDataCache] = None,
+    ) -> None:
+        super().__init__()
+
+        if isinstance(filepaths, str):
+            filepaths = sorted(glob.glob(filepaths))
+
+        if len(filepaths) == 0:
+            raise ValueError("no distances files were given")
+
+        if jobs <= 0:
+            raise ValueError("jobs must be positive, got %d" % jobs)
+
+        self.filepaths = list(filepaths)
+        self.jobs = jobs
+        self.chunksize = chunksize
+        self.cache = cache
+        self.selection: DistancesSoapSelection = {
+            "satellites": None,
+            "time_range": None,
+        }
+        self._columnar_data: ColumnarDistancesSoapAccessorData = (
+            DistancesSoapAccessor.convert_arrays_to_columnar_data(
+                [], np.zeros(0), np.zeros((0, 0))
+            )
+        )
+        self._data: DistancesSoapAccessorData = (
+            DistancesSoapAccessor.convert_columnar_data_to_data(self._columnar_data)
+        )
+
+    @property
+    def data(self) -> DistancesSoapAccessorData:
+        """
+        The merged data for this accessor, where every series is a view of the
+        columnar data
+        """
+        return self._data
+
+    @property
+    def columnar_data(self) -> ColumnarDistancesSoapAccessorData:
+        """
+        The merged data for this accessor in columnar form
+        """
+        return self._columnar_data
+
+    def select(
+        self,
+        satellites: Optional[Iterable[SatelliteName]] = None,
+        time_range: Optional[Tuple[float, float]] = None,
+    ):
+        """
+        This method restricts the data read from every file, as
+        DistancesSoapAccessor.select() does. It returns the accessor, so that
+        it can be chained with run().
+        """
+        self.selection = make_selection(satellites=satellites, time_range=time_range)
+
+        return self
+
+    def run(self):
+        """
+        This method reads every file and merges them
+        """
+        read_file = partial(
+            read_columnar_data,
+            chunksize=self.chunksize,
+            cache=self.cache,
+            selection=self.selection,
+        )
+
+        if self.jobs == 1 or len(self.filepaths) == 1:
+            datasets = [read_file(filepath) for filepath in self.filepaths]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=min(self.jobs, len(self.filepaths))
+            ) as executor:
+                datasets = list(executor.map(read_file, self.filepaths))
+
+        self._columnar_data = merge_columnar_data(datasets)
+        self._data = DistancesSoapAccessor.convert_columnar_data_to_data(
+            self._columnar_data
+        )
+        logger.info(
+            "merged %d distances files into %d samples of %d pairs",
+            len(self.filepaths),
+            len(self._columnar_data["distance_sample_timestamps"]),
+            len(self._columnar_data["pairs"]),
+        )
+
+        return self
+
+
+def read_columnar_data(
+    filepath: str,
+    chunksize: Optional[int] = None,
+    cache: Optional[ParsedDataCache] = None,
+    selection: Optional[DistancesSoapSelection] = None,
+) -> ColumnarDistancesSoapAccessorData:
+    """
+    This function reads a single distances file into columnar data. It is
+    defined at module level so that worker processes can run it.
+    """
+    accessor = DistancesSoapAccessor(
+        filepath=filepath, chunksize=chunksize, cache=cache
+    )
+    if selection is not None:
+        accessor.select(**selection)
+
+    return accessor.run().columnar_data
+
+
+def merge_columnar_data(
+    datasets: Sequence[ColumnarDistancesSoapAccessorData],
+) -> ColumnarDistancesSoapAccessorData:
+    """
+    This function merges columnar datasets on the names of their satellites
+    and their sample times. Satellites and pairs are listed in order of first
+    appearance, and a pair named in either order is the same pair.
+    """
+    satellites: List[SatelliteName] = list(
+        dict.fromkeys(
+            satellite for dataset in datasets for satellite in dataset["satellites"]
+        )
+    )
+    pair_ids: Dict[FrozenSet[SatelliteName], int] = {}
+    pairs: List[Tuple[SatelliteName, SatelliteName]] = []
+    for dataset in datasets:
+        for pair in dataset["pairs"]:
+            if frozenset(pair) not in pair_ids:
+                pair_ids[frozenset(pair)] = len(pairs)
+                pairs.append(pair)
+
+    blocks = group_datasets_by_timestamps(datasets)
+    timestamps = np.concatenate(
+        [np.zeros(0)] + [block[0]["distance_sample_timestamps"] for block in blocks]
+    )
+    distances = np.full(
+        (len(timestamps), len(pairs)),
+        MISSING_DISTANCE,
+        dtype=np.result_type(*[dataset["distances"] for dataset in datasets]),
+    )
+
+    block_start = 0
+    for block in blocks:
+        block_end = block_start + len(block[0]["distance_sample_timestamps"])
+        for dataset in block:
+            columns = [pair_ids[frozenset(pair)] for pair in dataset["pairs"]]
+            distances[block_start:block_end, columns] = dataset["distances"]
+
+        block_start = block_end
+
+    return {
+        "satellites": satellites,
+        "pairs": pairs,
+        "distances": distances,
+        "distance_sample_timestamps": timestamps,
+    }
+
+
+def group_datasets_by_timestamps(
+    datasets: Sequence[ColumnarDistancesSoapAccessorData],
+) -> List[List[ColumnarDistancesSoapAccessorData]]:
+    """
+    This function groups datasets with the same sample times into blocks, in
+    order of time, and checks that no two datasets have samples for the same
+    pair at the same times and that the time ranges of blocks do not overlap.
+    Datasets without samples are left out.
+    """
+    blocks: List[List[ColumnarDistancesSoapAccessorData]] = []
+
+    for dataset in datasets:
+        if len(dataset["distance_sample_timestamps"]) == 0:
+            continue
+
+        for block in blocks:
+            if np.array_equal(
+                block[0]["distance_sample_timestamps"],
+                dataset["distance_sample_timestamps"],
+            ):
+                block.append(dataset)
+                break
+        else:
+            blocks.append([dataset])
+
+    for block in blocks:
+        seen_pairs: Set[FrozenSet[SatelliteName]] = set()
+        for dataset in block:
+            for pair in dataset["pairs"]:
+                if frozenset(pair) in seen_pairs:
+                    raise ValueError(
+                        "more than one file has distances for %s and %s at the same "
+                        "times" % pair
+                    )
+                seen_pairs.add(frozenset(pair))
+
+    blocks.sort(key=lambda block: block[0]["distance_sample_timestamps"][0])
+    for previous_block, block in zip(blocks, blocks[1:]):
+        (previous_timestamps, timestamps) = (
+            previous_block[0]["distance_sample_timestamps"],
+            block[0]["distance_sample_timestamps"],
+        )
+        if previous_timestamps[-1] >= timestamps[0]:
+            raise ValueError(
+                "the time ranges [%g, %g] and [%g, %g] overlap"
+                % (
+                    previous_timestamps[0],
+                    previous_timestamps[-1],
+                    timestamps[0],
+                    timestamps[-1],
+                )
+            )
+
+    return blocks
@@ -2,14 +2,20 @@
 This module contains the ParedDownSoapAccessor.
 """
 
-from typing import Dict, Iterable, List, Tuple, TypedDict
+from typing import Any, Dict, List, Optional, Tuple, TypedDict
+import numpy as np
 import pandas as pd
 from sumgraph.data_handler.data_accessor.data_type import (
+    MatrixParedDownSoapAccessorData,
     ParedDownSoapAccessorData,
     SatelliteName,
-    VisibilityPercentage,
 )
 from sumgraph.data_handler.data_accessor.file_based_accessor import FileBasedAccessor
+from sumgraph.data_handler.data_accessor.labeled_matrix_view import LabeledMatrixView
+from sumgraph.data_handler.data_accessor.parsed_data_cache import (
+    CacheEntry,
+    ParsedDataCache,
+)
 
 
 DataFrameRow = TypedDict("DataFrameRow", {"Analysis": str, "Percent True": str})
@@ -18,20 +24,60 @@ DataFrameRow = TypedDict("DataFrameRow", {"Analysis": str, "Percent True": str})
 class ParedDownSoapAccessor(FileBasedAccessor):
     """
     The ParedDownSoapAccessor accepts pared down soap data that is a csv file of
-    satellite-to-satellite link uptime data.
+    satellite-to-satellite link uptime data. The visibility is held as an
+    (n x n) matrix whose rows and columns follow the satellites, of the given
+    dtype, and the nested dict form is a view of that matrix.
     """
 
-    def __init__(self, filepath: str) -> None:
-        super().__init__(filepath)
+    def __init__(
+        self,
+        filepath: str,
+        cache: Optional[ParsedDataCache] = None,
+        dtype: type = np.float64,
+    ) -> None:
+        super().__init__(filepath, cache)
+        self.dtype = dtype
         self._dataframe: pd.DataFrame
-        self._data: ParedDownSoapAccessorData = {"satellites": [], "visibility": {}}
+        self._matrix_data: MatrixParedDownSoapAccessorData = {
+            "satellites": [],
+            "visibility": np.zeros((0, 0), dtype=dtype),
+        }
 
     @property
     def data(self) -> ParedDownSoapAccessorData:
         """
-        The main data for this accessor
+        The main data for this accessor, where the visibility is a read-only
+        view of the visibility matrix
+        """
+        return ParedDownSoapAccessor.convert_matrix_data_to_data(self._matrix_data)
+
+    @property
+    def matrix_data(self) -> MatrixParedDownSoapAccessorData:
+        """
+        The main data for this accessor in matrix form
         """
-        return self._data
+        return self._matrix_data
+
+    def get_cache_options(self) -> Dict[str, Any]:
+        return {"dtype": np.dtype(self.dtype).str}
+
+    def get_cache_entry(self) -> CacheEntry:
+        """
+        This method returns the visibility matrix as a cache entry
+        """
+        return {
+            "arrays": {"visibility": self._matrix_data["visibility"]},
+            "metadata": {"satellites": self._matrix_data["satellites"]},
+        }
+
+    def set_cache_entry(self, entry: CacheEntry) -> None:
+        """
+        This method restores the visibility matrix from a cache entry
+        """
+        self._matrix_data = {
+            "satellites": list(entry["metadata"]["satellites"]),
+            "visibility": entry["arrays"]["visibility"],
+        }
 
     def run_read_file(self):
         """
@@ -45,7 +91,9 @@ class ParedDownSoapAccessor(FileBasedAccessor):
         """
         This method converts the read file into usable data
         """
-        self._data = ParedDownSoapAccessor.convert_dataframe_to_data(self._dataframe)
+        self._matrix_data = ParedDownSoapAccessor.convert_dataframe_to_matrix_data(
+            self._dataframe, dtype=self.dtype
+        )
 
         return self
 
@@ -57,44 +105,88 @@ class ParedDownSoapAccessor(FileBasedAccessor):
         This method converts a dataframe read from a file into the correct data
         format for this accessor
         """
+        return ParedDownSoapAccessor.convert_matrix_data_to_data(
+            ParedDownSoapAccessor.convert_dataframe_to_matrix_data(dataframe)
+        )
 
-        # First produce the name of the satellites
-        satellite_name_column: List[str] = list(dataframe["Analysis"])
-        satellites_nested_arrays = [
-            ParedDownSoapAccessor.extract_satellite_names_from_analysis_label(x)
-            for x in satellite_name_column
-        ]
-        satellite_names_with_duplicates = [
-            item for sublist in satellites_nested_arrays for item in sublist
-        ]
-        satellites = list(set(satellite_names_with_duplicates))
-
-        # Next, produce the visibility data
-        visibility: Dict[SatelliteName, Dict[SatelliteName, VisibilityPercentage]] = {}
-        for i in satellites:
-            visibility[i] = {}
-
-        for i in satellites:
-            for j in satellites:
-                visibility[i][j] = 0.0
-                visibility[j][i] = 0.0
-
-        dataframe_iter: Iterable[Tuple[int, DataFrameRow]] = dataframe.iterrows()  # type: ignore
-        for _, row in dataframe_iter:
-            (
-                source,
-                target,
-                visibility_percent,
-            ) = ParedDownSoapAccessor.extract_visibility_from_analysis_row(row)
-            visibility[source][target] = visibility_percent
-            visibility[target][source] = visibility_percent
-
-        data: ParedDownSoapAccessorData = {
-            "satellites": satellites,
-            "visibility": visibility,
-        }
+    @staticmethod
+    def convert_dataframe_to_matrix_data(
+        dataframe: pd.DataFrame, dtype: type = np.float64
+    ) -> MatrixParedDownSoapAccessorData:
+        """
+        This method converts a dataframe read from a file into the matrix form
+        of the data for this accessor. Satellites are listed in order of first
+        appearance, and pairs without a row have a visibility of zero. Every
+        column is converted as a whole rather than row by row.
+        """
+        # Every distinct label is only parsed once
+        (label_ids, labels) = pd.factorize(dataframe["Analysis"])  # type: ignore
+        label_names: List[SatelliteName] = []
+        for label in labels:
+            names = ParedDownSoapAccessor.extract_satellite_names_from_analysis_label(
+                label
+            )
+            if len(names) != 2:
+                raise ValueError("could not parse analysis label: %s" % label)
+
+            label_names.extend(names)
+
+        (satellite_ids, satellites) = pd.factorize(  # type: ignore
+            np.array(label_names, dtype=object)
+        )
+        (source_ids, target_ids) = (
+            satellite_ids[0::2][label_ids],
+            satellite_ids[1::2][label_ids],
+        )
+
+        # The original format for the data is "xx.x%", so we need to remove the
+        # % at the end and convert the remaining value to a float
+        percent_true = (
+            dataframe["Percent True"].astype(str).str.rstrip("%").to_numpy(dtype=float)
+        )
 
-        return data
+        # When a pair has several rows, in either direction, only the last one
+        # is kept, so no element of the matrix is written twice
+        is_last = (
+            ~pd.DataFrame(
+                {
+                    "low": np.minimum(source_ids, target_ids),
+                    "high": np.maximum(source_ids, target_ids),
+                }
+            )
+            .duplicated(keep="last")
+            .to_numpy()
+        )
+        (source_ids, target_ids, percent_true) = (
+            source_ids[is_last],
+            target_ids[is_last],
+            percent_true[is_last],
+        )
+
+        visibility: np.ndarray = np.zeros(
+            (len(satellites), len(satellites)), dtype=dtype
+        )
+        visibility[
+            np.column_stack([source_ids, target_ids]).ravel(),
+            np.column_stack([target_ids, source_ids]).ravel(),
+        ] = np.repeat(percent_true, 2)
+
+        return {"satellites": list(satellites), "visibility": visibility}
+
+    @staticmethod
+    def convert_matrix_data_to_data(
+        matrix_data: MatrixParedDownSoapAccessorData,
+    ) -> ParedDownSoapAccessorData:
+        """
+        This method gives the matrix data the nested dict form, as a view of
+        the visibility matrix, so no values are copied
+        """
+        return {
+            "satellites": list(matrix_data["satellites"]),
+            "visibility": LabeledMatrixView(
+                matrix_data["satellites"], matrix_data["visibility"]
+            ),
+        }
 
     @staticmethod
     def extract_satellite_names_from_analysis_label(analysis_label: str) -> List[str]:
@@ -0,0 +1,212 @@
+"""
+This module defines an on-disk cache for the data that file based accessors
+parse out of their datafiles, so that a datafile that has not changed does not
+have to be parsed again.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from typing import Any, Dict, List, Optional, Tuple, TypedDict
+import numpy as np
+from sumgraph.logger.logger import setup_logger
+
+
+logger = setup_logger(__name__)
+
+# Bump this whenever the layout of an entry changes, so that old entries are
+# never read back
+CACHE_FORMAT_VERSION = 1
+
+METADATA_FILENAME = "metadata.json"
+ARRAY_SUFFIX = ".npy"
+HASH_BLOCK_SIZE = 2**20
+
+
+class CacheEntry(TypedDict):
+    """
+    This class is a type declaration for what an accessor stores in the cache:
+    named numeric arrays, and metadata that can be written as JSON
+    """
+
+    arrays: Dict[str, np.ndarray]
+    metadata: Dict[str, Any]
+
+
+class ParsedDataCache:
+    """
+    This class stores cache entries in a directory, one subdirectory per entry
+    holding every array as a .npy file, which can be memory-mapped when read
+    back, and the metadata as JSON. Entries are keyed by the path, size and
+    modification time of the datafile, and optionally a hash of its contents.
+    When the cache grows past max_bytes, the least recently used entries are
+    evicted.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_bytes: Optional[int] = None,
+        hash_content: bool = False,
+        mmap: bool = True,
+    ) -> None:
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError("max_bytes must be positive, got %d" % max_bytes)
+
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hash_content = hash_content
+        self.mmap = mmap
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def get_key(
+        self, filepath: str, accessor_name: str, options: Dict[str, Any]
+    ) -> str:
+        """
+        This method computes the key of the entry for a datafile read by an
+        accessor with some options
+        """
+        file_stat = os.stat(filepath)
+        identity: Dict[str, Any] = {
+            "format_version": CACHE_FORMAT_VERSION,
+            "accessor": accessor_name,
+            "options": options,
+            "path": os.path.abspath(filepath),
+            "size": file_stat.st_size,
+            "mtime_ns": file_stat.st_mtime_ns,
+        }
+
+        if self.hash_content:
+            identity["content_hash"] = hash_file(filepath)
+
+        return hashlib.sha256(
+            json.dumps(identity, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+    def get_entry_dir(self, key: str) -> str:
+        """
+        This method returns the directory of an entry
+        """
+        return os.path.join(self.cache_dir, key)
+
+    def load(self, key: str) -> Optional[CacheEntry]:
+        """
+        This method reads an entry back, or returns None if there is none
+        """
+        entry_dir = self.get_entry_dir(key)
+        metadata_path = os.path.join(entry_dir, METADATA_FILENAME)
+
+        if not os.path.exists(metadata_path):
+            logger.info("parsed data cache miss: %s", key)
+            return None
+
+        with open(metadata_path, encoding="utf-8") as metadata_file:
+            stored = json.load(metadata_file)
+
+        arrays = {
+            name: np.load(
+                os.path.join(entry_dir, name + ARRAY_SUFFIX),
+                mmap_mode="r" if self.mmap else None,
+                allow_pickle=False,
+            )
+            for name in stored["arrays"]
+        }
+
+        # The modification time of the metadata marks when the entry was last
+        # used, for eviction
+        os.utime(metadata_path)
+        logger.info("parsed data cache hit: %s", key)
+
+        return {"arrays": arrays, "metadata": stored["metadata"]}
+
+    def store(self, key: str, entry: CacheEntry) -> None:
+        """
+        This method writes an entry, then evicts old entries if the cache has
+        grown too large. The entry is written to a temporary directory first
+        and moved into place, so a reader never sees a partial entry.
+        """
+        temporary_dir = tempfile.mkdtemp(prefix=".tmp-", dir=self.cache_dir)
+
+        try:
+            for name, array in entry["arrays"].items():
+                np.save(
+                    os.path.join(temporary_dir, name + ARRAY_SUFFIX),
+                    np.asarray(array),
+                    allow_pickle=False,
+                )
+
+            with open(
+                os.path.join(temporary_dir, METADATA_FILENAME), "w", encoding="utf-8"
+            ) as metadata_file:
+                json.dump(
+                    {"arrays": list(entry["arrays"]), "metadata": entry["metadata"]},
+                    metadata_file,
+                )
+
+            entry_dir = self.get_entry_dir(key)
+            if os.path.exists(entry_dir):
+                shutil.rmtree(entry_dir)
+            os.rename(temporary_dir, entry_dir)
+        finally:
+            shutil.rmtree(temporary_dir, ignore_errors=True)
+
+        self.evict(keep=key)
+
+    def list_entries(self) -> List[Tuple[float, int, str]]:
+        """
+        This method lists every entry as its last use time, size in bytes and
+        key, from least to most recently used
+        """
+        entries: List[Tuple[float, int, str]] = []
+
+        for key in os.listdir(self.cache_dir):
+            entry_dir = self.get_entry_dir(key)
+            metadata_path = os.path.join(entry_dir, METADATA_FILENAME)
+            if key.startswith(".") or not os.path.exists(metadata_path):
+                continue
+
+            size = sum(
+                os.path.getsize(os.path.join(entry_dir, filename))
+                for filename in os.listdir(entry_dir)
+            )
+            entries.append((os.path.getmtime(metadata_path), size, key))
+
+        return sorted(entries)
+
+    def evict(self, keep: Optional[str] = None) -> None:
+        """
+        This method removes the least recently used entries, other than the
+        one to keep, until the cache is no larger than max_bytes
+        """
+        if self.max_bytes is None:
+            return
+
+        entries = self.list_entries()
+        total_size = sum(size for (_, size, _) in entries)
+
+        for _, size, key in entries:
+            if total_size <= self.max_bytes:
+                break
+
+            if key == keep:
+                continue
+
+            shutil.rmtree(self.get_entry_dir(key), ignore_errors=True)
+            total_size -= size
+            logger.info("parsed data cache evicted: %s", key)
+
+
+def hash_file(filepath: str) -> str:
+    """
+    This function hashes the contents of a file
+    """
+    digest = hashlib.sha256()
+
+    with open(filepath, "rb") as file:
+        for block in iter(lambda: file.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+
+    return digest.hexdigest()
@@ -0,0 +1,88 @@
+"""
+This module converts ConnectionsSoapData to a DynamicWeightedGraph.
+"""
+
+from typing import Iterable
+from sumgraph.data_handler.data_accessor.connections_soap_accessor import (
+    ConnectionsSoapAccessor,
+)
+from sumgraph.data_handler.data_accessor.data_type import (
+    ConnectionsSoapAccessorData,
+    SatelliteName,
+)
+from sumgraph.helper.interval_index import IntervalIndex
+from sumgraph.model.dynamic_weighted_graph.convention_enum import ConventionEnum
+from sumgraph.model.dynamic_weighted_graph.dynamic_weighted_graph import (
+    DynamicWeightedGraph,
+)
+from sumgraph.model.dynamic_weighted_graph.interval_edge_weight_fn import (
+    IntervalEdgeWeightFn,
+)
+
+
+class ConnectionsSoapToDynamicWeightedGraphAdapter:
+    """
+    This class converts ConnectionsSoapData to a DynamicWeightedGraph under the
+    capacity convention: an edge has a capacity of 1 while its satellites see
+    each other and 0 otherwise. The accessor is only run when the graph is
+    first adapted.
+    """
+
+    def __init__(self, accessor: ConnectionsSoapAccessor):
+        self._accessor = accessor
+        self._has_run = False
+
+    def adapt(self) -> DynamicWeightedGraph:
+        """
+        Perform the conversion
+        """
+        if not self._has_run:
+            self._accessor.run()
+            self._has_run = True
+
+        return ConnectionsSoapToDynamicWeightedGraphAdapter.adapt_data_to_model(
+            self._accessor.data
+        )
+
+    @staticmethod
+    def adapt_data_to_model(data: ConnectionsSoapAccessorData) -> DynamicWeightedGraph:
+        """
+        A method for performing the conversion of data to a dwg, where the
+        windows of every pair are merged into an IntervalIndex first
+        """
+        return ConnectionsSoapToDynamicWeightedGraphAdapter.adapt_index_to_model(
+            satellites=data["satellites"],
+            index=IntervalIndex.from_connections(data["connections"]),
+        )
+
+    @staticmethod
+    def adapt_index_to_model(
+        satellites: Iterable[SatelliteName], index: IntervalIndex
+    ) -> DynamicWeightedGraph:
+        """
+        A method for performing the conversion of indexed connections to a
+        dwg, where every edge reads its intervals straight from the block of
+        its pair in the index
+        """
+        dwg = DynamicWeightedGraph(
+            name="connections_soap_graph", convention=ConventionEnum.CAPACITY
+        )
+
+        # 1. Add vertices
+        for satellite in satellites:
+            dwg.add_vertex(satellite)
+
+        # 2. Add edge weights, one per pair of satellites that ever see each
+        # other
+        for source, target in index.pairs:
+            (starts, ends) = index.get_intervals(source, target)
+            if len(starts) == 0:
+                continue
+
+            dwg.define_edge_weight(
+                source_vertex=source,
+                target_vertex=target,
+                weight_function=IntervalEdgeWeightFn(starts=starts, ends=ends),
+            )
+
+        return dwg
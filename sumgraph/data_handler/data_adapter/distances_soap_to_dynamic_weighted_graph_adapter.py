@@ -2,73 +2,119 @@
 This module converts DistancesSoapData to a DynamicWeightedGraph.
 """
 
+from typing import FrozenSet, List, Set, Tuple, Union
+import numpy as np
 from sumgraph.data_handler.data_accessor.data_type import (
+    ColumnarDistancesSoapAccessorData,
     DistancesSoapAccessorData,
     SatelliteName,
 )
 from sumgraph.data_handler.data_accessor.distances_soap_accessor import (
     DistancesSoapAccessor,
 )
+from sumgraph.data_handler.data_accessor.multi_file_distances_soap_accessor import (
+    MultiFileDistancesSoapAccessor,
+)
 from sumgraph.model.dynamic_weighted_graph.dynamic_weighted_graph import (
     DynamicWeightedGraph,
 )
-from sumgraph.helper.closest_sorted_array_search import closest_sorted_array_search
+from sumgraph.model.dynamic_weighted_graph.nearest_sample_edge_weight_fn import (
+    NearestSampleEdgeWeightFn,
+)
+from sumgraph.model.dynamic_weighted_graph.sample_table import SampleTable
 
 
 class DistancesSoapToDynamicWeightedGraphAdapter:
     """
-    This class converts DistancesSoapData to a DynamicWeightedGraph
+    This class converts DistancesSoapData, read from one file or merged from
+    several, to a DynamicWeightedGraph. The accessor is only run when the
+    graph is first adapted, so a selection can still be made on it until then.
     """
 
-    def __init__(self, accessor: DistancesSoapAccessor):
+    def __init__(
+        self,
+        accessor: Union[DistancesSoapAccessor, MultiFileDistancesSoapAccessor],
+    ):
         self._accessor = accessor
-        self._accessor.run()
+        self._has_run = False
 
     def adapt(self) -> DynamicWeightedGraph:
         """
         Perform the conversion
         """
-        data = self._accessor.data
-        return DistancesSoapToDynamicWeightedGraphAdapter.adapt_data_to_model(data)
+        if not self._has_run:
+            self._accessor.run()
+            self._has_run = True
+
+        columnar_data = self._accessor.columnar_data
+        return DistancesSoapToDynamicWeightedGraphAdapter.adapt_columnar_data_to_model(
+            columnar_data
+        )
 
     @staticmethod
-    def adapt_data_to_model(data: DistancesSoapAccessorData) -> DynamicWeightedGraph:
+    def adapt_columnar_data_to_model(
+        columnar_data: ColumnarDistancesSoapAccessorData,
+    ) -> DynamicWeightedGraph:
         """
-        A method for performing the conversion of data to a dwg
+        A method for performing the conversion of columnar data to a dwg, where
+        every edge reads its samples straight from a column of the distances
+        array. The edges share a SampleTable over the distances array, so a
+        time is resolved to a sample once for all of them.
         """
-        satellites = data["satellites"]
-        distances = data["distances"]
-        distance_sample_times = data["distance_sample_timestamps"]
+        table = SampleTable(
+            sample_times=columnar_data["distance_sample_timestamps"],
+            samples=columnar_data["distances"],
+        )
 
         dwg = DynamicWeightedGraph(name="distances_soap_graph")
 
         # 1. Add vertices
-        for satellite in satellites:
+        for satellite in columnar_data["satellites"]:
             dwg.add_vertex(satellite)
 
-        # 2. Add edge weights
-        def get_weight_fn(source: SatelliteName, target: SatelliteName):
-            def weight_fn(time: float) -> float:
-                # 1. Find the closest time interval
-                (index, _) = closest_sorted_array_search(
-                    array=distance_sample_times, target=time
-                )
+        # 2. Add edge weights, one per pair of satellites
+        for pair_index, (source, target) in enumerate(columnar_data["pairs"]):
+            if dwg.has_edge_weight(source_vertex=source, target_vertex=target):
+                continue
 
-                # 2. Use that index to return the correct value in the distances array
-                return distances[source][target][index]
+            weight_fn = NearestSampleEdgeWeightFn.from_table(table, pair_index)
+            dwg.define_edge_weight(
+                source_vertex=source,
+                target_vertex=target,
+                weight_function=weight_fn,
+            )
 
-            return weight_fn
+        return dwg
 
+    @staticmethod
+    def adapt_data_to_model(data: DistancesSoapAccessorData) -> DynamicWeightedGraph:
+        """
+        A method for performing the conversion of data to a dwg. The series of
+        every pair are stacked into one distances array, so that the edges can
+        share a SampleTable as the edges of columnar data do.
+        """
+        distances = data["distances"]
+        distance_sample_times = np.asarray(
+            data["distance_sample_timestamps"], dtype=float
+        )
+
+        pairs: List[Tuple[SatelliteName, SatelliteName]] = []
+        seen_pairs: Set[FrozenSet[SatelliteName]] = set()
         for source in distances:
             for target in distances[source]:
-                if dwg.has_edge_weight(source_vertex=source, target_vertex=target):
-                    break
+                if frozenset((source, target)) not in seen_pairs:
+                    seen_pairs.add(frozenset((source, target)))
+                    pairs.append((source, target))
 
-                weight_fn = get_weight_fn(source=source, target=target)
-                dwg.define_edge_weight(
-                    source_vertex=source,
-                    target_vertex=target,
-                    weight_function=weight_fn,
-                )
+        distance_matrix = np.empty((len(distance_sample_times), len(pairs)))
+        for pair_index, (source, target) in enumerate(pairs):
+            distance_matrix[:, pair_index] = distances[source][target]
 
-        return dwg
+        return DistancesSoapToDynamicWeightedGraphAdapter.adapt_columnar_data_to_model(
+            {
+                "satellites": data["satellites"],
+                "pairs": pairs,
+                "distances": distance_matrix,
+                "distance_sample_timestamps": distance_sample_times,
+            }
+        )
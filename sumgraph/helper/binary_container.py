@@ -0,0 +1,161 @@
+"""
+This module reads and writes a single-file binary container of named numeric
+arrays and JSON metadata. Every array is stored raw at an aligned offset, so
+it can be memory-mapped straight out of the file when read back.
+"""
+
+import json
+import os
+import struct
+import tempfile
+from typing import Any, Dict, Tuple
+import numpy as np
+
+
+# The first bytes of every container
+MAGIC = b"SUMGRAPH"
+
+# Bump this whenever the layout of a container changes, so that old files are
+# rejected rather than misread
+CONTAINER_FORMAT_VERSION = 1
+
+# The magic, the format version and the length of the JSON header
+PREFIX_FORMAT = "<8sIQ"
+
+# Every array starts at a multiple of this many bytes
+ARRAY_ALIGNMENT = 64
+
+
+def align(offset: int) -> int:
+    """
+    This function rounds an offset up to the next array boundary
+    """
+    return -(-offset // ARRAY_ALIGNMENT) * ARRAY_ALIGNMENT
+
+
+def get_new_file_mode() -> int:
+    """
+    This function returns the permissions a file opened for writing gets. A
+    temporary file is only readable by its owner, so it is given these before
+    it is moved into place.
+    """
+    umask = os.umask(0)
+    os.umask(umask)
+
+    return 0o666 & ~umask
+
+
+def write_container(
+    filepath: str,
+    kind: str,
+    metadata: Dict[str, Any],
+    arrays: Dict[str, np.ndarray],
+) -> None:
+    """
+    This function writes arrays and metadata to a container, recording what
+    kind of object they describe. The container is written to a temporary file
+    first and moved into place, so a reader never sees a partial file.
+    """
+    contiguous_arrays = {
+        name: np.ascontiguousarray(array) for (name, array) in arrays.items()
+    }
+    for name, array in contiguous_arrays.items():
+        if array.dtype.hasobject:
+            raise ValueError("array %s is not numeric" % name)
+
+    table: Dict[str, Dict[str, Any]] = {
+        name: {"dtype": array.dtype.str, "shape": list(array.shape), "offset": 0}
+        for (name, array) in contiguous_arrays.items()
+    }
+    header = {"kind": kind, "metadata": metadata, "arrays": table}
+
+    # The arrays are laid out after the header, which lists their offsets, so
+    # the header is padded and laid out again until the offsets fit in it
+    header_bytes = b""
+    header_length = 0
+    while len(header_bytes) == 0 or len(header_bytes) > header_length:
+        header_length = align(max(header_length, len(header_bytes)))
+        offset = align(struct.calcsize(PREFIX_FORMAT) + header_length)
+        for name, array in contiguous_arrays.items():
+            table[name]["offset"] = offset
+            offset = align(offset + array.nbytes)
+
+        header_bytes = json.dumps(header).encode("utf-8")
+
+    header_bytes = header_bytes.ljust(header_length)
+
+    (file_descriptor, temporary_path) = tempfile.mkstemp(
+        prefix=".tmp-", dir=os.path.dirname(os.path.abspath(filepath))
+    )
+    try:
+        with os.fdopen(file_descriptor, "wb") as file:
+            file.write(
+                struct.pack(
+                    PREFIX_FORMAT, MAGIC, CONTAINER_FORMAT_VERSION, header_length
+                )
+            )
+            file.write(header_bytes)
+            for name, array in contiguous_arrays.items():
+                file.seek(table[name]["offset"])
+                array.tofile(file)
+            file.truncate(offset)
+
+        os.chmod(temporary_path, get_new_file_mode())
+        os.replace(temporary_path, filepath)
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+
+def read_header(filepath: str) -> Dict[str, Any]:
+    """
+    This function reads the header of a container, with the kind of object it
+    describes, its metadata and the layout of its arrays, checking its format
+    version
+    """
+    with open(filepath, "rb") as file:
+        prefix = file.read(struct.calcsize(PREFIX_FORMAT))
+        if len(prefix) < struct.calcsize(PREFIX_FORMAT) or not prefix.startswith(MAGIC):
+            raise ValueError("%s is not a sumgraph binary file" % filepath)
+
+        (_, version, header_length) = struct.unpack(PREFIX_FORMAT, prefix)
+        if version != CONTAINER_FORMAT_VERSION:
+            raise ValueError(
+                "%s has format version %d, but only version %d can be read"
+                % (filepath, version, CONTAINER_FORMAT_VERSION)
+            )
+
+        return json.loads(file.read(header_length).decode("utf-8"))
+
+
+def read_container(
+    filepath: str, kind: str, mmap: bool = True
+) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    """
+    This function reads the metadata and arrays of a container, checking its
+    format version and the kind of object it describes. With mmap, the arrays
+    are copy-on-write maps of the file: they can be written to, but writes
+    never reach the file.
+    """
+    header = read_header(filepath)
+    if header["kind"] != kind:
+        raise ValueError("%s holds a %s, not a %s" % (filepath, header["kind"], kind))
+
+    arrays: Dict[str, np.ndarray] = {}
+    for name, layout in header["arrays"].items():
+        (dtype, shape) = (np.dtype(layout["dtype"]), tuple(layout["shape"]))
+        if int(np.prod(shape)) == 0:
+            arrays[name] = np.empty(shape, dtype=dtype)
+        elif mmap:
+            arrays[name] = np.memmap(
+                filepath, dtype=dtype, mode="c", offset=layout["offset"], shape=shape
+            )
+        else:
+            arrays[name] = np.fromfile(
+                filepath,
+                dtype=dtype,
+                count=int(np.prod(shape)),
+                offset=layout["offset"],
+            ).reshape(shape)
+
+    return (header["metadata"], arrays)
@@ -4,10 +4,14 @@ the closest entry in the array.
 """
 
 
-from typing import List, Tuple
+from typing import Sequence, Tuple, Union
+import numpy as np
 
 
-def closest_sorted_array_search(array: List[float], target: float) -> Tuple[int, float]:
+SortedArray = Union[Sequence[float], np.ndarray]
+
+
+def closest_sorted_array_search(array: SortedArray, target: float) -> Tuple[int, float]:
     """
     Find the closest value in a sorted array of a specified target. Returns the index and value
     """
@@ -17,32 +21,78 @@ def closest_sorted_array_search(array: List[float], target: float) -> Tuple[int,
     if array_length == 0:
         raise ValueError("array is empty")
 
-    if array_length == 1:
-        return (0, array[0])
+    # We bisect the array by moving a window of (offset, length) rather than
+    # slicing it, so no lookup copies the array. Each middle value we visit is
+    # a candidate, and an earlier candidate is only replaced by a strictly
+    # closer later one; this gives the same answer on ties as bisecting
+    # recursively and preferring the middle value at every level.
+    offset = 0
+    length = array_length
+    best_index = -1
+    best_value = 0.0
+    best_diff = float("inf")
 
-    middle_index = int(array_length / 2)
-    middle_value = array[middle_index]
+    while True:
+        middle_index = offset + length // 2
+        middle_value = array[middle_index]
+        middle_diff = abs(middle_value - target)
 
-    if target > middle_value:
-        (right_index, right_value) = closest_sorted_array_search(
-            array=array[middle_index:], target=target
-        )
+        if middle_diff < best_diff:
+            best_index = middle_index
+            best_value = middle_value
+            best_diff = middle_diff
 
-        middle_diff = abs(middle_value - target)
-        right_diff = abs(right_value - target)
+        if length == 1 or target == middle_value:
+            return (best_index, best_value)
 
-        if middle_diff > right_diff:
-            return (right_index + middle_index, right_value)
+        if target > middle_value:
+            offset = middle_index
+            length = length - length // 2
+        else:
+            length = length // 2
 
-    if target < middle_value:
-        (left_index, left_value) = closest_sorted_array_search(
-            array=array[0:middle_index], target=target
-        )
 
-        middle_diff = abs(middle_value - target)
-        left_diff = abs(left_value - target)
+def closest_sorted_array_search_batch(
+    array: SortedArray, targets: SortedArray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the closest value in a sorted array for every one of several
+    targets. Returns an array of indices and an array of values, with the same
+    tie-breaking as closest_sorted_array_search.
+    """
 
-        if middle_diff > left_diff:
-            return (left_index, left_value)
+    sorted_array = np.asarray(array)
+    target_array = np.asarray(targets, dtype=float)
+
+    if len(sorted_array) == 0:
+        raise ValueError("array is empty")
+
+    # Every target bisects its own window at the same time; a target whose
+    # window has shrunk to a single element simply stops moving
+    offsets = np.zeros(target_array.shape, dtype=np.int64)
+    lengths = np.full(target_array.shape, len(sorted_array), dtype=np.int64)
+    best_indices = np.zeros(target_array.shape, dtype=np.int64)
+    best_diffs = np.full(target_array.shape, np.inf)
+
+    while True:
+        middle_indices = offsets + lengths // 2
+        middle_values = sorted_array[middle_indices]
+        middle_diffs = np.abs(middle_values - target_array)
+
+        closer = middle_diffs < best_diffs
+        best_indices = np.where(closer, middle_indices, best_indices)
+        best_diffs = np.where(closer, middle_diffs, best_diffs)
+
+        active = (lengths > 1) & (target_array != middle_values)
+        if not np.any(active):
+            break
+
+        go_right = active & (target_array > middle_values)
+        offsets = np.where(go_right, middle_indices, offsets)
+        lengths = np.where(
+            go_right,
+            lengths - lengths // 2,
+            np.where(active, lengths // 2, 1),
+        )
 
-    return (middle_index, middle_value)
+    return (best_indices, sorted_array[best_indices])
@@ -3,9 +3,15 @@ This module finds the bounds of an integral given a positive, real-valued
 function, target value, and lower bound
 """
 
+import bisect
 import math
-from typing import Callable, Optional, Tuple, TypedDict
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, TypedDict, Union
+import numpy as np
 from scipy import integrate  # type: ignore
+from sumgraph.model.dynamic_weighted_graph.edge_weight_fn import (
+    ExactlyIntegrableEdgeWeightFn,
+    evaluate_edge_weight_fn,
+)
 
 
 IntegrableFn = Callable[[float], float]
@@ -22,6 +28,52 @@ NumericalOptions = TypedDict(
 )
 
 
+class CumulativeIntegral:  # pylint: disable=too-few-public-methods
+    """
+    This class integrates a function from a fixed lower bound. It remembers
+    every upper limit it has integrated to, so each new upper limit only
+    integrates the sub-interval from the closest smaller known limit instead of
+    starting over from the lower bound.
+    """
+
+    def __init__(self, integrable_function: IntegrableFn, lower_bound: float) -> None:
+        self.integrable_function = integrable_function
+        self.lower_bound = lower_bound
+        self._limits: List[float] = [lower_bound]
+        self._values: List[float] = [0.0]
+        self._errors: List[float] = [0.0]
+
+    def __call__(self, upper_bound: float) -> Tuple[float, float]:
+        """
+        Return the integral from the lower bound to upper_bound, along with an
+        estimate of its absolute error, in the same form as integrate.quad
+        """
+        position = bisect.bisect_right(self._limits, upper_bound) - 1
+
+        # Limits below the lower bound are rare, so we do not bother caching them
+        if position < 0:
+            return integrate.quad(  # type: ignore
+                func=self.integrable_function, a=self.lower_bound, b=upper_bound
+            )
+
+        if self._limits[position] == upper_bound:
+            return (self._values[position], self._errors[position])
+
+        result: Tuple[float, float] = integrate.quad(  # type: ignore
+            func=self.integrable_function, a=self._limits[position], b=upper_bound
+        )
+        (increment, increment_error) = result
+
+        value = self._values[position] + increment
+        error = self._errors[position] + increment_error
+
+        self._limits.insert(position + 1, upper_bound)
+        self._values.insert(position + 1, value)
+        self._errors.insert(position + 1, error)
+
+        return (value, error)
+
+
 def find_upper_and_lower_integral_upper_bound(
     get_integral_value: Callable[[float], Tuple[float, float]],
     target_value: float,
@@ -94,17 +146,12 @@ def find_upper_bound_between_range(
     raise RuntimeWarning("Max iterations reached but integral solution was not found")
 
 
-def find_integral_bound(
-    integrable_function: IntegrableFn,
-    lower_bound: float,
-    target_value: float,
-    numerical_options: Optional[NumericalOptions] = None,
-) -> float:
+def resolve_numerical_options(
+    numerical_options: Optional[NumericalOptions],
+) -> Tuple[float, float, int]:
     """
-    This function finds the upper bound of an integral given a positive,
-    real-valued, integrable function, lower bound, and target value. Optionally,
-    specify a maximum upper bound to look at; if we hit the max bound without
-    reaching the target value, we return infiinity.
+    This function fills in the defaults for any numerical options that were not
+    given, returning the maximum upper bound, tolerance and maximum iterations
     """
 
     # Set parameters
@@ -129,10 +176,40 @@ def find_integral_bound(
             else max_iterations
         )
 
-    get_integral_value: Callable[
-        [float], Tuple[float, float]
-    ] = lambda x: integrate.quad(  # type: ignore
-        func=integrable_function, a=lower_bound, b=x
+    return (max_upper_bound, tolerance, max_iterations)
+
+
+def find_integral_bound(
+    integrable_function: IntegrableFn,
+    lower_bound: float,
+    target_value: float,
+    numerical_options: Optional[NumericalOptions] = None,
+) -> float:
+    """
+    This function finds the upper bound of an integral given a positive,
+    real-valued, integrable function, lower bound, and target value. Optionally,
+    specify a maximum upper bound to look at; if we hit the max bound without
+    reaching the target value, we return infiinity.
+    """
+
+    (max_upper_bound, tolerance, max_iterations) = resolve_numerical_options(
+        numerical_options
+    )
+
+    # Functions with an exact integral skip the numerical search entirely
+    if isinstance(integrable_function, ExactlyIntegrableEdgeWeightFn):
+        upper_bound = float(
+            integrable_function.find_integral_bounds(
+                lower_bounds=np.array([lower_bound]),
+                target_values=np.array([target_value]),
+            )[0]
+        )
+        return upper_bound if upper_bound <= max_upper_bound else math.inf
+
+    # Both search phases probe the integral at a sequence of upper limits, so
+    # we keep a running table of the integral and only integrate new pieces
+    get_integral_value: Callable[[float], Tuple[float, float]] = CumulativeIntegral(
+        integrable_function=integrable_function, lower_bound=lower_bound
     )
 
     # First: find potential bounds
@@ -160,3 +237,327 @@ def find_integral_bound(
         max_iterations=max_iterations,
         tolerance=tolerance,
     )
+
+
+# The batched solver integrates with an 8-point Gauss-Legendre rule, halving
+# any piece whose two halves disagree with it, down to a limited depth
+GAUSS_LEGENDRE_NODES, GAUSS_LEGENDRE_WEIGHTS = np.polynomial.legendre.leggauss(8)
+MAX_SUBDIVISION_DEPTH = 25
+
+
+class BatchIntegrand:  # pylint: disable=too-few-public-methods
+    """
+    This class integrates the integrands of many queries at once. Every query
+    is refined independently, but each round of refinement evaluates each
+    distinct integrand in a single vectorized call.
+    """
+
+    def __init__(
+        self,
+        integrable_functions: Union[IntegrableFn, Sequence[IntegrableFn]],
+        query_count: int,
+        tolerance: float,
+    ) -> None:
+        self._tolerance = tolerance
+
+        if callable(integrable_functions):
+            self._functions: List[IntegrableFn] = [integrable_functions]
+            self._function_indices = np.zeros(query_count, dtype=np.int64)
+            return
+
+        if len(integrable_functions) != query_count:
+            raise ValueError(
+                "expected %d integrable functions but got %d"
+                % (query_count, len(integrable_functions))
+            )
+
+        function_index_by_id: Dict[int, int] = {}
+        self._functions = []
+        self._function_indices = np.empty(query_count, dtype=np.int64)
+        for query_index, integrable_function in enumerate(integrable_functions):
+            function_id = id(integrable_function)
+            if function_id not in function_index_by_id:
+                function_index_by_id[function_id] = len(self._functions)
+                self._functions.append(integrable_function)
+            self._function_indices[query_index] = function_index_by_id[function_id]
+
+    def _evaluate(self, query_indices: np.ndarray, times: np.ndarray) -> np.ndarray:
+        """
+        Evaluate the integrand of each query on its row of a 2D array of times
+        """
+        values = np.empty(times.shape, dtype=float)
+        function_indices = self._function_indices[query_indices]
+
+        # Sort the rows by integrand, so each integrand sees one contiguous run
+        order = np.argsort(function_indices, kind="stable")
+        run_starts = np.flatnonzero(
+            np.diff(function_indices[order], prepend=-1, append=-1)
+        )
+        for run_start, run_end in zip(run_starts[:-1], run_starts[1:]):
+            rows = order[run_start:run_end]
+            integrable_function = self._functions[function_indices[rows[0]]]
+            values[rows] = evaluate_edge_weight_fn(
+                integrable_function, times[rows].ravel()
+            ).reshape(len(rows), -1)
+
+        return values
+
+    def _gauss_legendre(
+        self, query_indices: np.ndarray, starts: np.ndarray, ends: np.ndarray
+    ) -> np.ndarray:
+        """
+        Apply the Gauss-Legendre rule to every query over [start, end]
+        """
+        half_widths = (ends - starts) / 2
+        times = (starts + half_widths)[:, np.newaxis] + half_widths[
+            :, np.newaxis
+        ] * GAUSS_LEGENDRE_NODES[np.newaxis, :]
+        values = self._evaluate(query_indices, times)
+
+        return half_widths * (values @ GAUSS_LEGENDRE_WEIGHTS)
+
+    def integrate(
+        self, query_indices: np.ndarray, starts: np.ndarray, ends: np.ndarray
+    ) -> np.ndarray:
+        """
+        Integrate the integrand of every query in query_indices from the
+        matching entry of starts to the matching entry of ends
+        """
+        integrals = np.zeros(len(query_indices), dtype=float)
+
+        # Each piece remembers which query it belongs to, its own estimate and
+        # its share of the tolerance
+        positions = np.arange(len(query_indices))
+        pieces = np.stack([starts, ends]).astype(float)
+        piece_tolerances = np.full(len(query_indices), self._tolerance)
+        estimates = self._gauss_legendre(query_indices, pieces[0], pieces[1])
+
+        for _ in range(MAX_SUBDIVISION_DEPTH):
+            if len(positions) == 0:
+                break
+
+            piece_middles = (pieces[0] + pieces[1]) / 2
+            halves = self._gauss_legendre(
+                np.concatenate([query_indices[positions]] * 2),
+                np.concatenate([pieces[0], piece_middles]),
+                np.concatenate([piece_middles, pieces[1]]),
+            )
+            left_halves = halves[: len(positions)]
+            right_halves = halves[len(positions) :]
+            refined = left_halves + right_halves
+
+            is_split = np.isfinite(refined) & (
+                np.abs(refined - estimates) > piece_tolerances
+            )
+            np.add.at(integrals, positions[~is_split], refined[~is_split])
+
+            positions = np.concatenate([positions[is_split]] * 2)
+            pieces = np.stack(
+                [
+                    np.concatenate([pieces[0, is_split], piece_middles[is_split]]),
+                    np.concatenate([piece_middles[is_split], pieces[1, is_split]]),
+                ]
+            )
+            piece_tolerances = np.concatenate([piece_tolerances[is_split] / 2] * 2)
+            estimates = np.concatenate([left_halves[is_split], right_halves[is_split]])
+
+        # Pieces that are still not converged at the maximum depth keep their
+        # best estimate
+        np.add.at(integrals, positions, estimates)
+
+        return integrals
+
+
+def find_upper_and_lower_integral_upper_bounds(
+    batch_integrand: BatchIntegrand,
+    target_values: np.ndarray,
+    min_upper_bounds: np.ndarray,
+    max_upper_bound: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    This function is the batched form of
+    find_upper_and_lower_integral_upper_bound. It returns a (2 x queries)
+    array of lower and upper limits, the integral at each of those limits, and
+    a mask of the queries whose target value was reached before the maximum
+    upper bound.
+    """
+    limits = np.stack([min_upper_bounds, min_upper_bounds.copy()])
+    limit_values = np.zeros(limits.shape, dtype=float)
+
+    searching = limits[1] < max_upper_bound
+    reached = searching & (target_values <= 0)
+    searching &= ~reached
+
+    while np.any(searching):
+        limits[0, searching] = limits[1, searching]
+        limit_values[0, searching] = limit_values[1, searching]
+        limits[1, searching] = (limits[1, searching] + 1) * 2
+
+        # A query that would have to look past the maximum upper bound stops,
+        # and is treated as having an infinite upper bound
+        searching &= (limits[1] < max_upper_bound) & (limits[1] > limits[0])
+
+        (indices,) = np.nonzero(searching)
+        limit_values[1, indices] = limit_values[0, indices] + batch_integrand.integrate(
+            indices, limits[0, indices], limits[1, indices]
+        )
+
+        reached_now = searching & (limit_values[1] >= target_values)
+        reached |= reached_now
+        searching &= ~reached_now
+
+    return (limits, limit_values, reached)
+
+
+def find_upper_bounds_between_ranges(
+    batch_integrand: BatchIntegrand,
+    target_values: np.ndarray,
+    limits: Tuple[np.ndarray, np.ndarray, np.ndarray],
+    max_iterations: int,
+    tolerance: float,
+) -> np.ndarray:
+    """
+    This function is the batched form of find_upper_bound_between_range. It
+    bisects the limits of every query whose target value was reached, and
+    returns infinity for every other query.
+    """
+    (test_limits, limit_values, pending) = limits
+    upper_bounds = np.full(len(target_values), math.inf)
+
+    for _ in range(max_iterations):
+        if not np.any(pending):
+            return upper_bounds
+
+        (indices,) = np.nonzero(pending)
+        test_upper_bounds = (test_limits[0, indices] + test_limits[1, indices]) / 2
+        test_values = limit_values[0, indices] + batch_integrand.integrate(
+            indices, test_limits[0, indices], test_upper_bounds
+        )
+
+        is_solved = np.abs(test_values - target_values[indices]) <= tolerance
+        upper_bounds[indices[is_solved]] = test_upper_bounds[is_solved]
+        pending[indices[is_solved]] = False
+
+        is_below = ~is_solved & (test_values < target_values[indices])
+        test_limits[0, indices[is_below]] = test_upper_bounds[is_below]
+        limit_values[0, indices[is_below]] = test_values[is_below]
+
+        is_above = ~is_solved & (test_values > target_values[indices])
+        test_limits[1, indices[is_above]] = test_upper_bounds[is_above]
+
+    if np.any(pending):
+        raise RuntimeWarning(
+            "Max iterations reached but integral solution was not found"
+        )
+
+    return upper_bounds
+
+
+def find_exact_integral_bounds(
+    integrable_functions: Sequence[IntegrableFn],
+    lower_bounds: np.ndarray,
+    target_values: np.ndarray,
+    max_upper_bound: float,
+) -> Tuple[np.ndarray, List[int]]:
+    """
+    This function solves every query whose integrand has an exact integral,
+    together with every other query that shares its integrand. It returns the
+    upper bounds, which are infinite for unsolved queries, and the indices of
+    the queries that still need a numerical search.
+    """
+    upper_bounds = np.full(len(integrable_functions), math.inf)
+
+    query_indices_by_function: Dict[int, List[int]] = {}
+    numerical_query_indices: List[int] = []
+    for query_index, integrable_function in enumerate(integrable_functions):
+        if isinstance(integrable_function, ExactlyIntegrableEdgeWeightFn):
+            query_indices_by_function.setdefault(id(integrable_function), []).append(
+                query_index
+            )
+        else:
+            numerical_query_indices.append(query_index)
+
+    for query_indices in query_indices_by_function.values():
+        exact_function = integrable_functions[query_indices[0]]
+        assert isinstance(exact_function, ExactlyIntegrableEdgeWeightFn)
+        exact_upper_bounds = exact_function.find_integral_bounds(
+            lower_bounds=lower_bounds[query_indices],
+            target_values=target_values[query_indices],
+        )
+        upper_bounds[query_indices] = np.where(
+            exact_upper_bounds <= max_upper_bound, exact_upper_bounds, math.inf
+        )
+
+    return (upper_bounds, numerical_query_indices)
+
+
+def find_integral_bounds(
+    integrable_functions: Union[IntegrableFn, Sequence[IntegrableFn]],
+    lower_bounds: Union[Sequence[float], np.ndarray],
+    target_values: Union[Sequence[float], np.ndarray],
+    numerical_options: Optional[NumericalOptions] = None,
+) -> np.ndarray:
+    """
+    This function is the batched form of find_integral_bound: it finds the
+    upper bound of the integral for every pair of lower bound and target value,
+    using either a single integrand for every query or one integrand per query.
+    All searches advance together, so every step evaluates each integrand once
+    on an array of times, and integrands with an exact integral are solved
+    without searching. Queries that hit the maximum upper bound without
+    reaching their target value get infinity.
+    """
+
+    (max_upper_bound, tolerance, max_iterations) = resolve_numerical_options(
+        numerical_options
+    )
+
+    (lower_bound_array, target_value_array) = np.broadcast_arrays(
+        np.asarray(lower_bounds, dtype=float), np.asarray(target_values, dtype=float)
+    )
+    lower_bound_array = lower_bound_array.ravel()
+    target_value_array = target_value_array.ravel()
+    query_count = len(lower_bound_array)
+
+    if callable(integrable_functions):
+        integrable_functions = [integrable_functions] * query_count
+
+    if len(integrable_functions) != query_count:
+        raise ValueError(
+            "expected %d integrable functions but got %d"
+            % (query_count, len(integrable_functions))
+        )
+
+    (upper_bounds, numerical_query_indices) = find_exact_integral_bounds(
+        integrable_functions=integrable_functions,
+        lower_bounds=lower_bound_array,
+        target_values=target_value_array,
+        max_upper_bound=max_upper_bound,
+    )
+
+    if len(numerical_query_indices) == 0:
+        return upper_bounds
+
+    batch_integrand = BatchIntegrand(
+        integrable_functions=[integrable_functions[i] for i in numerical_query_indices],
+        query_count=len(numerical_query_indices),
+        tolerance=tolerance / 10,
+    )
+
+    # First: find potential bounds
+    limits = find_upper_and_lower_integral_upper_bounds(
+        batch_integrand=batch_integrand,
+        target_values=target_value_array[numerical_query_indices],
+        min_upper_bounds=lower_bound_array[numerical_query_indices],
+        max_upper_bound=max_upper_bound,
+    )
+
+    # Second: binary search until we find the values
+    upper_bounds[numerical_query_indices] = find_upper_bounds_between_ranges(
+        batch_integrand=batch_integrand,
+        target_values=target_value_array[numerical_query_indices],
+        limits=limits,
+        max_iterations=max_iterations,
+        tolerance=tolerance,
+    )
+
+    return upper_bounds
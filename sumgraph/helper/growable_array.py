@@ -0,0 +1,75 @@
+"""
+This module provides a two-dimensional numeric buffer that rows can be
+appended to in blocks, for reading data whose length is not known up front.
+"""
+
+import numpy as np
+
+
+# Each time the buffer is full, its capacity grows by this factor
+GROWTH_FACTOR = 1.5
+
+
+class GrowableArray:
+    """
+    This class appends blocks of rows to a preallocated array, growing it
+    geometrically when it is full, so appending n rows costs amortized O(n)
+    copying. finish() trims the array to the rows appended in place.
+    """
+
+    def __init__(
+        self, column_count: int, initial_capacity: int = 1024, dtype: type = float
+    ) -> None:
+        if initial_capacity <= 0:
+            raise ValueError(
+                "initial_capacity must be positive, got %d" % initial_capacity
+            )
+
+        self._buffer: np.ndarray = np.empty(
+            (initial_capacity, column_count), dtype=dtype
+        )
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        """
+        The number of rows the buffer can hold before it has to grow
+        """
+        return len(self._buffer)
+
+    def append(self, rows: np.ndarray) -> None:
+        """
+        Append a block of rows, which must have as many columns as the buffer
+        """
+        rows = np.asarray(rows, dtype=self._buffer.dtype)
+
+        if rows.ndim != 2 or rows.shape[1] != self._buffer.shape[1]:
+            raise ValueError(
+                "expected rows with %d columns but got shape %s"
+                % (self._buffer.shape[1], rows.shape)
+            )
+
+        required_capacity = self._size + len(rows)
+        if required_capacity > self.capacity:
+            self._buffer.resize(
+                (
+                    max(required_capacity, int(self.capacity * GROWTH_FACTOR)),
+                    self._buffer.shape[1],
+                ),
+                refcheck=False,
+            )
+
+        self._buffer[self._size : required_capacity] = rows
+        self._size = required_capacity
+
+    def finish(self) -> np.ndarray:
+        """
+        Trim the buffer to the rows appended so far and return it. The buffer
+        must not be appended to afterwards.
+        """
+        self._buffer.resize((self._size, self._buffer.shape[1]), refcheck=False)
+
+        return self._buffer
@@ -0,0 +1,242 @@
+"""
+This module indexes the time intervals during which pairs of satellites are
+linked, such as the rise and set times of connections, so that the links that
+are up at a time or during a window can be found without scanning every pair.
+"""
+
+from typing import Dict, FrozenSet, List, Mapping, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+
+Pair = Tuple[str, str]
+
+
+def merge_intervals(
+    pair_ids: np.ndarray, starts: np.ndarray, ends: np.ndarray, pair_count: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    This function sorts the intervals of every pair by start and merges the
+    ones that overlap or touch, dropping empty intervals. It returns the
+    merged starts and ends, grouped by pair, along with the offset of the
+    first interval of every pair, so that the intervals of pair p are
+    starts[offsets[p] : offsets[p + 1]].
+    """
+    is_empty = ends <= starts
+    (pair_ids, starts, ends) = (pair_ids[~is_empty], starts[~is_empty], ends[~is_empty])
+    if len(starts) == 0:
+        return (np.zeros(pair_count + 1, dtype=np.int64), starts, ends)
+
+    order = np.lexsort((starts, pair_ids))
+    (pair_ids, starts, ends) = (pair_ids[order], starts[order], ends[order])
+
+    # The furthest any earlier interval of the same pair reaches; an interval
+    # that starts after it begins a new merged interval
+    reaches = (
+        pd.Series(ends).groupby(pair_ids).cummax().to_numpy(dtype=float)  # type: ignore
+    )
+    is_first = np.ones(len(starts), dtype=bool)
+    is_first[1:] = (pair_ids[1:] != pair_ids[:-1]) | (starts[1:] > reaches[:-1])
+    firsts = np.flatnonzero(is_first)
+    lasts = np.append(firsts[1:], len(starts)) - 1
+
+    offsets = np.searchsorted(pair_ids[firsts], np.arange(pair_count + 1))
+
+    return (offsets, starts[firsts], reaches[lasts])
+
+
+class IntervalIndex:
+    """
+    This class indexes half-open intervals [start, end) for unordered pairs of
+    satellites. The intervals of every pair are merged and stored sorted, one
+    block per pair, in flat arrays, so whether a pair is linked at a time is a
+    binary search over its own intervals. Every interval is also ordered by
+    start and by end across all pairs: a query over all pairs only checks the
+    smaller of the sets of intervals that start early enough or end late
+    enough to match.
+    """
+
+    def __init__(
+        self,
+        pairs: Sequence[Pair],
+        pair_ids: np.ndarray,
+        starts: np.ndarray,
+        ends: np.ndarray,
+    ) -> None:
+        (pair_ids, starts, ends) = (
+            np.asarray(pair_ids, dtype=np.int64),
+            np.asarray(starts, dtype=float),
+            np.asarray(ends, dtype=float),
+        )
+        if not len(pair_ids) == len(starts) == len(ends):
+            raise ValueError(
+                "pair_ids, starts and ends have different lengths: %d, %d and %d"
+                % (len(pair_ids), len(starts), len(ends))
+            )
+
+        self.pairs = list(pairs)
+        self._pair_ids: Dict[FrozenSet[str], int] = {
+            frozenset(pair): pair_id for (pair_id, pair) in enumerate(self.pairs)
+        }
+        (self.offsets, self.starts, self.ends) = merge_intervals(
+            pair_ids, starts, ends, len(self.pairs)
+        )
+
+        self._start_order = np.argsort(self.starts, kind="stable")
+        self._end_order = np.argsort(self.ends, kind="stable")
+
+    @classmethod
+    def from_connections(
+        cls, connections: Mapping[str, Mapping[str, Sequence[Tuple[float, float]]]]
+    ) -> "IntervalIndex":
+        """
+        This method indexes the connections provided by ConnectionsSoapAccessor,
+        where every window is stored under both directions of its pair
+        """
+        pairs: List[Pair] = []
+        pair_ids: Dict[FrozenSet[str], int] = {}
+        windows: List[Tuple[int, float, float]] = []
+
+        for source, targets in connections.items():
+            for target, target_windows in targets.items():
+                if frozenset((source, target)) not in pair_ids:
+                    pair_ids[frozenset((source, target))] = len(pairs)
+                    pairs.append((source, target))
+
+                pair_id = pair_ids[frozenset((source, target))]
+                windows.extend((pair_id, start, end) for (start, end) in target_windows)
+
+        window_array = np.array(windows, dtype=float).reshape(len(windows), 3)
+
+        return cls(
+            pairs=pairs,
+            pair_ids=window_array[:, 0].astype(np.int64),
+            starts=window_array[:, 1],
+            ends=window_array[:, 2],
+        )
+
+    @property
+    def interval_count(self) -> int:
+        """
+        The number of merged intervals over all pairs
+        """
+        return len(self.starts)
+
+    def get_pair_id(self, source: str, target: str) -> int:
+        """
+        This method returns the id of a pair, in either order
+        """
+        return self._pair_ids[frozenset((source, target))]
+
+    def get_intervals(self, source: str, target: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        This method returns the sorted, disjoint starts and ends of the
+        intervals of a pair
+        """
+        pair_id = self.get_pair_id(source, target)
+        (first, end) = (self.offsets[pair_id], self.offsets[pair_id + 1])
+
+        return (self.starts[first:end], self.ends[first:end])
+
+    def is_active(self, source: str, target: str, time: float) -> bool:
+        """
+        This method checks whether a pair is linked at a time
+        """
+        return bool(self.are_active(source, target, np.array([time]))[0])
+
+    def are_active(self, source: str, target: str, times: np.ndarray) -> np.ndarray:
+        """
+        This method checks whether a pair is linked at every one of an array of
+        times
+        """
+        (starts, ends) = self.get_intervals(source, target)
+        if len(starts) == 0:
+            return np.zeros(np.shape(times), dtype=bool)
+
+        indices = np.searchsorted(starts, times, side="right") - 1
+
+        return (indices >= 0) & (times < ends[np.maximum(indices, 0)])
+
+    def find_intervals(self, window_start: float, window_end: float) -> np.ndarray:
+        """
+        This method returns the sorted ids of the intervals that overlap the
+        window [window_start, window_end), or that contain window_start if the
+        window is empty
+        """
+        if window_end < window_start:
+            raise ValueError(
+                "window must not end before it starts, got (%g, %g)"
+                % (window_start, window_end)
+            )
+
+        # An interval matches if it starts before the window ends, or by the
+        # time of an empty window, and ends after the window starts
+        is_point = window_end == window_start
+        start_count = np.searchsorted(
+            self.starts,
+            window_end,
+            side="right" if is_point else "left",
+            sorter=self._start_order,
+        )
+        end_first = np.searchsorted(
+            self.ends, window_start, side="right", sorter=self._end_order
+        )
+
+        if start_count <= self.interval_count - end_first:
+            candidates = self._start_order[:start_count]
+            matches = candidates[self.ends[candidates] > window_start]
+        else:
+            candidates = self._end_order[end_first:]
+            candidate_starts = self.starts[candidates]
+            matches = candidates[
+                candidate_starts <= window_end
+                if is_point
+                else candidate_starts < window_end
+            ]
+
+        return np.sort(matches)
+
+    def get_interval_pair_ids(self, interval_ids: np.ndarray) -> np.ndarray:
+        """
+        This method returns the id of the pair of every one of an array of
+        interval ids
+        """
+        return np.searchsorted(self.offsets, interval_ids, side="right") - 1
+
+    def active_pair_ids(self, time: float) -> np.ndarray:
+        """
+        This method returns the sorted ids of the pairs that are linked at a
+        time
+        """
+        return self.get_interval_pair_ids(self.find_intervals(time, time))
+
+    def active_pair_ids_in_window(
+        self, window_start: float, window_end: float
+    ) -> np.ndarray:
+        """
+        This method returns the sorted ids of the pairs that are linked at any
+        time in the window [window_start, window_end)
+        """
+        return np.unique(
+            self.get_interval_pair_ids(self.find_intervals(window_start, window_end))
+        )
+
+    def active_pairs(self, time: float) -> List[Pair]:
+        """
+        This method returns the pairs that are linked at a time
+        """
+        return [self.pairs[pair_id] for pair_id in self.active_pair_ids(time).tolist()]
+
+    def active_pairs_in_window(
+        self, window_start: float, window_end: float
+    ) -> List[Pair]:
+        """
+        This method returns the pairs that are linked at any time in the
+        window [window_start, window_end)
+        """
+        return [
+            self.pairs[pair_id]
+            for pair_id in self.active_pair_ids_in_window(
+                window_start, window_end
+            ).tolist()
+        ]
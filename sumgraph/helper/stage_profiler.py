@@ -0,0 +1,105 @@
+"""
+This module measures the stages of a batch run: how long each one takes, the
+peak memory of the process once it is done, and how many items it handles
+per second.
+"""
+
+import sys
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, TypedDict
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - resource is only available on Unix
+    resource = None  # type: ignore
+
+
+class StageRecord(TypedDict):
+    """
+    This class is a type declaration for the measurements of a stage. A stage
+    sets the number of items it handled, in its unit, itself.
+    """
+
+    name: str
+    unit: str
+    items: int
+    seconds: float
+    peak_rss_bytes: Optional[int]
+
+
+def get_peak_rss_bytes() -> Optional[int]:
+    """
+    This function returns the largest resident set size of this process, or
+    of any of its finished worker processes, so far, or None where the
+    platform does not report it
+    """
+    if resource is None:
+        return None
+
+    peak_rss = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+
+    # macOS reports bytes, and other platforms kilobytes
+    return peak_rss if sys.platform == "darwin" else peak_rss * 1024
+
+
+class StageProfiler:
+    """
+    This class records every stage run inside its stage() context manager, in
+    order
+    """
+
+    def __init__(self) -> None:
+        self.records: List[StageRecord] = []
+
+    @contextmanager
+    def stage(self, name: str, unit: str) -> Iterator[StageRecord]:
+        """
+        This method times the stage run inside it. The record it yields is
+        added to records once the stage is done, so the stage can set its
+        number of items on it.
+        """
+        record: StageRecord = {
+            "name": name,
+            "unit": unit,
+            "items": 0,
+            "seconds": 0.0,
+            "peak_rss_bytes": None,
+        }
+        start = time.perf_counter()
+
+        try:
+            yield record
+        finally:
+            record["seconds"] = time.perf_counter() - start
+            record["peak_rss_bytes"] = get_peak_rss_bytes()
+            self.records.append(record)
+
+    def format_report(self) -> str:
+        """
+        This method formats every record as a line of a table
+        """
+        lines = [
+            "%-12s %10s %14s %24s" % ("stage", "wall time", "peak RSS", "throughput")
+        ]
+
+        for record in self.records:
+            peak_rss = (
+                "n/a"
+                if record["peak_rss_bytes"] is None
+                else "%.1f MiB" % (record["peak_rss_bytes"] / 2**20)
+            )
+            throughput = (
+                "%.4g %s/s" % (record["items"] / record["seconds"], record["unit"])
+                if record["seconds"] > 0
+                else "n/a"
+            )
+            lines.append(
+                "%-12s %9.3fs %14s %24s"
+                % (record["name"], record["seconds"], peak_rss, throughput)
+            )
+
+        return "\n".join(lines)
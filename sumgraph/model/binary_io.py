@@ -0,0 +1,358 @@
+"""
+This module saves DynamicWeightedGraph, SummaryGraph and CentralityMap objects
+to compact binary files and loads them back, so that a graph does not have to
+be rebuilt from its source data every time a process starts. Every file is a
+binary container of arrays, with the vertex table and other metadata in its
+header; see sumgraph.helper.binary_container.
+"""
+
+from typing import Any, Dict, Iterator, List, Tuple, Union
+import numpy as np
+from sumgraph.helper.binary_container import read_container, write_container
+from sumgraph.model.centrality_map.centrality_map import CentralityMap
+from sumgraph.model.dynamic_weighted_graph.convention_enum import ConventionEnum
+from sumgraph.model.dynamic_weighted_graph.dynamic_weighted_graph import (
+    DynamicWeightedGraph,
+)
+from sumgraph.model.dynamic_weighted_graph.edge_weight_fn import (
+    ConstantEdgeWeightFn,
+    EdgeWeightFn,
+)
+from sumgraph.model.dynamic_weighted_graph.edge_weight_fn_kind_enum import (
+    EdgeWeightFnKindEnum,
+)
+from sumgraph.model.dynamic_weighted_graph.interval_edge_weight_fn import (
+    IntervalEdgeWeightFn,
+)
+from sumgraph.model.dynamic_weighted_graph.nearest_sample_edge_weight_fn import (
+    NearestSampleEdgeWeightFn,
+)
+from sumgraph.model.dynamic_weighted_graph.piecewise_edge_weight_fn import (
+    PiecewiseConstantEdgeWeightFn,
+    PiecewiseLinearEdgeWeightFn,
+)
+from sumgraph.model.dynamic_weighted_graph.sample_table import SampleTable
+from sumgraph.model.summary_graph.csr_summary_graph import CsrSummaryGraph
+from sumgraph.model.summary_graph.summary_graph import SummaryGraph
+
+
+DYNAMIC_WEIGHTED_GRAPH_KIND = "dynamic_weighted_graph"
+SUMMARY_GRAPH_KIND = "summary_graph"
+CENTRALITY_MAP_KIND = "centrality_map"
+
+# An edge weight function as the kind of function, two arrays of data and two
+# scalar parameters, whose meaning depends on the kind
+EncodedEdgeWeightFn = Tuple[
+    EdgeWeightFnKindEnum, np.ndarray, np.ndarray, Tuple[float, float]
+]
+
+
+def encode_edge_weight_fn(
+    weight_function: EdgeWeightFn, tables: Dict[int, Tuple[int, SampleTable]]
+) -> EncodedEdgeWeightFn:
+    """
+    This function encodes a data-backed edge weight function. An edge that is
+    a column of a SampleTable only records the table and the column, and the
+    table is added to tables, keyed by its id, the first time it is seen.
+    """
+    empty = np.zeros(0)
+
+    if isinstance(weight_function, NearestSampleEdgeWeightFn):
+        if weight_function.table is not None:
+            (table_id, _) = tables.setdefault(
+                id(weight_function.table), (len(tables), weight_function.table)
+            )
+            return (
+                EdgeWeightFnKindEnum.SAMPLE_TABLE,
+                empty,
+                empty,
+                (table_id, weight_function.column),
+            )
+
+        return (
+            EdgeWeightFnKindEnum.NEAREST_SAMPLE,
+            weight_function.sample_times,
+            weight_function.samples,
+            (0.0, 0.0),
+        )
+
+    if isinstance(weight_function, PiecewiseConstantEdgeWeightFn):
+        return (
+            EdgeWeightFnKindEnum.PIECEWISE_CONSTANT,
+            weight_function.breakpoints,
+            weight_function.values,
+            (0.0, 0.0),
+        )
+
+    if isinstance(weight_function, PiecewiseLinearEdgeWeightFn):
+        return (
+            EdgeWeightFnKindEnum.PIECEWISE_LINEAR,
+            weight_function.knots,
+            weight_function.values,
+            (0.0, 0.0),
+        )
+
+    if isinstance(weight_function, IntervalEdgeWeightFn):
+        return (
+            EdgeWeightFnKindEnum.INTERVAL,
+            weight_function.starts,
+            weight_function.ends,
+            (weight_function.up_value, weight_function.down_value),
+        )
+
+    if isinstance(weight_function, ConstantEdgeWeightFn):
+        return (EdgeWeightFnKindEnum.CONSTANT, empty, empty, (weight_function.value, 0))
+
+    raise ValueError(
+        "edge weight function %r is not backed by data and cannot be saved"
+        % weight_function
+    )
+
+
+def decode_edge_weight_fn(
+    encoded: EncodedEdgeWeightFn, tables: List[SampleTable]
+) -> EdgeWeightFn:
+    """
+    This function rebuilds an edge weight function encoded by
+    encode_edge_weight_fn
+    """
+    (kind, first, second, (first_parameter, second_parameter)) = encoded
+
+    if kind == EdgeWeightFnKindEnum.SAMPLE_TABLE:
+        return NearestSampleEdgeWeightFn.from_table(
+            tables[int(first_parameter)], int(second_parameter)
+        )
+
+    if kind == EdgeWeightFnKindEnum.NEAREST_SAMPLE:
+        return NearestSampleEdgeWeightFn(sample_times=first, samples=second)
+
+    if kind == EdgeWeightFnKindEnum.PIECEWISE_CONSTANT:
+        return PiecewiseConstantEdgeWeightFn(breakpoints=first, values=second)
+
+    if kind == EdgeWeightFnKindEnum.PIECEWISE_LINEAR:
+        return PiecewiseLinearEdgeWeightFn(knots=first, values=second)
+
+    if kind == EdgeWeightFnKindEnum.INTERVAL:
+        return IntervalEdgeWeightFn(
+            starts=first,
+            ends=second,
+            up_value=first_parameter,
+            down_value=second_parameter,
+        )
+
+    return ConstantEdgeWeightFn(first_parameter)
+
+
+def concatenate_with_offsets(arrays: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    This function concatenates arrays into one, along with the offset of every
+    array, so that the i-th array is values[offsets[i] : offsets[i + 1]]
+    """
+    offsets = np.zeros(len(arrays) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(array) for array in arrays])
+
+    return (offsets, np.concatenate([np.zeros(0)] + arrays).astype(float))
+
+
+def save_dynamic_weighted_graph(dwg: DynamicWeightedGraph, filepath: str) -> None:
+    """
+    This function saves a graph whose edge weight functions are all backed by
+    data. Edges that are columns of the same SampleTable share a single copy
+    of it in the file.
+    """
+    vertices = sorted(dwg.vertex_set)
+    vertex_index = {vertex: index for (index, vertex) in enumerate(vertices)}
+    edges = dwg.get_edges()
+
+    tables: Dict[int, Tuple[int, SampleTable]] = {}
+    encoded = [
+        encode_edge_weight_fn(dwg.edge_set[source][target], tables)
+        for (source, target) in edges
+    ]
+    (first_offsets, first_values) = concatenate_with_offsets(
+        [np.asarray(first) for (_, first, _, _) in encoded]
+    )
+    (second_offsets, second_values) = concatenate_with_offsets(
+        [np.asarray(second) for (_, _, second, _) in encoded]
+    )
+
+    arrays: Dict[str, np.ndarray] = {
+        "edge_source_ids": np.array(
+            [vertex_index[source] for (source, _) in edges], dtype=np.int64
+        ),
+        "edge_target_ids": np.array(
+            [vertex_index[target] for (_, target) in edges], dtype=np.int64
+        ),
+        "edge_kinds": np.array([kind.value for (kind, _, _, _) in encoded], np.int8),
+        "edge_parameters": np.array(
+            [parameters for (_, _, _, parameters) in encoded], dtype=float
+        ).reshape(len(edges), 2),
+        "first_offsets": first_offsets,
+        "first_values": first_values,
+        "second_offsets": second_offsets,
+        "second_values": second_values,
+    }
+    for table_id, table in tables.values():
+        arrays["table_%d_sample_times" % table_id] = table.sample_times
+        arrays["table_%d_samples" % table_id] = np.asarray(table.samples)
+
+    write_container(
+        filepath,
+        kind=DYNAMIC_WEIGHTED_GRAPH_KIND,
+        metadata={
+            "name": dwg.name,
+            "directed": dwg.directed,
+            "convention": dwg.convention.name,
+            "vertices": vertices,
+            "table_count": len(tables),
+        },
+        arrays=arrays,
+    )
+
+
+def load_dynamic_weighted_graph(
+    filepath: str, mmap: bool = True
+) -> DynamicWeightedGraph:
+    """
+    This function loads a graph saved by save_dynamic_weighted_graph. With
+    mmap, the data of every edge is read from the file as it is used.
+    """
+    (metadata, arrays) = read_container(
+        filepath, kind=DYNAMIC_WEIGHTED_GRAPH_KIND, mmap=mmap
+    )
+    vertices: List[str] = metadata["vertices"]
+
+    dwg = DynamicWeightedGraph(
+        name=metadata["name"],
+        convention=ConventionEnum[metadata["convention"]],
+        directed=metadata["directed"],
+    )
+    for vertex in vertices:
+        dwg.add_vertex(vertex)
+
+    for source_id, target_id, weight_function in decode_edges(metadata, arrays):
+        dwg.define_edge_weight(
+            source_vertex=vertices[source_id],
+            target_vertex=vertices[target_id],
+            weight_function=weight_function,
+        )
+
+    return dwg
+
+
+def decode_edges(
+    metadata: Dict[str, Any], arrays: Dict[str, np.ndarray]
+) -> Iterator[Tuple[int, int, EdgeWeightFn]]:
+    """
+    This function rebuilds the edge weight function of every edge saved by
+    save_dynamic_weighted_graph, along with the ids of its vertices
+    """
+    tables = [
+        SampleTable(
+            sample_times=arrays["table_%d_sample_times" % table_id],
+            samples=arrays["table_%d_samples" % table_id],
+        )
+        for table_id in range(metadata["table_count"])
+    ]
+    (first_offsets, second_offsets) = (
+        arrays["first_offsets"].tolist(),
+        arrays["second_offsets"].tolist(),
+    )
+
+    for edge_id, (source_id, target_id, kind, parameters) in enumerate(
+        zip(
+            arrays["edge_source_ids"].tolist(),
+            arrays["edge_target_ids"].tolist(),
+            arrays["edge_kinds"].tolist(),
+            arrays["edge_parameters"].tolist(),
+        )
+    ):
+        weight_function = decode_edge_weight_fn(
+            (
+                EdgeWeightFnKindEnum(kind),
+                arrays["first_values"][
+                    first_offsets[edge_id] : first_offsets[edge_id + 1]
+                ],
+                arrays["second_values"][
+                    second_offsets[edge_id] : second_offsets[edge_id + 1]
+                ],
+                (parameters[0], parameters[1]),
+            ),
+            tables,
+        )
+
+        yield (source_id, target_id, weight_function)
+
+
+def save_summary_graph(
+    graph: Union[SummaryGraph, CsrSummaryGraph], filepath: str
+) -> None:
+    """
+    This function saves a summary graph in CSR form
+    """
+    if isinstance(graph, SummaryGraph):
+        graph = CsrSummaryGraph.from_summary_graph(graph)
+
+    write_container(
+        filepath,
+        kind=SUMMARY_GRAPH_KIND,
+        metadata={"name": graph.name, "vertices": graph.vertices},
+        arrays={
+            "offsets": graph.offsets,
+            "indices": graph.indices,
+            "weights": graph.weights,
+        },
+    )
+
+
+def load_summary_graph(filepath: str, mmap: bool = True) -> CsrSummaryGraph:
+    """
+    This function loads a summary graph saved by save_summary_graph as a
+    CsrSummaryGraph, whose to_summary_graph method converts it back to a
+    SummaryGraph if needed
+    """
+    (metadata, arrays) = read_container(filepath, kind=SUMMARY_GRAPH_KIND, mmap=mmap)
+
+    graph = CsrSummaryGraph(name=metadata["name"], vertices=metadata["vertices"])
+    if len(arrays["offsets"]) != graph.vertex_count + 1:
+        raise ValueError(
+            "expected %d offsets but got %d"
+            % (graph.vertex_count + 1, len(arrays["offsets"]))
+        )
+
+    graph.offsets = arrays["offsets"]
+    graph.indices = arrays["indices"]
+    graph.weights = arrays["weights"]
+
+    return graph
+
+
+def save_centrality_map(centrality_map: CentralityMap, filepath: str) -> None:
+    """
+    This function saves a centrality map
+    """
+    vertices = sorted(centrality_map.vertex_set)
+
+    write_container(
+        filepath,
+        kind=CENTRALITY_MAP_KIND,
+        metadata={"name": centrality_map.name, "vertices": vertices},
+        arrays={
+            "weights": np.array(
+                [centrality_map.vertex_weights[vertex] for vertex in vertices],
+                dtype=float,
+            )
+        },
+    )
+
+
+def load_centrality_map(filepath: str) -> CentralityMap:
+    """
+    This function loads a centrality map saved by save_centrality_map
+    """
+    (metadata, arrays) = read_container(filepath, kind=CENTRALITY_MAP_KIND)
+
+    return CentralityMap.from_vertex_weights(
+        name=metadata["name"],
+        vertex_weights=dict(zip(metadata["vertices"], arrays["weights"].tolist())),
+    )
@@ -0,0 +1,19 @@
+"""
+This module defines the centrality measures that can fill a CentralityMap
+"""
+
+
+from enum import Enum
+
+
+class CentralityEnum(Enum):
+    """
+    This enum lists the centrality measures of a vertex
+    """
+
+    DEGREE = 1
+    STRENGTH = 2
+    CLOSENESS = 3
+    EIGENVECTOR = 4
+    PAGERANK = 5
+    BETWEENNESS = 6
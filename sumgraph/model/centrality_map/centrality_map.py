@@ -4,7 +4,8 @@ structure for a list of vertices with weights
 """
 
 
-from typing import Dict, Set
+from __future__ import annotations
+from typing import Dict, Mapping, Set
 
 
 DEFAULT_VERTEX_WEIGHT = 0
@@ -25,6 +26,20 @@ class CentralityMap:
     ) -> None:
         self.name = name
         self.vertex_set = set()
+        self.vertex_weights = {}
+
+    @classmethod
+    def from_vertex_weights(
+        cls, name: str, vertex_weights: Mapping[str, float]
+    ) -> CentralityMap:
+        """
+        This method builds a map in bulk from the weight of every vertex
+        """
+        centrality_map = cls(name=name)
+        centrality_map.vertex_set = set(vertex_weights)
+        centrality_map.vertex_weights = dict(vertex_weights)
+
+        return centrality_map
 
     def has_vertex(self, vertex: str) -> bool:
         """
@@ -3,12 +3,26 @@ This module contains the DynamicWeightedGraph class, which is the main data
 structure for a weighted graph that is dynamic.
 """
 
-from typing import Dict, Set
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+import numpy as np
 from sumgraph.model.dynamic_weighted_graph.edge_weight_fn import (
     EdgeWeightFn,
+    TimeArray,
+    evaluate_edge_weight_fn,
     get_default_edge_weight_fn,
 )
 from sumgraph.model.dynamic_weighted_graph.convention_enum import ConventionEnum
+from sumgraph.model.dynamic_weighted_graph.nearest_sample_edge_weight_fn import (
+    NearestSampleEdgeWeightFn,
+)
+from sumgraph.model.dynamic_weighted_graph.sample_table import SampleTable
+from sumgraph.model.dynamic_weighted_graph.snapshot_cache import (
+    DEFAULT_MAX_ENTRIES,
+    SnapshotCache,
+)
+
+
+Edge = Tuple[str, str]
 
 
 class DynamicWeightedGraph:
@@ -21,6 +35,7 @@ class DynamicWeightedGraph:
     convention: ConventionEnum
     vertex_set: Set[str]
     edge_set: Dict[str, Dict[str, EdgeWeightFn]]
+    snapshot_cache: Optional[SnapshotCache]
 
     def __init__(
         self,
@@ -33,6 +48,7 @@ class DynamicWeightedGraph:
         self.convention = convention
         self.edge_set = {}
         self.vertex_set = set()
+        self.snapshot_cache = None
 
     def has_vertex(self, vertex: str) -> bool:
         """
@@ -51,6 +67,7 @@ class DynamicWeightedGraph:
 
         self.vertex_set.add(vertex)
         self.edge_set[vertex] = {}
+        self.invalidate_snapshot_cache()
 
         return vertex
 
@@ -92,6 +109,8 @@ class DynamicWeightedGraph:
         if not self.directed:
             self.edge_set[target_vertex][source_vertex] = weight_function
 
+        self.invalidate_snapshot_cache()
+
     def get_edge_weight_fn(
         self, source_vertex: str, target_vertex: str
     ) -> EdgeWeightFn:
@@ -112,3 +131,183 @@ class DynamicWeightedGraph:
             return self.edge_set[source_vertex][target_vertex]
 
         return get_default_edge_weight_fn(self.convention)
+
+    def get_edges(self) -> List[Edge]:
+        """
+        This method lists every edge that has a defined edge weight function.
+        For an undirected graph, each edge is listed once, in the orientation
+        in which it was first encountered.
+        """
+        edges: List[Edge] = []
+        seen_edges: Set[Edge] = set()
+
+        for source_vertex, targets in self.edge_set.items():
+            for target_vertex in targets:
+                if not self.directed and (target_vertex, source_vertex) in seen_edges:
+                    continue
+
+                seen_edges.add((source_vertex, target_vertex))
+                edges.append((source_vertex, target_vertex))
+
+        return edges
+
+    def evaluate_edge_weights(
+        self, times: TimeArray, edges: Optional[Sequence[Edge]] = None
+    ) -> np.ndarray:
+        """
+        This method evaluates the weight of many edges over a grid of times in
+        a single batched call, returning an array of shape (edges x times).
+        If no edges are given, every edge from get_edges is evaluated. Edges
+        that are columns of the same SampleTable are gathered from it at once.
+        """
+        time_array = np.asarray(times, dtype=float)
+        if time_array.ndim != 1:
+            raise ValueError("times must be a one-dimensional array")
+
+        if edges is None:
+            edges = self.get_edges()
+
+        weights = np.empty((len(edges), len(time_array)), dtype=float)
+        tables: Dict[int, Tuple[SampleTable, List[int], List[int]]] = {}
+        for edge_index, (source_vertex, target_vertex) in enumerate(edges):
+            weight_function = self.get_edge_weight_fn(
+                source_vertex=source_vertex, target_vertex=target_vertex
+            )
+            if (
+                isinstance(weight_function, NearestSampleEdgeWeightFn)
+                and weight_function.table is not None
+            ):
+                (_, edge_indices, columns) = tables.setdefault(
+                    id(weight_function.table), (weight_function.table, [], [])
+                )
+                edge_indices.append(edge_index)
+                columns.append(weight_function.column)
+                continue
+
+            weights[edge_index] = evaluate_edge_weight_fn(weight_function, time_array)
+
+        for table, edge_indices, columns in tables.values():
+            weights[edge_indices] = table.evaluate_columns(time_array, columns)
+
+        return weights
+
+    def enable_snapshot_cache(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: Optional[int] = None,
+        time_bucket: Optional[float] = None,
+    ) -> SnapshotCache:
+        """
+        This method makes snapshot and snapshots keep the snapshots they take
+        in a SnapshotCache, replacing any cache there was, and returns the
+        cache so that its statistics can be read
+        """
+        self.snapshot_cache = SnapshotCache(
+            max_entries=max_entries, max_bytes=max_bytes, time_bucket=time_bucket
+        )
+
+        return self.snapshot_cache
+
+    def disable_snapshot_cache(self) -> None:
+        """
+        This method drops the snapshot cache, if any
+        """
+        self.snapshot_cache = None
+
+    def invalidate_snapshot_cache(self) -> None:
+        """
+        This method drops every cached snapshot. Adding a vertex or defining
+        an edge weight calls it; code that changes the vertex or edge sets
+        directly must call it too.
+        """
+        if self.snapshot_cache is not None:
+            self.snapshot_cache.clear()
+
+    def get_vertex_index(self) -> Dict[str, int]:
+        """
+        This method maps every vertex to its row and column in a snapshot.
+        Vertices are ordered by name, so the mapping is stable across runs.
+        """
+
+        return {vertex: index for (index, vertex) in enumerate(sorted(self.vertex_set))}
+
+    def snapshot(self, time: float) -> np.ndarray:
+        """
+        This method materializes the graph at a single time as a dense
+        (vertices x vertices) weight matrix, indexed by get_vertex_index.
+        Missing edges take the default weight for the convention. With a
+        snapshot cache, the matrix is read-only and may be shared with later
+        calls.
+        """
+        if self.snapshot_cache is None:
+            return self.compute_snapshots(times=[time])[0]
+
+        key = self.snapshot_cache.get_key(time)
+        snapshot = self.snapshot_cache.get(key)
+        if snapshot is None:
+            snapshot = self.snapshot_cache.put(
+                key, self.compute_snapshots(times=[key])[0]
+            )
+
+        return snapshot
+
+    def snapshots(self, times: TimeArray) -> np.ndarray:
+        """
+        This method materializes the graph at every time in a list as a stacked
+        (times x vertices x vertices) weight tensor, indexed by
+        get_vertex_index. Missing edges take the default weight for the
+        convention. With a snapshot cache, the times that are not cached are
+        computed together in a single batch.
+        """
+        time_array = np.asarray(times, dtype=float)
+        if self.snapshot_cache is None:
+            return self.compute_snapshots(times=time_array)
+
+        cache = self.snapshot_cache
+        keys = [cache.get_key(time) for time in time_array.tolist()]
+        snapshots = {key: cache.get(key) for key in dict.fromkeys(keys)}
+
+        missing_keys = [
+            key for (key, snapshot) in snapshots.items() if snapshot is None
+        ]
+        if len(missing_keys) > 0:
+            for key, snapshot in zip(
+                missing_keys, self.compute_snapshots(times=missing_keys)
+            ):
+                snapshots[key] = cache.put(key, snapshot)
+
+        vertex_count = len(self.vertex_set)
+        tensor = np.empty((len(keys), vertex_count, vertex_count), dtype=float)
+        for index, key in enumerate(keys):
+            tensor[index] = snapshots[key]
+
+        return tensor
+
+    def compute_snapshots(self, times: TimeArray) -> np.ndarray:
+        """
+        This method evaluates every edge weight function at every time in a
+        list, as snapshots does, without going through the snapshot cache
+        """
+        time_array = np.asarray(times, dtype=float)
+        vertex_index = self.get_vertex_index()
+        vertex_count = len(vertex_index)
+
+        default_weights = evaluate_edge_weight_fn(
+            get_default_edge_weight_fn(self.convention), time_array
+        )
+        tensor = np.empty((len(time_array), vertex_count, vertex_count), dtype=float)
+        tensor[...] = default_weights[:, np.newaxis, np.newaxis]
+
+        edges = self.get_edges()
+        if len(edges) == 0:
+            return tensor
+
+        edge_weights = self.evaluate_edge_weights(times=time_array, edges=edges)
+        source_indices = np.array([vertex_index[source] for (source, _) in edges])
+        target_indices = np.array([vertex_index[target] for (_, target) in edges])
+
+        tensor[:, source_indices, target_indices] = edge_weights.T
+        if not self.directed:
+            tensor[:, target_indices, source_indices] = edge_weights.T
+
+        return tensor
@@ -3,36 +3,107 @@ This module defines the type for an edge weight function, as well as exporting
 some default functions based on convention
 """
 
+from __future__ import annotations
 import math
-from typing import Callable
+from abc import ABC, abstractmethod
+from typing import Callable, Sequence, Union
+import numpy as np
 from sumgraph.model.dynamic_weighted_graph.convention_enum import ConventionEnum
 
 
 EdgeWeightFn = Callable[[float], float]
+TimeArray = Union[Sequence[float], np.ndarray]
 
 
-def traversal_time_default_edge_weight(_: float) -> float:
+class VectorizedEdgeWeightFn(ABC):
     """
-    For a traversal time default, we assume the edge does not exist: this
-    results in a traversal time of positive infinity.
+    This class defines an edge weight function that, in addition to being
+    callable on a single time, can evaluate an entire array of times at once
     """
-    return math.inf
 
+    def __call__(self, time: float) -> float:
+        """
+        Evaluate the edge weight at a single time
+        """
+        return float(self.evaluate(np.asarray([time], dtype=float))[0])
 
-def cost_default_edge_weight(_: float) -> float:
+    @abstractmethod
+    def evaluate(self, times: np.ndarray) -> np.ndarray:
+        """
+        Evaluate the edge weight at every time in a one-dimensional array of
+        times, returning an array of weights of the same shape
+        """
+
+
+class ExactlyIntegrableEdgeWeightFn(VectorizedEdgeWeightFn):
     """
-    For a cost default, we assume the edge does not exist: this results in a
-    cost of positive infinity.
+    This class defines a non-negative vectorized edge weight function whose
+    integral, and the inverse of that integral, can be computed exactly
     """
-    return math.inf
 
+    @abstractmethod
+    def cumulative_integral(self, times: np.ndarray) -> np.ndarray:
+        """
+        Evaluate the integral of the edge weight from a fixed origin, chosen by
+        the function, to every time in an array. Times before the origin have
+        a negative integral.
+        """
+
+    @abstractmethod
+    def inverse_cumulative_integral(self, values: np.ndarray) -> np.ndarray:
+        """
+        For every value in an array, find the earliest time at which the
+        cumulative integral reaches that value, or infinity if it never does
+        """
+
+    def find_integral_bounds(
+        self, lower_bounds: np.ndarray, target_values: np.ndarray
+    ) -> np.ndarray:
+        """
+        For every pair of lower bound and target value, find the upper bound at
+        which the integral of the edge weight from the lower bound reaches the
+        target value, or infinity if it never does
+        """
+        (lower_bounds, target_values) = np.broadcast_arrays(
+            np.asarray(lower_bounds, dtype=float),
+            np.asarray(target_values, dtype=float),
+        )
+        upper_bounds = self.inverse_cumulative_integral(
+            self.cumulative_integral(lower_bounds) + target_values
+        )
+
+        return np.where(
+            target_values <= 0, lower_bounds, np.maximum(upper_bounds, lower_bounds)
+        )
 
-def capacity_default_edge_weight(_: float) -> float:
+
+class ConstantEdgeWeightFn(VectorizedEdgeWeightFn):
     """
-    For a capacity default, we assume the edge does not exist: this results in a
-    capacity of 0.
+    This class is an edge weight function that takes the same value at all
+    times
     """
-    return 0
+
+    def __init__(self, value: float) -> None:
+        self.value = value
+
+    def __call__(self, _: float) -> float:
+        return self.value
+
+    def evaluate(self, times: np.ndarray) -> np.ndarray:
+        return np.full(np.shape(times), self.value, dtype=float)
+
+
+# For a traversal time default, we assume the edge does not exist: this results
+# in a traversal time of positive infinity.
+traversal_time_default_edge_weight = ConstantEdgeWeightFn(math.inf)
+
+# For a cost default, we assume the edge does not exist: this results in a cost
+# of positive infinity.
+cost_default_edge_weight = ConstantEdgeWeightFn(math.inf)
+
+# For a capacity default, we assume the edge does not exist: this results in a
+# capacity of 0.
+capacity_default_edge_weight = ConstantEdgeWeightFn(0)
 
 
 def get_default_edge_weight_fn(convention: ConventionEnum) -> EdgeWeightFn:
@@ -48,3 +119,23 @@ def get_default_edge_weight_fn(convention: ConventionEnum) -> EdgeWeightFn:
         return cost_default_edge_weight
 
     return capacity_default_edge_weight
+
+
+def evaluate_edge_weight_fn(
+    weight_function: EdgeWeightFn, times: np.ndarray
+) -> np.ndarray:
+    """
+    This function evaluates an edge weight function over an array of times.
+    Vectorized edge weight functions are evaluated in a single call; plain
+    scalar callables fall back to one call per time.
+    """
+    times = np.asarray(times, dtype=float)
+
+    if isinstance(weight_function, VectorizedEdgeWeightFn):
+        return np.asarray(weight_function.evaluate(times), dtype=float)
+
+    return np.fromiter(
+        (weight_function(time) for time in times.ravel()),
+        dtype=float,
+        count=times.size,
+    ).reshape(times.shape)
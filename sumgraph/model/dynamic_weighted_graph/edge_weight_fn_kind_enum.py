@@ -0,0 +1,21 @@
+"""
+This module defines the kinds of data-backed edge weight functions that can be
+saved to a binary file
+"""
+
+
+from enum import Enum
+
+
+class EdgeWeightFnKindEnum(Enum):
+    """
+    This enum lists the kinds of edge weight functions that a
+    DynamicWeightedGraph can be saved with
+    """
+
+    SAMPLE_TABLE = 1
+    NEAREST_SAMPLE = 2
+    PIECEWISE_CONSTANT = 3
+    PIECEWISE_LINEAR = 4
+    INTERVAL = 5
+    CONSTANT = 6
@@ -0,0 +1,83 @@
+"""
+This module defines an edge weight function that is backed by the time
+intervals during which an edge is up, such as the rise and set times of a
+connection between satellites.
+"""
+
+from functools import cached_property
+from typing import Sequence, Union
+import numpy as np
+from sumgraph.model.dynamic_weighted_graph.edge_weight_fn import (
+    ExactlyIntegrableEdgeWeightFn,
+)
+from sumgraph.model.dynamic_weighted_graph.piecewise_edge_weight_fn import (
+    PiecewiseConstantEdgeWeightFn,
+)
+
+
+IntervalArray = Union[Sequence[float], np.ndarray]
+
+
+class IntervalEdgeWeightFn(ExactlyIntegrableEdgeWeightFn):
+    """
+    This class is an edge weight function that takes one value while the edge
+    is up, during any of a set of half-open intervals [start, end), and
+    another value the rest of the time. The intervals must be sorted and
+    disjoint, with a gap between every two of them, as IntervalIndex stores
+    them, so that the interval a time falls in is a binary search away.
+    """
+
+    def __init__(
+        self,
+        starts: IntervalArray,
+        ends: IntervalArray,
+        up_value: float = 1.0,
+        down_value: float = 0.0,
+    ) -> None:
+        start_array = np.asarray(starts, dtype=float)
+        end_array = np.asarray(ends, dtype=float)
+
+        if len(start_array) != len(end_array):
+            raise ValueError(
+                "starts and ends have different lengths: %d and %d"
+                % (len(start_array), len(end_array))
+            )
+
+        if np.any(end_array <= start_array) or np.any(
+            start_array[1:] <= end_array[:-1]
+        ):
+            raise ValueError("intervals must be non-empty, sorted and disjoint")
+
+        self.starts = start_array
+        self.ends = end_array
+        self.up_value = up_value
+        self.down_value = down_value
+
+    def evaluate(self, times: np.ndarray) -> np.ndarray:
+        if len(self.starts) == 0:
+            return np.full(np.shape(times), self.down_value, dtype=float)
+
+        indices = np.searchsorted(self.starts, times, side="right") - 1
+        is_up = (indices >= 0) & (times < self.ends[np.maximum(indices, 0)])
+
+        return np.where(is_up, self.up_value, self.down_value)
+
+    @cached_property
+    def piecewise_constant(self) -> PiecewiseConstantEdgeWeightFn:
+        """
+        The same step function as a PiecewiseConstantEdgeWeightFn, built the
+        first time this edge is integrated
+        """
+        return PiecewiseConstantEdgeWeightFn(
+            breakpoints=np.column_stack((self.starts, self.ends)).ravel(),
+            values=np.append(
+                np.tile([self.down_value, self.up_value], len(self.starts)),
+                self.down_value,
+            ),
+        )
+
+    def cumulative_integral(self, times: np.ndarray) -> np.ndarray:
+        return self.piecewise_constant.cumulative_integral(times)
+
+    def inverse_cumulative_integral(self, values: np.ndarray) -> np.ndarray:
+        return self.piecewise_constant.inverse_cumulative_integral(values)
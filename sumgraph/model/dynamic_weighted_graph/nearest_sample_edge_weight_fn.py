@@ -0,0 +1,93 @@
+"""
+This module defines an edge weight function that is backed by sampled data:
+the weight at any time is the sample taken closest to that time.
+"""
+
+from functools import cached_property
+from typing import Optional, Sequence, Union
+import numpy as np
+from sumgraph.helper.closest_sorted_array_search import (
+    closest_sorted_array_search,
+    closest_sorted_array_search_batch,
+)
+from sumgraph.model.dynamic_weighted_graph.edge_weight_fn import (
+    ExactlyIntegrableEdgeWeightFn,
+)
+from sumgraph.model.dynamic_weighted_graph.piecewise_edge_weight_fn import (
+    PiecewiseConstantEdgeWeightFn,
+)
+from sumgraph.model.dynamic_weighted_graph.sample_table import SampleTable
+
+
+SampleArray = Union[Sequence[float], np.ndarray]
+
+
+class NearestSampleEdgeWeightFn(ExactlyIntegrableEdgeWeightFn):
+    """
+    This class is an edge weight function that returns the sample whose
+    timestamp is closest to the requested time. This is a step function that
+    changes value halfway between samples, so it can be integrated exactly.
+    An edge built from a column of a SampleTable resolves times through the
+    table, which the other edges of the table share.
+    """
+
+    def __init__(self, sample_times: SampleArray, samples: SampleArray) -> None:
+        if len(sample_times) != len(samples):
+            raise ValueError(
+                "sample_times and samples have different lengths: %d and %d"
+                % (len(sample_times), len(samples))
+            )
+
+        self.sample_times = np.asarray(sample_times)
+        self.samples = np.asarray(samples)
+        self.table: Optional[SampleTable] = None
+        self.column = 0
+
+    @classmethod
+    def from_table(cls, table: SampleTable, column: int) -> "NearestSampleEdgeWeightFn":
+        """
+        This method builds the edge whose samples are a column of a table,
+        without copying them
+        """
+        weight_fn = cls(
+            sample_times=table.sample_times, samples=table.samples[:, column]
+        )
+        weight_fn.table = table
+        weight_fn.column = column
+
+        return weight_fn
+
+    def __call__(self, time: float) -> float:
+        if self.table is not None:
+            return float(self.samples[self.table.resolve(time)])
+
+        (index, _) = closest_sorted_array_search(array=self.sample_times, target=time)
+
+        return float(self.samples[index])
+
+    def evaluate(self, times: np.ndarray) -> np.ndarray:
+        if self.table is not None:
+            indices = self.table.resolve_batch(times)
+        else:
+            (indices, _) = closest_sorted_array_search_batch(
+                array=self.sample_times, targets=times
+            )
+
+        return np.asarray(self.samples[indices], dtype=float)
+
+    @cached_property
+    def piecewise_constant(self) -> PiecewiseConstantEdgeWeightFn:
+        """
+        The same step function as a PiecewiseConstantEdgeWeightFn, built the
+        first time this edge is integrated
+        """
+        return PiecewiseConstantEdgeWeightFn(
+            breakpoints=(self.sample_times[:-1] + self.sample_times[1:]) / 2,
+            values=self.samples,
+        )
+
+    def cumulative_integral(self, times: np.ndarray) -> np.ndarray:
+        return self.piecewise_constant.cumulative_integral(times)
+
+    def inverse_cumulative_integral(self, values: np.ndarray) -> np.ndarray:
+        return self.piecewise_constant.inverse_cumulative_integral(values)
@@ -0,0 +1,193 @@
+"""
+This module defines piecewise-constant and piecewise-linear edge weight
+functions, which store their breakpoints and values as arrays and can be
+integrated, and have their integrals inverted, exactly.
+"""
+
+from functools import cached_property
+from typing import Sequence, Union
+import numpy as np
+from sumgraph.model.dynamic_weighted_graph.edge_weight_fn import (
+    ExactlyIntegrableEdgeWeightFn,
+)
+
+
+BreakpointArray = Union[Sequence[float], np.ndarray]
+
+
+def validate_breakpoints(breakpoints: np.ndarray) -> None:
+    """
+    This function checks that breakpoints form a one-dimensional, strictly
+    increasing array
+    """
+
+    if breakpoints.ndim != 1:
+        raise ValueError("breakpoints must be a one-dimensional array")
+
+    if np.any(np.diff(breakpoints) <= 0):
+        raise ValueError("breakpoints must be strictly increasing")
+
+
+class PiecewiseConstantEdgeWeightFn(ExactlyIntegrableEdgeWeightFn):
+    """
+    This class is an edge weight function that is constant between
+    breakpoints. With n breakpoints there are n + 1 values: values[0] holds
+    before breakpoints[0], values[i] holds on [breakpoints[i - 1],
+    breakpoints[i]), and values[n] holds from breakpoints[n - 1] onwards.
+    """
+
+    def __init__(self, breakpoints: BreakpointArray, values: BreakpointArray) -> None:
+        breakpoint_array = np.asarray(breakpoints, dtype=float)
+        value_array = np.asarray(values, dtype=float)
+
+        validate_breakpoints(breakpoint_array)
+
+        if len(value_array) != len(breakpoint_array) + 1:
+            raise ValueError(
+                "expected %d values for %d breakpoints but got %d"
+                % (len(breakpoint_array) + 1, len(breakpoint_array), len(value_array))
+            )
+
+        # A function without breakpoints is constant; giving it a breakpoint at
+        # zero lets the integrals below treat it like any other function
+        if len(breakpoint_array) == 0:
+            breakpoint_array = np.zeros(1)
+            value_array = np.repeat(value_array, 2)
+
+        self.breakpoints = breakpoint_array
+        self.values = value_array
+
+    @cached_property
+    def prefix_integrals(self) -> np.ndarray:
+        """
+        The integral from the first breakpoint to every breakpoint
+        """
+        return np.concatenate(
+            ([0.0], np.cumsum(self.values[1:-1] * np.diff(self.breakpoints)))
+        )
+
+    def evaluate(self, times: np.ndarray) -> np.ndarray:
+        indices = np.searchsorted(self.breakpoints, times, side="right")
+
+        return self.values[indices]
+
+    def cumulative_integral(self, times: np.ndarray) -> np.ndarray:
+        times = np.asarray(times, dtype=float)
+
+        # Every time before the first breakpoint integrates backwards from the
+        # origin, and every other time from the breakpoint just before it
+        segments = np.searchsorted(self.breakpoints, times, side="right")
+        previous = np.maximum(segments - 1, 0)
+
+        return self.prefix_integrals[previous] + self.values[segments] * (
+            times - self.breakpoints[previous]
+        )
+
+    def inverse_cumulative_integral(self, values: np.ndarray) -> np.ndarray:
+        values = np.asarray(values, dtype=float)
+
+        # The breakpoint after which each value is reached, where 0 also covers
+        # values reached before the first breakpoint
+        previous = np.maximum(
+            np.searchsorted(self.prefix_integrals, values, side="left") - 1, 0
+        )
+        slopes = np.where(values <= 0, self.values[0], self.values[previous + 1])
+        remainders = values - self.prefix_integrals[previous]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            offsets = np.where(
+                remainders == 0, 0.0, np.where(slopes > 0, remainders / slopes, np.inf)
+            )
+
+        return self.breakpoints[previous] + offsets
+
+
+class PiecewiseLinearEdgeWeightFn(ExactlyIntegrableEdgeWeightFn):
+    """
+    This class is an edge weight function that interpolates linearly between
+    knots, and holds the first and last values before and after the knots
+    """
+
+    def __init__(self, knots: BreakpointArray, values: BreakpointArray) -> None:
+        knot_array = np.asarray(knots, dtype=float)
+        value_array = np.asarray(values, dtype=float)
+
+        validate_breakpoints(knot_array)
+
+        if len(knot_array) == 0:
+            raise ValueError("knots is empty")
+
+        if len(value_array) != len(knot_array):
+            raise ValueError(
+                "knots and values have different lengths: %d and %d"
+                % (len(knot_array), len(value_array))
+            )
+
+        self.knots = knot_array
+        self.values = value_array
+
+    @cached_property
+    def slopes(self) -> np.ndarray:
+        """
+        The slope between every pair of consecutive knots, padded with a flat
+        slope before the first knot and after the last one
+        """
+        return np.concatenate(
+            ([0.0], np.diff(self.values) / np.diff(self.knots), [0.0])
+        )
+
+    @cached_property
+    def prefix_integrals(self) -> np.ndarray:
+        """
+        The integral from the first knot to every knot
+        """
+        return np.concatenate(
+            (
+                [0.0],
+                np.cumsum(
+                    (self.values[1:] + self.values[:-1]) / 2 * np.diff(self.knots)
+                ),
+            )
+        )
+
+    def evaluate(self, times: np.ndarray) -> np.ndarray:
+        return np.interp(times, self.knots, self.values)
+
+    def cumulative_integral(self, times: np.ndarray) -> np.ndarray:
+        times = np.asarray(times, dtype=float)
+
+        # Every time integrates from the knot just before it, or backwards from
+        # the first knot if there is none
+        segments = np.searchsorted(self.knots, times, side="right")
+        previous = np.maximum(segments - 1, 0)
+        offsets = times - self.knots[previous]
+
+        return (
+            self.prefix_integrals[previous]
+            + self.values[previous] * offsets
+            + self.slopes[segments] * offsets**2 / 2
+        )
+
+    def inverse_cumulative_integral(self, values: np.ndarray) -> np.ndarray:
+        values = np.asarray(values, dtype=float)
+
+        previous = np.maximum(
+            np.searchsorted(self.prefix_integrals, values, side="left") - 1, 0
+        )
+        start_values = self.values[previous]
+        slopes = np.where(values <= 0, 0.0, self.slopes[previous + 1])
+        remainders = values - self.prefix_integrals[previous]
+
+        # Solve start_value * offset + slope * offset^2 / 2 = remainder for the
+        # smallest non-negative offset, in a form that is stable for any slope
+        with np.errstate(divide="ignore", invalid="ignore"):
+            denominators = start_values + np.sqrt(
+                np.maximum(start_values**2 + 2 * slopes * remainders, 0)
+            )
+            offsets = np.where(
+                remainders == 0,
+                0.0,
+                np.where(denominators > 0, 2 * remainders / denominators, np.inf),
+            )
+
+        return self.knots[previous] + offsets
@@ -0,0 +1,102 @@
+"""
+This module defines a table of samples for many edges on a shared grid of
+sample times, so that a time is resolved to a sample index once for all of
+them rather than once per edge.
+"""
+
+from collections import OrderedDict
+from typing import Optional, Sequence, Union
+import numpy as np
+from sumgraph.helper.closest_sorted_array_search import (
+    closest_sorted_array_search,
+    closest_sorted_array_search_batch,
+)
+
+
+SampleArray = Union[Sequence[float], np.ndarray]
+
+# The number of recently queried times whose sample index is kept
+DEFAULT_RESOLVED_TIME_COUNT = 1024
+
+
+class SampleTable:
+    """
+    This class holds the samples of many edges as the columns of a (sample
+    times x edges) array. A query time is resolved to the index of its
+    closest sample time once, and recently resolved times are remembered, so
+    the weights of every edge at that time are a single row of the array.
+    """
+
+    def __init__(
+        self,
+        sample_times: SampleArray,
+        samples: np.ndarray,
+        resolved_time_count: int = DEFAULT_RESOLVED_TIME_COUNT,
+    ) -> None:
+        sample_time_array = np.asarray(sample_times, dtype=float)
+
+        if samples.ndim != 2 or samples.shape[0] != len(sample_time_array):
+            raise ValueError(
+                "expected samples of shape (%d, edges) but got %s"
+                % (len(sample_time_array), samples.shape)
+            )
+
+        self.sample_times = sample_time_array
+        self.samples = samples
+        self.resolved_time_count = resolved_time_count
+        self._resolved_times: OrderedDict[float, int] = OrderedDict()
+
+    @property
+    def column_count(self) -> int:
+        """
+        The number of edges in the table
+        """
+        return self.samples.shape[1]
+
+    def resolve(self, time: float) -> int:
+        """
+        This method returns the index of the sample time closest to a time,
+        searching the sample times only if the time was not queried recently
+        """
+        index = self._resolved_times.get(time)
+        if index is not None:
+            self._resolved_times.move_to_end(time)
+            return index
+
+        (index, _) = closest_sorted_array_search(array=self.sample_times, target=time)
+        self._resolved_times[time] = index
+        if len(self._resolved_times) > self.resolved_time_count:
+            self._resolved_times.popitem(last=False)
+
+        return index
+
+    def resolve_batch(self, times: np.ndarray) -> np.ndarray:
+        """
+        This method returns the index of the sample time closest to every time
+        in an array
+        """
+        (indices, _) = closest_sorted_array_search_batch(
+            array=self.sample_times, targets=times
+        )
+
+        return indices
+
+    def row(self, time: float) -> np.ndarray:
+        """
+        This method returns the sample of every edge closest to a time
+        """
+        return np.asarray(self.samples[self.resolve(time)], dtype=float)
+
+    def evaluate_columns(
+        self, times: np.ndarray, columns: Optional[Sequence[int]] = None
+    ) -> np.ndarray:
+        """
+        This method returns the samples of some edges, or of every edge, that
+        are closest to every time in an array, as an array of shape (edges x
+        times)
+        """
+        indices = self.resolve_batch(np.asarray(times, dtype=float))
+        if columns is None:
+            return np.asarray(self.samples[indices].T, dtype=float)
+
+        return np.asarray(self.samples[np.ix_(indices, columns)].T, dtype=float)
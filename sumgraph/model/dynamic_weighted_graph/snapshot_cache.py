@@ -0,0 +1,135 @@
+"""
+This module defines a least-recently-used cache of the snapshots of a
+DynamicWeightedGraph, so that asking for the graph at the same time again does
+not evaluate every edge weight function again.
+"""
+
+import math
+from collections import OrderedDict
+from typing import Optional, TypedDict
+import numpy as np
+
+
+# The number of snapshots a cache holds unless told otherwise
+DEFAULT_MAX_ENTRIES = 128
+
+
+class SnapshotCacheStats(TypedDict):
+    """
+    This class is a type declaration for the statistics of a SnapshotCache
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    entries: int
+    bytes: int
+
+
+class SnapshotCache:
+    """
+    This class holds snapshots keyed by their time, evicting the least
+    recently used ones once there are more than max_entries of them or they
+    take more than max_bytes. With a time bucket, every time maps to the start
+    of its bucket, floor(time / time_bucket) * time_bucket, and the graph is
+    taken at that time, so all the times in a bucket share one snapshot.
+    Snapshots are stored read-only, as they are handed out without copying.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: Optional[int] = None,
+        time_bucket: Optional[float] = None,
+    ) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive, got %d" % max_entries)
+
+        if time_bucket is not None and not time_bucket > 0:
+            raise ValueError("time_bucket must be positive, got %g" % time_bucket)
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.time_bucket = time_bucket
+        self._snapshots: OrderedDict[float, np.ndarray] = OrderedDict()
+        self._stats: SnapshotCacheStats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "invalidations": 0,
+            "entries": 0,
+            "bytes": 0,
+        }
+
+    @property
+    def stats(self) -> SnapshotCacheStats:
+        """
+        A copy of the hit, miss, eviction and invalidation counts of this
+        cache, along with the number of snapshots it holds and their size
+        """
+        return {
+            **self._stats,
+            "entries": len(self._snapshots),
+        }
+
+    def get_key(self, time: float) -> float:
+        """
+        This method returns the time a snapshot is cached under and taken at
+        """
+        if self.time_bucket is None:
+            return float(time)
+
+        return math.floor(time / self.time_bucket) * self.time_bucket
+
+    def get(self, key: float) -> Optional[np.ndarray]:
+        """
+        This method returns the snapshot cached under a key, if any, and
+        counts the lookup as a hit or a miss
+        """
+        snapshot = self._snapshots.get(key)
+        if snapshot is None:
+            self._stats["misses"] += 1
+            return None
+
+        self._snapshots.move_to_end(key)
+        self._stats["hits"] += 1
+
+        return snapshot
+
+    def put(self, key: float, snapshot: np.ndarray) -> np.ndarray:
+        """
+        This method caches a copy of a snapshot under a key, evicts the least
+        recently used snapshots until the cache is within its budgets again,
+        and returns the cached copy
+        """
+        snapshot = np.array(snapshot)
+        snapshot.setflags(write=False)
+
+        if key in self._snapshots:
+            self._stats["bytes"] -= self._snapshots.pop(key).nbytes
+
+        self._snapshots[key] = snapshot
+        self._stats["bytes"] += snapshot.nbytes
+
+        while len(self._snapshots) > self.max_entries or (
+            self.max_bytes is not None
+            and self._stats["bytes"] > self.max_bytes
+            and len(self._snapshots) > 0
+        ):
+            (_, evicted) = self._snapshots.popitem(last=False)
+            self._stats["bytes"] -= evicted.nbytes
+            self._stats["evictions"] += 1
+
+        return snapshot
+
+    def clear(self) -> None:
+        """
+        This method drops every snapshot, as the graph they were taken of has
+        changed
+        """
+        if len(self._snapshots) > 0:
+            self._stats["invalidations"] += 1
+
+        self._snapshots.clear()
+        self._stats["bytes"] = 0
@@ -0,0 +1,338 @@
+"""
+This module contains the CsrSummaryGraph class, a compact, array-backed
+alternative to SummaryGraph that stores its edges in compressed sparse row
+(CSR) form.
+"""
+
+from __future__ import annotations
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
+import numpy as np
+from sumgraph.model.summary_graph.summary_graph import (
+    DEFAULT_EDGE_WEIGHT,
+    SummaryGraph,
+)
+
+
+IdArray = Union[Sequence[int], np.ndarray]
+WeightArray = Union[Sequence[float], np.ndarray]
+
+
+class CsrSummaryGraph:
+    """
+    The CsrSummaryGraph class keeps the public methods of SummaryGraph, but
+    stores vertices as integer ids and edges as three arrays: the outgoing
+    edges of vertex i are indices[offsets[i]:offsets[i + 1]], sorted by target
+    id, with their weights at the same positions in weights.
+    """
+
+    name: str
+    vertices: List[str]
+    vertex_index: Dict[str, int]
+    offsets: np.ndarray
+    indices: np.ndarray
+    weights: np.ndarray
+
+    def __init__(self, name: str, vertices: Optional[Sequence[str]] = None) -> None:
+        self.name = name
+        self.vertices = [] if vertices is None else list(vertices)
+        self.vertex_index = {
+            vertex: index for (index, vertex) in enumerate(self.vertices)
+        }
+        self.offsets = np.zeros(len(self.vertices) + 1, dtype=np.int64)
+        self.indices = np.zeros(0, dtype=np.int64)
+        self.weights = np.zeros(0, dtype=float)
+
+        if len(self.vertex_index) != len(self.vertices):
+            raise ValueError("vertices contains a duplicate vertex")
+
+    @classmethod
+    def from_coo(
+        cls,
+        name: str,
+        vertices: Sequence[str],
+        sources: IdArray,
+        targets: IdArray,
+        weights: WeightArray,
+    ) -> CsrSummaryGraph:
+        """
+        This method builds a graph in bulk from COO triples: the i-th edge goes
+        from vertex id sources[i] to vertex id targets[i] with weight
+        weights[i], where a vertex id is a position in vertices
+        """
+        graph = cls(name=name, vertices=vertices)
+        vertex_count = len(graph.vertices)
+
+        source_ids = np.asarray(sources, dtype=np.int64)
+        target_ids = np.asarray(targets, dtype=np.int64)
+        edge_weights = np.asarray(weights, dtype=float)
+
+        if not len(source_ids) == len(target_ids) == len(edge_weights):
+            raise ValueError("sources, targets and weights have different lengths")
+
+        for ids in (source_ids, target_ids):
+            if len(ids) > 0 and (ids.min() < 0 or ids.max() >= vertex_count):
+                raise ValueError("vertex id out of range")
+
+        order = np.lexsort((target_ids, source_ids))
+        source_ids = source_ids[order]
+        target_ids = target_ids[order]
+
+        duplicates = (source_ids[1:] == source_ids[:-1]) & (
+            target_ids[1:] == target_ids[:-1]
+        )
+        if np.any(duplicates):
+            position = int(np.argmax(duplicates))
+            raise ValueError(
+                "edge weight already defined between %s and %s"
+                % (
+                    graph.vertices[source_ids[position]],
+                    graph.vertices[target_ids[position]],
+                )
+            )
+
+        graph.offsets = np.concatenate(
+            ([0], np.cumsum(np.bincount(source_ids, minlength=vertex_count)))
+        ).astype(np.int64)
+        graph.indices = target_ids
+        graph.weights = edge_weights[order]
+
+        return graph
+
+    @classmethod
+    def from_summary_graph(cls, summary_graph: SummaryGraph) -> CsrSummaryGraph:
+        """
+        This method converts a dict-backed SummaryGraph to a CsrSummaryGraph
+        """
+        vertices = sorted(summary_graph.vertex_set)
+        vertex_index = {vertex: index for (index, vertex) in enumerate(vertices)}
+
+        sources: List[int] = []
+        targets: List[int] = []
+        weights: List[float] = []
+        for source_vertex, edges in summary_graph.edge_set.items():
+            for target_vertex, weight in edges.items():
+                sources.append(vertex_index[source_vertex])
+                targets.append(vertex_index[target_vertex])
+                weights.append(weight)
+
+        return cls.from_coo(
+            name=summary_graph.name,
+            vertices=vertices,
+            sources=sources,
+            targets=targets,
+            weights=weights,
+        )
+
+    def to_summary_graph(self) -> SummaryGraph:
+        """
+        This method converts this graph to a dict-backed SummaryGraph
+        """
+        summary_graph = SummaryGraph(name=self.name)
+
+        for vertex in self.vertices:
+            summary_graph.add_vertex(vertex)
+
+        summary_graph.edge_set = self.edge_set
+
+        return summary_graph
+
+    @property
+    def vertex_set(self) -> Set[str]:
+        """
+        The set of vertex names, for compatibility with SummaryGraph
+        """
+        return set(self.vertices)
+
+    @property
+    def edge_set(self) -> Dict[str, Dict[str, float]]:
+        """
+        The edge weights as nested dicts, for compatibility with SummaryGraph.
+        This materializes every edge, so prefer the array methods for scans.
+        """
+        edge_set: Dict[str, Dict[str, float]] = {}
+
+        for vertex_id, vertex in enumerate(self.vertices):
+            (row_indices, row_weights) = self.get_row_by_id(vertex_id)
+            edge_set[vertex] = {
+                self.vertices[target_id]: weight
+                for (target_id, weight) in zip(
+                    row_indices.tolist(), row_weights.tolist()
+                )
+            }
+
+        return edge_set
+
+    @property
+    def vertex_count(self) -> int:
+        """
+        The number of vertices in the graph
+        """
+        return len(self.vertices)
+
+    @property
+    def edge_count(self) -> int:
+        """
+        The number of edges in the graph
+        """
+        return len(self.indices)
+
+    def has_vertex(self, vertex: str) -> bool:
+        """
+        This method verifies if a vertex exists on the vertex set
+        """
+
+        return vertex in self.vertex_index
+
+    def get_vertex_id(self, vertex: str) -> int:
+        """
+        This method returns the integer id of a vertex
+        """
+
+        if not self.has_vertex(vertex=vertex):
+            raise ValueError("vertex %s not in vertex_set" % vertex)
+
+        return self.vertex_index[vertex]
+
+    def add_vertex(self, vertex: str) -> str:
+        """
+        This method adds a vertex to the vertex set
+        """
+
+        if self.has_vertex(vertex=vertex):
+            raise ValueError("vertex %s is already in vertex_set" % vertex)
+
+        self.vertex_index[vertex] = len(self.vertices)
+        self.vertices.append(vertex)
+        self.offsets = np.append(self.offsets, self.offsets[-1])
+
+        return vertex
+
+    def _find_edge(self, source_id: int, target_id: int) -> Tuple[int, bool]:
+        """
+        This method returns the position of an edge in the indices array, or
+        where it would be inserted, and whether the edge exists
+        """
+        start = int(self.offsets[source_id])
+        end = int(self.offsets[source_id + 1])
+        position = start + int(
+            np.searchsorted(self.indices[start:end], target_id, side="left")
+        )
+
+        return (position, position < end and self.indices[position] == target_id)
+
+    def has_edge_weight(self, source_vertex: str, target_vertex: str) -> bool:
+        """
+        This method checks if an edge weight has been defined
+        """
+
+        if not self.has_vertex(vertex=source_vertex):
+            return False
+
+        if not self.has_vertex(vertex=target_vertex):
+            return False
+
+        (_, found) = self._find_edge(
+            self.vertex_index[source_vertex], self.vertex_index[target_vertex]
+        )
+
+        return found
+
+    def set_edge_weight(
+        self, source_vertex: str, target_vertex: str, weight: float
+    ) -> None:
+        """
+        This method places a weight on an edge. Each call shifts the arrays, so
+        use from_coo to build a graph with many edges.
+        """
+        if not self.has_vertex(vertex=source_vertex):
+            raise ValueError("source vertex %s is not in graph" % source_vertex)
+
+        if not self.has_vertex(vertex=target_vertex):
+            raise ValueError("target vertex %s is not in graph" % target_vertex)
+
+        source_id = self.vertex_index[source_vertex]
+        target_id = self.vertex_index[target_vertex]
+        (position, found) = self._find_edge(source_id, target_id)
+
+        if found:
+            raise ValueError(
+                "edge weight already defined between %s and %s"
+                % (source_vertex, target_vertex)
+            )
+
+        self.indices = np.insert(self.indices, position, target_id)
+        self.weights = np.insert(self.weights, position, weight)
+        self.offsets[source_id + 1 :] += 1
+
+    def get_edge_weight(self, source_vertex: str, target_vertex: str) -> float:
+        """
+        This method gets the weight of a particular edge. If none has been
+        defined, it returns the default edge weight.
+        """
+        if not self.has_vertex(vertex=source_vertex):
+            raise ValueError("source vertex %s is not in graph" % source_vertex)
+
+        if not self.has_vertex(vertex=target_vertex):
+            raise ValueError("target vertex %s is not in graph" % target_vertex)
+
+        (position, found) = self._find_edge(
+            self.vertex_index[source_vertex], self.vertex_index[target_vertex]
+        )
+
+        if found:
+            return float(self.weights[position])
+
+        return DEFAULT_EDGE_WEIGHT
+
+    def get_row_by_id(self, vertex_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        This method returns the target ids and weights of the outgoing edges of
+        a vertex id, as views into the underlying arrays
+        """
+        start = self.offsets[vertex_id]
+        end = self.offsets[vertex_id + 1]
+
+        return (self.indices[start:end], self.weights[start:end])
+
+    def get_row(self, vertex: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        This method returns the target ids and weights of the outgoing edges of
+        a vertex, as views into the underlying arrays
+        """
+
+        return self.get_row_by_id(self.get_vertex_id(vertex=vertex))
+
+    def out_degree(self, vertex: str) -> int:
+        """
+        This method returns the number of outgoing edges of a vertex
+        """
+        vertex_id = self.get_vertex_id(vertex=vertex)
+
+        return int(self.offsets[vertex_id + 1] - self.offsets[vertex_id])
+
+    def out_degrees(self) -> np.ndarray:
+        """
+        This method returns the number of outgoing edges of every vertex, in
+        vertex id order
+        """
+
+        return np.diff(self.offsets)
+
+    def weight_sum(self, vertex: str) -> float:
+        """
+        This method returns the total weight of the outgoing edges of a vertex
+        """
+        (_, row_weights) = self.get_row(vertex=vertex)
+
+        return float(row_weights.sum())
+
+    def weight_sums(self) -> np.ndarray:
+        """
+        This method returns the total weight of the outgoing edges of every
+        vertex, in vertex id order
+        """
+        source_ids = np.repeat(np.arange(self.vertex_count), self.out_degrees())
+
+        return np.bincount(
+            source_ids, weights=self.weights, minlength=self.vertex_count
+        )
@@ -0,0 +1,180 @@
+"""
+This module tests the centrality measures against networkx
+"""
+
+import math
+import networkx as nx  # type: ignore
+import numpy as np
+import pytest
+from sumgraph.algorithm.centrality import compute_centrality
+from sumgraph.model.centrality_map.centrality_enum import CentralityEnum
+from sumgraph.model.summary_graph.summary_graph import SummaryGraph
+
+
+def build_graphs():
+    """
+    Build the same random weighted directed graph as a SummaryGraph and as a
+    networkx graph
+    """
+
+    rng = np.random.default_rng(1)
+    summary_graph = SummaryGraph(name="test")
+    nx_graph = nx.DiGraph()
+    vertices = ["V%02d" % index for index in range(30)]
+    for vertex in vertices:
+        summary_graph.add_vertex(vertex)
+        nx_graph.add_node(vertex)
+
+    for source_index, source_vertex in enumerate(vertices):
+        for target_index in rng.choice(len(vertices), size=3, replace=False):
+            if target_index != source_index:
+                weight = float(rng.integers(1, 4))
+                summary_graph.set_edge_weight(
+                    source_vertex, vertices[target_index], weight
+                )
+                nx_graph.add_edge(source_vertex, vertices[target_index], weight=weight)
+
+    return (summary_graph, nx_graph)
+
+
+@pytest.mark.parametrize(
+    "measure,options,reference",
+    [
+        (CentralityEnum.DEGREE, {}, lambda g: dict(g.out_degree())),
+        (
+            CentralityEnum.STRENGTH,
+            {"incoming": True},
+            lambda g: dict(g.in_degree(weight="weight")),
+        ),
+        (
+            CentralityEnum.CLOSENESS,
+            {"incoming": True},
+            lambda g: nx.closeness_centrality(g, distance="weight"),
+        ),
+        (
+            CentralityEnum.EIGENVECTOR,
+            {},
+            lambda g: nx.eigenvector_centrality(g, weight="weight"),
+        ),
+        (CentralityEnum.PAGERANK, {}, lambda g: nx.pagerank(g, weight="weight")),
+        (
+            CentralityEnum.BETWEENNESS,
+            {},
+            lambda g: nx.betweenness_centrality(g, weight="weight"),
+        ),
+        (
+            CentralityEnum.BETWEENNESS,
+            {"weighted": False},
+            nx.betweenness_centrality,
+        ),
+    ],
+)
+def test_compute_centrality(measure, options, reference):
+    """
+    Verify that every measure agrees with networkx
+    """
+
+    (summary_graph, nx_graph) = build_graphs()
+    centrality_map = compute_centrality(summary_graph, measure, **options)
+    expected = reference(nx_graph)
+
+    assert centrality_map.name == "test"
+    assert centrality_map.vertex_set == summary_graph.vertex_set
+    for vertex in summary_graph.vertex_set:
+        assert centrality_map.get_vertex_weight(vertex) == pytest.approx(
+            expected[vertex], abs=1e-9
+        )
+
+
+def test_sampled_betweenness():
+    """
+    Verify that sampling every source gives the exact betweenness, and that a
+    seeded sample is reproducible
+    """
+
+    (summary_graph, _) = build_graphs()
+    exact = compute_centrality(summary_graph, CentralityEnum.BETWEENNESS)
+    full_sample = compute_centrality(
+        summary_graph, CentralityEnum.BETWEENNESS, sample_count=100, seed=0
+    )
+
+    for vertex in summary_graph.vertex_set:
+        assert full_sample.get_vertex_weight(vertex) == pytest.approx(
+            exact.get_vertex_weight(vertex)
+        )
+
+    first = compute_centrality(
+        summary_graph, CentralityEnum.BETWEENNESS, sample_count=10, seed=3
+    )
+    second = compute_centrality(
+        summary_graph, CentralityEnum.BETWEENNESS, sample_count=10, seed=3
+    )
+    assert first.vertex_weights == second.vertex_weights
+
+
+def test_infinite_weights_are_not_edges():
+    """
+    Verify that an edge with an infinite weight is left out, and that a
+    negative length is rejected
+    """
+
+    summary_graph = SummaryGraph(name="test")
+    for vertex in ["A", "B", "C"]:
+        summary_graph.add_vertex(vertex)
+
+    summary_graph.set_edge_weight("A", "B", 1.0)
+    summary_graph.set_edge_weight("B", "C", math.inf)
+
+    degrees = compute_centrality(summary_graph, CentralityEnum.DEGREE)
+    assert degrees.vertex_weights == {"A": 1.0, "B": 0.0, "C": 0.0}
+
+    summary_graph.set_edge_weight("C", "A", -1.0)
+    with pytest.raises(ValueError):
+        compute_centrality(summary_graph, CentralityEnum.CLOSENESS)
+
+
+def test_zero_length_betweenness():
+    """
+    Verify that zero-length edges are followed by betweenness: between
+    vertices at the same distance, as networkx does, and around a pair of
+    co-located vertices linked both ways
+    """
+
+    summary_graph = SummaryGraph(name="test")
+    nx_graph = nx.DiGraph()
+    for vertex in ["S", "A", "B", "T", "U"]:
+        summary_graph.add_vertex(vertex)
+        nx_graph.add_node(vertex)
+
+    for source, target, weight in [
+        ("S", "A", 1.0),
+        ("S", "B", 1.0),
+        ("A", "B", 0.0),
+        ("B", "T", 1.0),
+        ("A", "T", 2.0),
+        ("T", "U", 1.0),
+    ]:
+        summary_graph.set_edge_weight(source, target, weight)
+        nx_graph.add_edge(source, target, weight=weight)
+
+    betweenness = compute_centrality(summary_graph, CentralityEnum.BETWEENNESS)
+    expected = nx.betweenness_centrality(nx_graph, weight="weight")
+    for vertex in summary_graph.vertex_set:
+        assert betweenness.get_vertex_weight(vertex) == pytest.approx(
+            expected[vertex], abs=1e-9
+        )
+
+    summary_graph = SummaryGraph(name="test")
+    for vertex in ["A", "B", "C", "D"]:
+        summary_graph.add_vertex(vertex)
+
+    for source, target, weight in [("A", "B", 1.0), ("B", "C", 0.0), ("C", "D", 1.0)]:
+        summary_graph.set_edge_weight(source, target, weight)
+        summary_graph.set_edge_weight(target, source, weight)
+
+    # Every pair has a single shortest path, and B and C are inside the
+    # paths between A and the vertices past them, both ways
+    betweenness = compute_centrality(
+        summary_graph, CentralityEnum.BETWEENNESS, normalized=False
+    )
+    assert betweenness.vertex_weights == {"A": 0.0, "B": 4.0, "C": 4.0, "D": 0.0}
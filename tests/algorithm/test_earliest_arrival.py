@@ -0,0 +1,192 @@
+"""
+This module tests the earliest-arrival routines on DynamicWeightedGraph
+"""
+
+import math
+import numpy as np
+import pytest
+from sumgraph.algorithm.earliest_arrival import (
+    EarliestArrivalEngine,
+    earliest_arrival_path,
+    earliest_arrival_times,
+    earliest_arrival_times_for_departures,
+)
+from sumgraph.model.dynamic_weighted_graph.convention_enum import ConventionEnum
+from sumgraph.model.dynamic_weighted_graph.dynamic_weighted_graph import (
+    DynamicWeightedGraph,
+)
+from sumgraph.model.dynamic_weighted_graph.nearest_sample_edge_weight_fn import (
+    NearestSampleEdgeWeightFn,
+)
+from sumgraph.model.dynamic_weighted_graph.sample_table import SampleTable
+
+
+def build_graph() -> DynamicWeightedGraph:
+    """
+    Build a directed graph where the direct edge A -> C is fast early on and
+    slow later, so the best route changes with the departure time
+    """
+
+    dwg = DynamicWeightedGraph(name="test", directed=True)
+    for vertex in ["A", "B", "C", "D"]:
+        dwg.add_vertex(vertex)
+
+    sample_times = np.array([0.0, 10.0, 20.0])
+    dwg.define_edge_weight(
+        source_vertex="A",
+        target_vertex="C",
+        weight_function=NearestSampleEdgeWeightFn(sample_times, [1.0, 10.0, 10.0]),
+    )
+    dwg.define_edge_weight(
+        source_vertex="A",
+        target_vertex="B",
+        weight_function=NearestSampleEdgeWeightFn(sample_times, [2.0, 2.0, 2.0]),
+    )
+    dwg.define_edge_weight(
+        source_vertex="B", target_vertex="C", weight_function=lambda t: 3.0
+    )
+
+    return dwg
+
+
+def test_earliest_arrival_times():
+    """
+    Verify that arrival times follow the fastest route at the departure time,
+    and that unreachable vertices are never reached
+    """
+
+    dwg = build_graph()
+
+    assert earliest_arrival_times(dwg, "A", 0.0) == {
+        "A": 0.0,
+        "B": 2.0,
+        "C": 1.0,
+        "D": math.inf,
+    }
+    assert earliest_arrival_times(dwg, "A", 10.0) == {
+        "A": 10.0,
+        "B": 12.0,
+        "C": 15.0,
+        "D": math.inf,
+    }
+
+
+def test_earliest_arrival_path():
+    """
+    Verify that the route to the target is rebuilt from the predecessors
+    """
+
+    dwg = build_graph()
+
+    assert earliest_arrival_path(dwg, "A", "C", 0.0) == (1.0, ["A", "C"])
+    assert earliest_arrival_path(dwg, "A", "C", 10.0) == (15.0, ["A", "B", "C"])
+    assert earliest_arrival_path(dwg, "A", "A", 3.0) == (3.0, ["A"])
+    assert earliest_arrival_path(dwg, "A", "D", 0.0) == (math.inf, [])
+
+
+def test_earliest_arrival_undirected():
+    """
+    Verify that an undirected edge can be traversed both ways
+    """
+
+    dwg = DynamicWeightedGraph(name="test")
+    for vertex in ["A", "B"]:
+        dwg.add_vertex(vertex)
+
+    dwg.define_edge_weight(
+        source_vertex="A", target_vertex="B", weight_function=lambda t: t + 1
+    )
+
+    assert earliest_arrival_times(dwg, "B", 1.0) == {"A": 3.0, "B": 1.0}
+
+
+def test_earliest_arrival_times_for_departures():
+    """
+    Verify that searching for many departure times at once agrees with
+    running one search per departure time
+    """
+
+    rng = np.random.default_rng(0)
+    dwg = DynamicWeightedGraph(name="test", directed=True)
+    vertices = ["V%d" % index for index in range(12)]
+    for vertex in vertices:
+        dwg.add_vertex(vertex)
+
+    sample_times = np.linspace(0, 100, 21)
+    for source_vertex in vertices:
+        for target_vertex in rng.choice(vertices, size=4, replace=False):
+            if source_vertex != target_vertex:
+                dwg.define_edge_weight(
+                    source_vertex=source_vertex,
+                    target_vertex=str(target_vertex),
+                    weight_function=NearestSampleEdgeWeightFn(
+                        sample_times, rng.uniform(1, 5, len(sample_times))
+                    ),
+                )
+
+    departure_times = np.linspace(0, 80, 9)
+    arrival_times = earliest_arrival_times_for_departures(dwg, "V0", departure_times)
+
+    engine = EarliestArrivalEngine(dwg)
+    assert arrival_times.shape == (len(departure_times), len(vertices))
+    for departure_time, row in zip(departure_times, arrival_times):
+        (expected, _) = engine.run("V0", departure_time)
+        np.testing.assert_allclose(row, expected)
+
+
+def test_sample_table_edges():
+    """
+    Verify that edges that are columns of a SampleTable give the same arrival
+    times as edges with samples of their own
+    """
+
+    rng = np.random.default_rng(1)
+    vertices = ["V%d" % index for index in range(6)]
+    sample_times = np.linspace(0, 100, 11)
+    table = SampleTable(sample_times, rng.uniform(1, 5, (len(sample_times), 15)))
+
+    (table_dwg, plain_dwg) = (
+        DynamicWeightedGraph(name="table"),
+        DynamicWeightedGraph(name="plain"),
+    )
+    for dwg in [table_dwg, plain_dwg]:
+        for vertex in vertices:
+            dwg.add_vertex(vertex)
+
+    pairs = [(source, target) for source in vertices for target in vertices]
+    for column, (source, target) in enumerate(
+        pair for pair in pairs if pair[0] < pair[1]
+    ):
+        table_dwg.define_edge_weight(
+            source, target, NearestSampleEdgeWeightFn.from_table(table, column)
+        )
+        plain_dwg.define_edge_weight(
+            source,
+            target,
+            NearestSampleEdgeWeightFn(sample_times, table.samples[:, column].copy()),
+        )
+
+    for departure_time in [0.0, 33.0, 95.0]:
+        assert earliest_arrival_times(
+            table_dwg, "V0", departure_time
+        ) == earliest_arrival_times(plain_dwg, "V0", departure_time)
+
+    times = np.linspace(-10, 110, 50)
+    np.testing.assert_array_equal(
+        table_dwg.evaluate_edge_weights(times),
+        plain_dwg.evaluate_edge_weights(times, edges=table_dwg.get_edges()),
+    )
+
+
+def test_engine_requires_traversal_time():
+    """
+    Verify that only traversal time graphs are accepted
+    """
+
+    dwg = DynamicWeightedGraph(name="test", convention=ConventionEnum.CAPACITY)
+
+    with pytest.raises(ValueError):
+        EarliestArrivalEngine(dwg)
+
+    with pytest.raises(ValueError):
+        EarliestArrivalEngine(build_graph()).run("Z", 0.0)
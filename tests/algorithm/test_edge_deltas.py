@@ -0,0 +1,137 @@
+"""
+This module tests the iteration over the edges whose weight changes
+"""
+
+import math
+import numpy as np
+import pytest
+from sumgraph.algorithm.edge_deltas import iterate_edge_deltas
+from sumgraph.model.dynamic_weighted_graph.convention_enum import ConventionEnum
+from sumgraph.model.dynamic_weighted_graph.dynamic_weighted_graph import (
+    DynamicWeightedGraph,
+)
+from sumgraph.model.dynamic_weighted_graph.interval_edge_weight_fn import (
+    IntervalEdgeWeightFn,
+)
+from sumgraph.model.dynamic_weighted_graph.nearest_sample_edge_weight_fn import (
+    NearestSampleEdgeWeightFn,
+)
+from sumgraph.model.dynamic_weighted_graph.sample_table import SampleTable
+
+
+def build_sampled_graph(sample_times: np.ndarray) -> DynamicWeightedGraph:
+    """
+    Build a complete graph on five vertices whose edges are columns of a
+    table of random samples that seldom change
+    """
+
+    rng = np.random.default_rng(0)
+    vertices = ["V%d" % index for index in range(5)]
+    samples = rng.choice(
+        [1.0, 2.0, math.inf], size=(len(sample_times), 10), p=[0.8, 0.1, 0.1]
+    )
+    table = SampleTable(sample_times, samples)
+
+    dwg = DynamicWeightedGraph(name="test")
+    for vertex in vertices:
+        dwg.add_vertex(vertex)
+    pairs = [(a, b) for a in vertices for b in vertices if a < b]
+    for column, (source, target) in enumerate(pairs):
+        dwg.define_edge_weight(
+            source, target, NearestSampleEdgeWeightFn.from_table(table, column)
+        )
+
+    return dwg
+
+
+def test_deltas_rebuild_the_graph():
+    """
+    Verify that applying every delta to the default weights gives the weights
+    of the graph at every time, whatever the chunk size, and that only the
+    edges that changed are listed
+    """
+
+    sample_times = np.arange(30.0)
+    dwg = build_sampled_graph(sample_times)
+    pairs = dwg.get_edges()
+
+    expected = dwg.evaluate_edge_weights(sample_times)
+    for time_chunk_size in [1, 7, 256]:
+        weights = np.full(len(pairs), math.inf)
+        deltas = list(
+            iterate_edge_deltas(dwg, sample_times, time_chunk_size=time_chunk_size)
+        )
+        assert len(deltas) == len(sample_times)
+
+        for index, delta in enumerate(deltas):
+            assert delta["time"] == sample_times[index]
+            np.testing.assert_array_equal(
+                delta["previous_weights"], weights[delta["edge_ids"]]
+            )
+            assert np.all(delta["previous_weights"] != delta["weights"])
+            assert delta["edges"] == [pairs[edge_id] for edge_id in delta["edge_ids"]]
+
+            weights[delta["edge_ids"]] = delta["weights"]
+            np.testing.assert_array_equal(weights, expected[:, index])
+
+
+def test_tolerance():
+    """
+    Verify that changes within the tolerance of the last reported weight are
+    left out, even when they add up over several times
+    """
+
+    dwg = DynamicWeightedGraph(name="test")
+    for vertex in ["A", "B"]:
+        dwg.add_vertex(vertex)
+    dwg.define_edge_weight(
+        "A", "B", NearestSampleEdgeWeightFn([0, 1, 2, 3, 4], [1.0, 1.4, 1.8, 1.9, 5])
+    )
+
+    deltas = list(iterate_edge_deltas(dwg, [0, 1, 2, 3, 4], tolerance=0.5))
+
+    assert [len(delta["edge_ids"]) for delta in deltas] == [1, 0, 1, 0, 1]
+    assert deltas[2]["previous_weights"][0] == 1.0
+    assert deltas[4]["previous_weights"][0] == 1.8
+
+
+def test_capacity_links():
+    """
+    Verify that a capacity graph reports links as they come up and go down,
+    starting from no links at all
+    """
+
+    dwg = DynamicWeightedGraph(name="test", convention=ConventionEnum.CAPACITY)
+    for vertex in ["A", "B", "C"]:
+        dwg.add_vertex(vertex)
+    dwg.define_edge_weight("A", "B", IntervalEdgeWeightFn([0.0], [20.0]))
+    dwg.define_edge_weight("B", "C", IntervalEdgeWeightFn([10.0], [30.0]))
+
+    changes = [
+        (delta["time"], delta["edges"], delta["weights"].tolist())
+        for delta in iterate_edge_deltas(dwg, np.arange(0.0, 40.0, 10.0))
+    ]
+
+    assert changes == [
+        (0.0, [("A", "B")], [1.0]),
+        (10.0, [("B", "C")], [1.0]),
+        (20.0, [("A", "B")], [0.0]),
+        (30.0, [("B", "C")], [0.0]),
+    ]
+
+
+def test_validation():
+    """
+    Verify that times must be one-dimensional and chunks non-empty, and that
+    no times give no deltas
+    """
+
+    dwg = DynamicWeightedGraph(name="test")
+
+    with pytest.raises(ValueError):
+        next(iterate_edge_deltas(dwg, np.zeros((2, 2))))
+
+    with pytest.raises(ValueError):
+        next(iterate_edge_deltas(dwg, [0.0], time_chunk_size=0))
+
+    assert not list(iterate_edge_deltas(dwg, []))
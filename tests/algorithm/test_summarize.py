@@ -0,0 +1,172 @@
+"""
+This module tests summarizing a DynamicWeightedGraph into a SummaryGraph
+"""
+
+import numpy as np
+import pytest
+from sumgraph.algorithm.summarize import (
+    EffectiveTraversalTimeReducer,
+    ExistenceFractionReducer,
+    TimeAverageReducer,
+    summarize,
+    summarize_time_average,
+)
+from sumgraph.model.dynamic_weighted_graph.convention_enum import ConventionEnum
+from sumgraph.model.dynamic_weighted_graph.dynamic_weighted_graph import (
+    DynamicWeightedGraph,
+)
+from sumgraph.model.dynamic_weighted_graph.interval_edge_weight_fn import (
+    IntervalEdgeWeightFn,
+)
+from sumgraph.model.dynamic_weighted_graph.nearest_sample_edge_weight_fn import (
+    NearestSampleEdgeWeightFn,
+)
+from sumgraph.model.dynamic_weighted_graph.piecewise_edge_weight_fn import (
+    PiecewiseConstantEdgeWeightFn,
+)
+
+
+def build_graph() -> DynamicWeightedGraph:
+    """
+    Build a directed capacity graph with one step function edge and one plain
+    callable edge
+    """
+
+    dwg = DynamicWeightedGraph(
+        name="test", convention=ConventionEnum.CAPACITY, directed=True
+    )
+    for vertex in ["A", "B", "C"]:
+        dwg.add_vertex(vertex)
+
+    dwg.define_edge_weight(
+        source_vertex="A",
+        target_vertex="B",
+        weight_function=PiecewiseConstantEdgeWeightFn(breakpoints=[5], values=[1, 3]),
+    )
+    dwg.define_edge_weight(
+        source_vertex="B",
+        target_vertex="C",
+        weight_function=lambda t: 2.0 if t < 5 else 0.0,
+    )
+
+    return dwg
+
+
+def test_time_average():
+    """
+    Verify that edges are averaged exactly when possible and numerically
+    otherwise
+    """
+
+    summary_graph = summarize(build_graph(), TimeAverageReducer(), (0, 10))
+
+    assert summary_graph.vertex_set == {"A", "B", "C"}
+    assert summary_graph.get_edge_weight("A", "B") == pytest.approx(2.0)
+    assert summary_graph.get_edge_weight("B", "C") == pytest.approx(1.0, abs=1e-4)
+    assert not summary_graph.has_edge_weight("B", "A")
+
+
+def test_existence_fraction():
+    """
+    Verify that the time an edge exists is measured exactly on step functions
+    and by sampling otherwise
+    """
+
+    dwg = build_graph()
+    dwg.define_edge_weight(
+        source_vertex="C",
+        target_vertex="A",
+        weight_function=NearestSampleEdgeWeightFn([0, 10, 20], [0, 5, 0]),
+    )
+
+    summary_graph = summarize(dwg, ExistenceFractionReducer(), (0, 20))
+
+    assert summary_graph.get_edge_weight("A", "B") == pytest.approx(1.0)
+    assert summary_graph.get_edge_weight("B", "C") == pytest.approx(0.25)
+    assert summary_graph.get_edge_weight("C", "A") == pytest.approx(0.5)
+
+
+def test_existence_fraction_of_intervals():
+    """
+    Verify that the time an interval-backed edge is up is measured exactly,
+    as its time average is
+    """
+
+    dwg = DynamicWeightedGraph(name="test", convention=ConventionEnum.CAPACITY)
+    for vertex in ["A", "B"]:
+        dwg.add_vertex(vertex)
+
+    dwg.define_edge_weight(
+        source_vertex="A",
+        target_vertex="B",
+        weight_function=IntervalEdgeWeightFn(starts=[0.0], ends=[12.0]),
+    )
+
+    for reducer in [ExistenceFractionReducer(), TimeAverageReducer()]:
+        summary_graph = summarize(dwg, reducer, (0, 100))
+        assert summary_graph.get_edge_weight("A", "B") == 0.12
+
+
+def test_effective_traversal_time():
+    """
+    Verify that the effective traversal time is the average time to move the
+    target value across an edge, and that undirected edges are set both ways
+    """
+
+    dwg = DynamicWeightedGraph(name="test", convention=ConventionEnum.CAPACITY)
+    for vertex in ["A", "B"]:
+        dwg.add_vertex(vertex)
+
+    dwg.define_edge_weight(
+        source_vertex="A",
+        target_vertex="B",
+        weight_function=PiecewiseConstantEdgeWeightFn(breakpoints=[], values=[2]),
+    )
+
+    summary_graph = summarize(
+        dwg, EffectiveTraversalTimeReducer(target_value=4), (0, 10)
+    )
+
+    assert summary_graph.get_edge_weight("A", "B") == pytest.approx(2.0)
+    assert summary_graph.get_edge_weight("B", "A") == pytest.approx(2.0)
+
+
+def test_summarize_jobs_are_deterministic():
+    """
+    Verify that a pool of workers gives the same summary as a single process
+    """
+
+    rng = np.random.default_rng(0)
+    dwg = DynamicWeightedGraph(name="test", directed=True)
+    vertices = ["V%d" % index for index in range(30)]
+    for vertex in vertices:
+        dwg.add_vertex(vertex)
+
+    sample_times = np.linspace(0, 100, 50)
+    for source_vertex in vertices:
+        for target_vertex in vertices[:10]:
+            dwg.define_edge_weight(
+                source_vertex=source_vertex,
+                target_vertex=target_vertex,
+                weight_function=NearestSampleEdgeWeightFn(
+                    sample_times, rng.uniform(0, 10, len(sample_times))
+                ),
+            )
+
+    serial = summarize(dwg, TimeAverageReducer(), (10, 90), chunk_size=32)
+    parallel = summarize(dwg, TimeAverageReducer(), (10, 90), jobs=3, chunk_size=32)
+
+    assert parallel.edge_set == serial.edge_set
+    assert serial.edge_set == summarize_time_average(dwg, (10, 90)).edge_set
+
+
+def test_summarize_validates_arguments():
+    """
+    Verify that an empty window and a bad number of jobs are rejected
+    """
+
+    with pytest.raises(ValueError):
+        summarize(build_graph(), TimeAverageReducer(), (10, 10))
+
+    with pytest.raises(ValueError):
+        summarize(build_graph(), TimeAverageReducer(), (0, 10), jobs=0)
@@ -0,0 +1,66 @@
+"""
+This module tests the ConnectionsSoapAccessor
+"""
+
+import pandas as pd
+import pytest
+from sumgraph.data_handler.data_accessor.connections_soap_accessor import (
+    ConnectionsSoapAccessor,
+)
+
+
+def test_extract_satellite_names_from_header():
+    """
+    Verify that extract_satellite_names_from_header works
+    """
+
+    assert ConnectionsSoapAccessor.extract_satellite_names_from_header(
+        "LRO sees TDRS 8"
+    ) == ("LRO", "TDRS 8")
+
+    with pytest.raises(ValueError):
+        ConnectionsSoapAccessor.extract_satellite_names_from_header("LRO")
+
+
+def test_convert_dataframe_to_data():
+    """
+    Verify that every window belongs to both directions of its pair, in the
+    order of the rows, and that satellites are listed in order of appearance
+    """
+
+    dataframe = pd.DataFrame(
+        {
+            "Analysis": [
+                "B sees C",
+                "A sees B",
+                "C sees B",
+                "A sees B",
+                "A sees A",
+            ],
+            "Rise": [5.0, 0.0, 40.0, 20.0, 1.0],
+            "Set": ["15", "10", "50", "30", "2"],
+        }
+    )
+
+    data = ConnectionsSoapAccessor.convert_dataframe_to_data(dataframe)
+
+    assert data["satellites"] == ["B", "C", "A"]
+    assert data["connections"] == {
+        "A": {"B": [(0.0, 10.0), (20.0, 30.0)], "A": [(1.0, 2.0), (1.0, 2.0)]},
+        "B": {"C": [(5.0, 15.0), (40.0, 50.0)], "A": [(0.0, 10.0), (20.0, 30.0)]},
+        "C": {"B": [(5.0, 15.0), (40.0, 50.0)]},
+    }
+    assert list(data["connections"]["A"]) == ["B", "A"]
+
+
+def test_convert_dataframe_to_data_rejects_bad_headers():
+    """
+    Verify that a header that does not name two satellites is rejected
+    """
+
+    dataframe = pd.DataFrame(
+        {"Analysis": ["A sees B", "A and B"], "Rise": [0.0, 1.0], "Set": [1.0, 2.0]}
+    )
+
+    with pytest.raises(ValueError, match="A and B"):
+        ConnectionsSoapAccessor.convert_dataframe_to_data(dataframe)
@@ -0,0 +1,261 @@
+"""
+This module tests the DistancesSoapAccessor
+"""
+
+import shutil
+import numpy as np
+import pytest
+from sumgraph.data_handler.data_accessor.distances_soap_accessor import (
+    DistancesSoapAccessor,
+)
+from sumgraph.data_handler.data_accessor.parsed_data_cache import ParsedDataCache
+
+
+FIXTURE_PATH = "tests/data_handler/data_accessor/$.fixture/sample_soap_distances.csv"
+
+
+def test_extract_satellite_names_from_header():
+    """
+    Verify that extract_satellite_names_from_header works
+    """
+
+    assert DistancesSoapAccessor.extract_satellite_names_from_header(
+        "Dist:SatA_SatB"
+    ) == ("SatA", "SatB")
+
+    with pytest.raises(ValueError):
+        DistancesSoapAccessor.extract_satellite_names_from_header("Dist:SatA")
+
+
+def test_run():
+    """
+    Verify that the whole file is read into data
+    """
+
+    data = DistancesSoapAccessor(filepath=FIXTURE_PATH).run().data
+
+    assert sorted(data["satellites"]) == ["SatA", "SatB", "SatC", "SatD"]
+    assert list(data["distance_sample_timestamps"]) == [
+        10.0 * index for index in range(12)
+    ]
+    np.testing.assert_array_equal(
+        data["distances"]["SatA"]["SatB"][:2], [3366.328, 4159.716]
+    )
+    assert data["distances"]["SatB"]["SatA"] is data["distances"]["SatA"]["SatB"]
+    assert "SatD" not in data["distances"]["SatA"]
+
+
+def test_columnar_data():
+    """
+    Verify that the columnar data holds every pair in one array, and that the
+    nested dict form only holds views of its columns
+    """
+
+    accessor = DistancesSoapAccessor(filepath=FIXTURE_PATH).run()
+    columnar_data = accessor.columnar_data
+
+    assert columnar_data["pairs"] == [
+        ("SatA", "SatB"),
+        ("SatA", "SatC"),
+        ("SatB", "SatC"),
+        ("SatC", "SatD"),
+    ]
+    assert columnar_data["distances"].shape == (12, 4)
+    assert columnar_data["distances"].dtype == np.float64
+    assert columnar_data["distance_sample_timestamps"].shape == (12,)
+    np.testing.assert_array_equal(columnar_data["distances"][1, 3], 3782.735)
+
+    series = accessor.data["distances"]["SatD"]["SatC"]
+    assert isinstance(series, np.ndarray)
+    assert np.shares_memory(series, columnar_data["distances"])
+    np.testing.assert_array_equal(series, columnar_data["distances"][:, 3])
+
+
+@pytest.mark.parametrize("chunksize", [1, 5, 100])
+def test_run_in_chunks(chunksize):
+    """
+    Verify that streaming the file in chunks gives the same data as reading
+    it at once
+    """
+
+    expected_accessor = DistancesSoapAccessor(filepath=FIXTURE_PATH).run()
+    accessor = DistancesSoapAccessor(filepath=FIXTURE_PATH, chunksize=chunksize).run()
+    (expected, data) = (expected_accessor.data, accessor.data)
+
+    np.testing.assert_array_equal(
+        accessor.columnar_data["distances"],
+        expected_accessor.columnar_data["distances"],
+    )
+
+    assert sorted(data["satellites"]) == sorted(expected["satellites"])
+    np.testing.assert_array_equal(
+        data["distance_sample_timestamps"], expected["distance_sample_timestamps"]
+    )
+    for source, targets in expected["distances"].items():
+        assert set(data["distances"][source]) == set(targets)
+        for target, samples in targets.items():
+            np.testing.assert_array_equal(data["distances"][source][target], samples)
+
+
+def test_chunksize_must_be_positive():
+    """
+    Verify that a chunksize of zero is rejected
+    """
+
+    with pytest.raises(ValueError):
+        DistancesSoapAccessor(filepath=FIXTURE_PATH, chunksize=0)
+
+
+@pytest.mark.parametrize("chunksize", [None, 5])
+def test_run_with_mmap(tmp_path, chunksize):
+    """
+    Verify that the file is converted into a pair-major memory-mapped array
+    of single precision distances, whose columns are contiguous
+    """
+
+    expected = DistancesSoapAccessor(filepath=FIXTURE_PATH).run().columnar_data
+    accessor = DistancesSoapAccessor(
+        filepath=FIXTURE_PATH, chunksize=chunksize, mmap_dir=str(tmp_path)
+    ).run()
+    distances = accessor.columnar_data["distances"]
+
+    assert isinstance(distances, np.memmap)
+    assert distances.dtype == np.float32
+    assert distances[:, 3].flags["C_CONTIGUOUS"]
+    assert accessor.columnar_data["pairs"] == expected["pairs"]
+    np.testing.assert_array_equal(distances, expected["distances"].astype(np.float32))
+    np.testing.assert_array_equal(
+        accessor.data["distance_sample_timestamps"],
+        expected["distance_sample_timestamps"],
+    )
+    assert np.shares_memory(accessor.data["distances"]["SatD"]["SatC"], distances)
+
+
+def test_mmap_is_reused_until_the_file_changes(tmp_path, monkeypatch):
+    """
+    Verify that the file is only converted again once it changes
+    """
+
+    filepath = tmp_path / "distances.csv"
+    shutil.copyfile(FIXTURE_PATH, filepath)
+    mmap_dir = str(tmp_path / "mmap")
+    DistancesSoapAccessor(filepath=str(filepath), mmap_dir=mmap_dir).run()
+
+    conversions = []
+    convert_file_to_mmap = DistancesSoapAccessor.convert_file_to_mmap
+
+    def count_conversions(accessor):
+        conversions.append(accessor.filepath)
+        return convert_file_to_mmap(accessor)
+
+    monkeypatch.setattr(
+        DistancesSoapAccessor, "convert_file_to_mmap", count_conversions
+    )
+
+    DistancesSoapAccessor(filepath=str(filepath), mmap_dir=mmap_dir).run()
+    assert not conversions
+
+    with open(filepath, "a", encoding="utf-8") as file:
+        file.write("120,1,2,3,4,\n")
+    accessor = DistancesSoapAccessor(filepath=str(filepath), mmap_dir=mmap_dir).run()
+
+    assert len(conversions) == 1
+    assert accessor.columnar_data["distances"].shape == (13, 4)
+    np.testing.assert_array_equal(accessor.columnar_data["distances"][12], [1, 2, 3, 4])
+
+
+def test_mmap_cannot_be_cached(tmp_path):
+    """
+    Verify that a memory-mapped accessor rejects a cache
+    """
+
+    with pytest.raises(ValueError):
+        DistancesSoapAccessor(
+            filepath=FIXTURE_PATH,
+            cache=ParsedDataCache(str(tmp_path / "cache")),
+            mmap_dir=str(tmp_path / "mmap"),
+        )
+
+
+@pytest.mark.parametrize(
+    "options", [{}, {"chunksize": 1}, {"chunksize": 5}, {"mmap_dir": "mmap"}]
+)
+def test_select(tmp_path, options):
+    """
+    Verify that only the pairs of the allowed satellites and the samples in
+    the time range are kept, however the file is read
+    """
+
+    if "mmap_dir" in options:
+        options = {"mmap_dir": str(tmp_path / options["mmap_dir"])}
+
+    expected = DistancesSoapAccessor(filepath=FIXTURE_PATH).run().columnar_data
+    accessor = (
+        DistancesSoapAccessor(filepath=FIXTURE_PATH, **options)
+        .select(satellites=["SatD", "SatB", "SatC"], time_range=(15.0, 60.0))
+        .run()
+    )
+    columnar_data = accessor.columnar_data
+
+    assert columnar_data["pairs"] == [("SatB", "SatC"), ("SatC", "SatD")]
+    assert columnar_data["satellites"] == ["SatB", "SatC", "SatD"]
+    np.testing.assert_array_equal(
+        columnar_data["distance_sample_timestamps"], [20.0, 30.0, 40.0, 50.0, 60.0]
+    )
+    np.testing.assert_array_equal(
+        columnar_data["distances"],
+        expected["distances"][2:7, 2:4].astype(columnar_data["distances"].dtype),
+    )
+    assert "SatA" not in accessor.data["distances"]
+
+
+@pytest.mark.parametrize("options", [{}, {"chunksize": 1}, {"chunksize": 5}])
+def test_select_skips_samples_outside_time_range(tmp_path, options):
+    """
+    Verify that the samples outside the time range are never parsed, by
+    corrupting their distances
+    """
+
+    with open(FIXTURE_PATH, encoding="utf-8") as file:
+        lines = file.read().splitlines()
+    for index, line in enumerate(lines[7:], start=7):
+        timestamp = line.split(",")[0]
+        if not 15.0 <= float(timestamp) <= 60.0:
+            lines[index] = timestamp + ",bad,bad,bad,bad,"
+    filepath = tmp_path / "distances.csv"
+    filepath.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    expected = DistancesSoapAccessor(filepath=FIXTURE_PATH).run().columnar_data
+    columnar_data = (
+        DistancesSoapAccessor(filepath=str(filepath), **options)
+        .select(time_range=(15.0, 60.0))
+        .run()
+        .columnar_data
+    )
+
+    np.testing.assert_array_equal(
+        columnar_data["distance_sample_timestamps"], [20.0, 30.0, 40.0, 50.0, 60.0]
+    )
+    np.testing.assert_array_equal(
+        columnar_data["distances"],
+        expected["distances"][2:7].astype(columnar_data["distances"].dtype),
+    )
+
+
+def test_select_validation_and_cache_key(tmp_path):
+    """
+    Verify that a time range that ends before it starts is rejected, and that
+    different selections are cached separately
+    """
+
+    with pytest.raises(ValueError):
+        DistancesSoapAccessor(filepath=FIXTURE_PATH).select(time_range=(2.0, 1.0))
+
+    cache = ParsedDataCache(str(tmp_path / "cache"))
+    DistancesSoapAccessor(filepath=FIXTURE_PATH, cache=cache).select(
+        satellites=["SatA", "SatB"]
+    ).run()
+    accessor = DistancesSoapAccessor(filepath=FIXTURE_PATH, cache=cache).run()
+
+    assert len(accessor.columnar_data["pairs"]) == 4
+    assert len(cache.list_entries()) == 2
@@ -0,0 +1,34 @@
+"""
+This module tests the LabeledMatrixView
+"""
+
+import numpy as np
+import pytest
+from sumgraph.data_handler.data_accessor.labeled_matrix_view import LabeledMatrixView
+
+
+def test_labeled_matrix_view():
+    """
+    Verify that the view reads like a nested dict of the matrix, and follows
+    changes to the matrix
+    """
+    matrix = np.array([[0.0, 1.5], [2.5, 0.0]])
+    view = LabeledMatrixView(["A", "B"], matrix)
+
+    assert list(view) == ["A", "B"]
+    assert len(view["A"]) == 2
+    assert view["B"]["A"] == 2.5
+    assert isinstance(view["A"]["B"], float)
+    assert "C" not in view
+    assert view.get("C") is None
+    assert view == {"A": {"A": 0.0, "B": 1.5}, "B": {"A": 2.5, "B": 0.0}}
+    assert view != {"A": {"A": 0.0, "B": 1.5}}
+
+    matrix[0, 1] = 3.0
+    assert view["A"]["B"] == 3.0
+
+    with pytest.raises(KeyError):
+        _ = view["A"]["C"]
+
+    with pytest.raises(ValueError):
+        LabeledMatrixView(["A"], matrix)
@@ -0,0 +1,146 @@
+"""
+This module tests the MultiFileDistancesSoapAccessor
+"""
+
+import os
+from typing import List
+import numpy as np
+import pytest
+from sumgraph.data_handler.data_accessor.distances_soap_accessor import (
+    DistancesSoapAccessor,
+)
+from sumgraph.data_handler.data_accessor.multi_file_distances_soap_accessor import (
+    MultiFileDistancesSoapAccessor,
+)
+from sumgraph.data_handler.data_adapter.distances_soap_to_dynamic_weighted_graph_adapter import (
+    DistancesSoapToDynamicWeightedGraphAdapter,
+)
+
+
+FIXTURE_PATH = "tests/data_handler/data_accessor/$.fixture/sample_soap_distances.csv"
+
+
+def write_part(filepath: str, rows: slice, columns: List[int]) -> str:
+    """
+    Write some of the rows and distance columns of the fixture as a SOAP file
+    of its own, keeping the timestamp column
+    """
+    with open(FIXTURE_PATH, encoding="utf-8") as file:
+        lines = [line.rstrip("\n").rstrip(",").split(",") for line in file]
+
+    kept_columns = [0] + [column + 1 for column in columns]
+    with open(filepath, "w", encoding="utf-8") as file:
+        for line in lines[:5]:
+            file.write(",".join(line) + ",\n")
+        for line in lines[5:7] + lines[7:][rows]:
+            file.write(",".join(line[column] for column in kept_columns) + ",\n")
+
+    return filepath
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_merge_by_plane_and_by_day(tmp_path, jobs):
+    """
+    Verify that files split by pairs and by time merge back into the data of
+    the whole file
+    """
+    expected = DistancesSoapAccessor(filepath=FIXTURE_PATH).run().columnar_data
+    for index, (rows, columns) in enumerate(
+        [
+            (slice(0, 6), [0, 1]),
+            (slice(0, 6), [2, 3]),
+            (slice(6, 12), [0, 1]),
+            (slice(6, 12), [2, 3]),
+        ]
+    ):
+        write_part(str(tmp_path / ("part%d.csv" % index)), rows, columns)
+
+    accessor = MultiFileDistancesSoapAccessor(
+        os.path.join(str(tmp_path), "part*.csv"), jobs=jobs
+    ).run()
+    columnar_data = accessor.columnar_data
+
+    assert columnar_data["pairs"] == expected["pairs"]
+    assert sorted(columnar_data["satellites"]) == sorted(expected["satellites"])
+    np.testing.assert_array_equal(
+        columnar_data["distance_sample_timestamps"],
+        expected["distance_sample_timestamps"],
+    )
+    np.testing.assert_array_equal(columnar_data["distances"], expected["distances"])
+
+    dwg = DistancesSoapToDynamicWeightedGraphAdapter(accessor).adapt()
+    assert dwg.get_edge_weight_fn("SatD", "SatC")(12.0) == 3782.735
+
+
+def test_missing_pairs_are_infinitely_far(tmp_path):
+    """
+    Verify that a pair that is only in the files for some times is infinitely
+    far apart at other times
+    """
+    accessor = MultiFileDistancesSoapAccessor(
+        [
+            write_part(str(tmp_path / "early.csv"), slice(0, 6), [0, 1]),
+            write_part(str(tmp_path / "late.csv"), slice(6, 12), [0]),
+        ]
+    ).run()
+    distances = accessor.columnar_data["distances"]
+
+    assert distances.shape == (12, 2)
+    assert np.isinf(distances[6:, 1]).all()
+    assert np.isfinite(distances[:6]).all()
+
+
+def test_overlaps_are_rejected(tmp_path):
+    """
+    Verify that files with samples for the same pair at the same times, or
+    with time ranges that overlap, are rejected
+    """
+    same_times = [
+        write_part(str(tmp_path / "a.csv"), slice(0, 6), [0, 1]),
+        write_part(str(tmp_path / "b.csv"), slice(0, 6), [1, 2]),
+    ]
+    with pytest.raises(ValueError, match="same times"):
+        MultiFileDistancesSoapAccessor(same_times).run()
+
+    overlapping_times = [
+        write_part(str(tmp_path / "c.csv"), slice(0, 6), [0]),
+        write_part(str(tmp_path / "d.csv"), slice(5, 12), [1]),
+    ]
+    with pytest.raises(ValueError, match="overlap"):
+        MultiFileDistancesSoapAccessor(overlapping_times).run()
+
+
+def test_constructor_validation(tmp_path):
+    """
+    Verify that an empty list of files, or a glob without matches, and a
+    non-positive number of jobs are rejected
+    """
+    with pytest.raises(ValueError):
+        MultiFileDistancesSoapAccessor([])
+
+    with pytest.raises(ValueError):
+        MultiFileDistancesSoapAccessor(os.path.join(str(tmp_path), "*.csv"))
+
+    with pytest.raises(ValueError):
+        MultiFileDistancesSoapAccessor([FIXTURE_PATH], jobs=0)
+
+
+def test_select(tmp_path):
+    """
+    Verify that a selection applies to every file
+    """
+    accessor = (
+        MultiFileDistancesSoapAccessor(
+            [
+                write_part(str(tmp_path / "early.csv"), slice(0, 6), [0, 3]),
+                write_part(str(tmp_path / "late.csv"), slice(6, 12), [0, 3]),
+            ]
+        )
+        .select(satellites=["SatC", "SatD"], time_range=(40.0, 70.0))
+        .run()
+    )
+
+    assert accessor.columnar_data["pairs"] == [("SatC", "SatD")]
+    np.testing.assert_array_equal(
+        accessor.columnar_data["distance_sample_timestamps"], [40, 50, 60, 70]
+    )
@@ -1,7 +1,9 @@
 """
 This module tests the ParedDownSoapAccessor
 """
+import numpy as np
 import pandas as pd
+import pytest
 
 from sumgraph.data_handler.data_accessor.pared_down_soap_accessor import (
     DataFrameRow,
@@ -227,3 +229,81 @@ def test_convert_dataframe_to_data():
         },
     }
     assert actual_visibility == expected_visibility
+
+
+def test_run_matrix_data():
+    """
+    Verify that the visibility is held as a symmetric matrix of the requested
+    dtype, and that the nested dict form reads from it
+    """
+    accessor = ParedDownSoapAccessor(
+        filepath="tests/data_handler/data_accessor/$.fixture/sample_soap_pared_down.csv",
+        dtype=np.float32,
+    ).run()
+    matrix_data = accessor.matrix_data
+    satellites = matrix_data["satellites"]
+    visibility = matrix_data["visibility"]
+
+    assert len(satellites) == 11
+    assert visibility.dtype == np.float32
+    np.testing.assert_array_equal(visibility, visibility.T)
+    assert visibility[
+        satellites.index("LRO"), satellites.index("Canberra")
+    ] == np.float32(30.64)
+    assert accessor.data["visibility"]["Canberra"]["LRO"] == float(np.float32(30.64))
+    assert accessor.data["visibility"]["Guam"]["Guam"] == 0.0
+
+
+def test_convert_dataframe_to_matrix_data_keeps_last_row():
+    """
+    Verify that when a pair has several rows, in either direction, the last
+    one wins, and that unparseable labels are rejected
+    """
+    dataframe = pd.DataFrame(
+        {
+            "Analysis": ["A sees B", "B sees A", "B sees C"],
+            "Percent True": ["10.00%", "20.00%", "30.00%"],
+        }
+    )
+
+    data = ParedDownSoapAccessor.convert_dataframe_to_data(dataframe)
+
+    assert data["satellites"] == ["A", "B", "C"]
+    assert data["visibility"] == {
+        "A": {"A": 0.0, "B": 20.0, "C": 0.0},
+        "B": {"A": 20.0, "B": 0.0, "C": 30.0},
+        "C": {"A": 0.0, "B": 30.0, "C": 0.0},
+    }
+
+    with pytest.raises(ValueError):
+        ParedDownSoapAccessor.convert_dataframe_to_data(
+            pd.DataFrame({"Analysis": ["A"], "Percent True": ["1%"]})
+        )
+
+
+def test_convert_dataframe_to_matrix_data_deduplicates_pairs():
+    """
+    Verify that a pair repeated in both orientations takes the value of its
+    last row on both sides of the matrix
+    """
+    dataframe = pd.DataFrame(
+        {
+            "Analysis": [
+                "A sees B",
+                "B sees A",
+                "C sees B",
+                "A sees B",
+                "B sees C",
+                "C sees B",
+            ],
+            "Percent True": ["10%", "20%", "30%", "40%", "50%", "60%"],
+        }
+    )
+
+    matrix_data = ParedDownSoapAccessor.convert_dataframe_to_matrix_data(dataframe)
+
+    assert matrix_data["satellites"] == ["A", "B", "C"]
+    np.testing.assert_array_equal(
+        matrix_data["visibility"],
+        [[0.0, 40.0, 0.0], [40.0, 0.0, 60.0], [0.0, 60.0, 0.0]],
+    )
@@ -0,0 +1,178 @@
+"""
+This module tests the ParsedDataCache and the file based accessors that use it
+"""
+
+import os
+import shutil
+import numpy as np
+import pytest
+from sumgraph.data_handler.data_accessor.connections_soap_accessor import (
+    ConnectionsSoapAccessor,
+)
+from sumgraph.data_handler.data_accessor.distances_soap_accessor import (
+    DistancesSoapAccessor,
+)
+from sumgraph.data_handler.data_accessor.pared_down_soap_accessor import (
+    ParedDownSoapAccessor,
+)
+from sumgraph.data_handler.data_accessor.parsed_data_cache import ParsedDataCache
+
+
+FIXTURE_DIR = "tests/data_handler/data_accessor/$.fixture"
+DISTANCES_FIXTURE_PATH = os.path.join(FIXTURE_DIR, "sample_soap_distances.csv")
+PARED_DOWN_FIXTURE_PATH = os.path.join(FIXTURE_DIR, "sample_soap_pared_down.csv")
+
+CONNECTIONS_FILE = """Connections
+Data for: 1 Jan 2020
+
+Generated: 1 Jan 2020
+Start,Stop
+Analysis,Rise,Set,Duration,
+,sec,sec,sec,
+A sees B,0,10,10,
+A sees B,20,30,10,
+B sees C,5,15,10,
+A sees A,0,1,1,
+Analysis,A,B,C,
+"""
+
+
+def copy_fixture(source: str, directory: str) -> str:
+    """
+    Copy a fixture, so that it can be changed
+    """
+    destination = os.path.join(directory, os.path.basename(source))
+    shutil.copyfile(source, destination)
+
+    return destination
+
+
+def forbid_parsing(monkeypatch: pytest.MonkeyPatch, accessor_class: type) -> None:
+    """
+    Make reading the datafile fail, so that only cache hits can succeed
+    """
+
+    def fail(_):
+        raise AssertionError("the datafile was parsed")
+
+    monkeypatch.setattr(accessor_class, "run_read_file", fail)
+
+
+def test_distances_warm_start(tmp_path, monkeypatch):
+    """
+    Verify that a warm start restores the distances without parsing the file
+    """
+    cache = ParsedDataCache(str(tmp_path / "cache"))
+    cold = DistancesSoapAccessor(DISTANCES_FIXTURE_PATH, cache=cache).run()
+
+    forbid_parsing(monkeypatch, DistancesSoapAccessor)
+    warm = DistancesSoapAccessor(DISTANCES_FIXTURE_PATH, cache=cache).run()
+
+    assert warm.columnar_data["satellites"] == cold.columnar_data["satellites"]
+    assert warm.columnar_data["pairs"] == cold.columnar_data["pairs"]
+    np.testing.assert_array_equal(
+        warm.columnar_data["distances"], cold.columnar_data["distances"]
+    )
+    np.testing.assert_array_equal(
+        warm.data["distances"]["SatD"]["SatC"], cold.data["distances"]["SatC"]["SatD"]
+    )
+    np.testing.assert_array_equal(
+        warm.data["distance_sample_timestamps"],
+        cold.data["distance_sample_timestamps"],
+    )
+
+
+def test_pared_down_warm_start(tmp_path, monkeypatch):
+    """
+    Verify that a warm start restores the visibility without parsing the file
+    """
+    cache = ParsedDataCache(str(tmp_path / "cache"), mmap=False)
+    cold = ParedDownSoapAccessor(PARED_DOWN_FIXTURE_PATH, cache=cache).run()
+
+    forbid_parsing(monkeypatch, ParedDownSoapAccessor)
+    warm = ParedDownSoapAccessor(PARED_DOWN_FIXTURE_PATH, cache=cache).run()
+
+    assert warm.data == cold.data
+
+
+def test_connections_warm_start(tmp_path, monkeypatch):
+    """
+    Verify that a warm start restores the connections without parsing the file
+    """
+    filepath = tmp_path / "connections.csv"
+    filepath.write_text(CONNECTIONS_FILE, encoding="utf-8")
+    cache = ParsedDataCache(str(tmp_path / "cache"))
+    cold = ConnectionsSoapAccessor(str(filepath), cache=cache).run()
+
+    forbid_parsing(monkeypatch, ConnectionsSoapAccessor)
+    warm = ConnectionsSoapAccessor(str(filepath), cache=cache).run()
+
+    assert warm.data == cold.data
+    assert warm.data["connections"]["B"]["A"] == [(0.0, 10.0), (20.0, 30.0)]
+
+
+def test_changed_file_misses(tmp_path):
+    """
+    Verify that changing the datafile gives a new key
+    """
+    filepath = copy_fixture(DISTANCES_FIXTURE_PATH, str(tmp_path))
+    cache = ParsedDataCache(str(tmp_path / "cache"))
+
+    def get_key():
+        return cache.get_key(filepath, "DistancesSoapAccessor", {})
+
+    key = get_key()
+    assert get_key() == key
+    assert cache.get_key(filepath, "DistancesSoapAccessor", {"chunksize": 1}) != key
+
+    file_stat = os.stat(filepath)
+    os.utime(filepath, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns + 10**9))
+    assert get_key() != key
+
+    with open(filepath, "a", encoding="utf-8") as file:
+        file.write("\n")
+    assert get_key() != key
+
+
+def test_hash_content(tmp_path):
+    """
+    Verify that with content hashing, a file rewritten with other contents but
+    the same size and modification time misses
+    """
+    filepath = tmp_path / "data.csv"
+    filepath.write_bytes(b"aaaa")
+    file_stat = os.stat(filepath)
+    cache = ParsedDataCache(str(tmp_path / "cache"), hash_content=True)
+    key = cache.get_key(str(filepath), "Accessor", {})
+
+    filepath.write_bytes(b"bbbb")
+    os.utime(filepath, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns))
+
+    assert cache.get_key(str(filepath), "Accessor", {}) != key
+
+
+def test_eviction(tmp_path):
+    """
+    Verify that the least recently used entries are evicted past max_bytes
+    """
+    cache = ParsedDataCache(str(tmp_path / "cache"), max_bytes=3000)
+
+    for index, key in enumerate(["first", "second", "third"]):
+        cache.store(
+            key, {"arrays": {"values": np.zeros(100)}, "metadata": {"index": index}}
+        )
+        os.utime(
+            os.path.join(cache.get_entry_dir(key), "metadata.json"),
+            (index, index),
+        )
+
+    # Reading the first entry makes the second the least recently used
+    assert cache.load("first") is not None
+    cache.store("fourth", {"arrays": {"values": np.zeros(100)}, "metadata": {}})
+
+    assert cache.load("second") is None
+    assert cache.load("fourth") is not None
+    assert sum(size for (_, size, _) in cache.list_entries()) <= 3000
+
+    with pytest.raises(ValueError):
+        ParsedDataCache(str(tmp_path / "cache"), max_bytes=0)
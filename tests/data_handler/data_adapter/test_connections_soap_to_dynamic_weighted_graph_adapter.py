@@ -0,0 +1,111 @@
+"""
+This module tests the ConnectionsSoapToDynamicWeightedGraphAdapter
+"""
+
+import numpy as np
+import pandas as pd
+from sumgraph.data_handler.data_accessor.connections_soap_accessor import (
+    ConnectionsSoapAccessor,
+)
+from sumgraph.data_handler.data_adapter.connections_soap_to_dynamic_weighted_graph_adapter import (
+    ConnectionsSoapToDynamicWeightedGraphAdapter,
+)
+from sumgraph.model.dynamic_weighted_graph.convention_enum import ConventionEnum
+
+
+ROWS = [
+    ("SatA sees SatB", 0.0, 10.0),
+    ("SatB sees SatA", 5.0, 15.0),
+    ("SatA sees SatB", 40.0, 50.0),
+    ("SatB sees SatC", 20.0, 30.0),
+]
+
+
+def write_connections_file(filepath: str) -> str:
+    """
+    Write the rows above as a SOAP connections report, followed by the
+    secondary analysis block that the accessor drops
+    """
+    lines = [
+        "SOAP Connections Report,",
+        "Data for: 2021/08/01 00:00:00,",
+        "",
+        "Generated: 2021/08/14 12:00:00,",
+        "Start: 0.0 Stop: 110.0,",
+        "Analysis,Rise,Set,Duration,",
+        ",Seconds,Seconds,Seconds,",
+    ]
+    lines += [
+        "%s,%g,%g,%g," % (row[0], row[1], row[2], row[2] - row[1]) for row in ROWS
+    ]
+    lines += ["Analysis,SatA,SatB,SatC,"]
+
+    with open(filepath, "w", encoding="utf-8") as file:
+        file.write("\n".join(lines) + "\n")
+
+    return filepath
+
+
+def test_adapt(tmp_path):
+    """
+    Verify that every pair that ever sees each other becomes an edge with a
+    capacity of 1 while it does and 0 otherwise
+    """
+
+    accessor = ConnectionsSoapAccessor(
+        filepath=write_connections_file(str(tmp_path / "connections.csv"))
+    )
+    dwg = ConnectionsSoapToDynamicWeightedGraphAdapter(accessor).adapt()
+
+    assert dwg.convention == ConventionEnum.CAPACITY
+    assert dwg.vertex_set == {"SatA", "SatB", "SatC"}
+    assert len(dwg.get_edges()) == 2
+
+    weight_fn = dwg.get_edge_weight_fn("SatB", "SatA")
+    np.testing.assert_array_equal(weight_fn.starts, [0.0, 40.0])
+    np.testing.assert_array_equal(weight_fn.ends, [15.0, 50.0])
+    assert dwg.get_edge_weight_fn("SatA", "SatC")(25.0) == 0
+
+    times = np.array([0.0, 12.0, 15.0, 25.0, 45.0])
+    np.testing.assert_array_equal(
+        dwg.evaluate_edge_weights(times, edges=[("SatA", "SatB"), ("SatC", "SatB")]),
+        [[1, 1, 0, 0, 1], [0, 0, 0, 1, 0]],
+    )
+    np.testing.assert_array_equal(dwg.snapshot(25.0).sum(), 2)
+
+
+def test_matches_windows():
+    """
+    Verify that the graph sampled over a long horizon matches a scan of the
+    windows of every pair
+    """
+
+    rng = np.random.default_rng(0)
+    satellites = np.array(["S%d" % index for index in range(8)])
+    dataframe = pd.DataFrame(
+        {
+            "Source": satellites[rng.integers(0, 8, size=300)],
+            "Target": satellites[rng.integers(0, 8, size=300)],
+            "Rise": rng.uniform(0.0, 1000.0, size=300).round(),
+        }
+    )
+    dataframe["Set"] = dataframe["Rise"] + rng.uniform(1.0, 40.0, size=300).round()
+    dataframe["Analysis"] = dataframe["Source"] + " sees " + dataframe["Target"]
+
+    dwg = ConnectionsSoapToDynamicWeightedGraphAdapter.adapt_data_to_model(
+        ConnectionsSoapAccessor.convert_dataframe_to_data(dataframe)
+    )
+
+    times = np.linspace(-10.0, 1050.0, 2001)
+    edges = dwg.get_edges()
+    weights = dwg.evaluate_edge_weights(times, edges=edges)
+    for edge_index, (source, target) in enumerate(edges):
+        windows = dataframe[
+            ((dataframe["Source"] == source) & (dataframe["Target"] == target))
+            | ((dataframe["Source"] == target) & (dataframe["Target"] == source))
+        ]
+        expected = (
+            (windows["Rise"].to_numpy()[:, np.newaxis] <= times)
+            & (times < windows["Set"].to_numpy()[:, np.newaxis])
+        ).any(axis=0)
+        np.testing.assert_array_equal(weights[edge_index], expected)
@@ -0,0 +1,74 @@
+"""
+This module tests the DistancesSoapToDynamicWeightedGraphAdapter
+"""
+
+import numpy as np
+from sumgraph.data_handler.data_accessor.distances_soap_accessor import (
+    DistancesSoapAccessor,
+)
+from sumgraph.data_handler.data_adapter.distances_soap_to_dynamic_weighted_graph_adapter import (
+    DistancesSoapToDynamicWeightedGraphAdapter,
+)
+
+
+FIXTURE_PATH = "tests/data_handler/data_accessor/$.fixture/sample_soap_distances.csv"
+
+
+def test_adapt():
+    """
+    Verify that every pair of satellites becomes an edge that returns the
+    closest sample, and that the columnar and nested dict forms agree
+    """
+
+    accessor = DistancesSoapAccessor(filepath=FIXTURE_PATH)
+    dwg = DistancesSoapToDynamicWeightedGraphAdapter(accessor).adapt()
+
+    assert dwg.vertex_set == {"SatA", "SatB", "SatC", "SatD"}
+    assert len(dwg.get_edges()) == 4
+    assert dwg.get_edge_weight_fn("SatD", "SatC")(12.0) == 3782.735
+    assert dwg.get_edge_weight_fn("SatA", "SatD")(12.0) == np.inf
+
+    tables = {id(dwg.get_edge_weight_fn(*edge).table) for edge in dwg.get_edges()}
+    assert len(tables) == 1
+
+    dict_dwg = DistancesSoapToDynamicWeightedGraphAdapter.adapt_data_to_model(
+        accessor.data
+    )
+    times = np.linspace(-5, 120, 40)
+    np.testing.assert_array_equal(
+        dict_dwg.evaluate_edge_weights(times, edges=dwg.get_edges()),
+        dwg.evaluate_edge_weights(times),
+    )
+
+
+def test_adapt_with_mmap(tmp_path):
+    """
+    Verify that the edges of a memory-mapped accessor read their samples
+    straight from the memory-mapped array
+    """
+
+    accessor = DistancesSoapAccessor(filepath=FIXTURE_PATH, mmap_dir=str(tmp_path))
+    dwg = DistancesSoapToDynamicWeightedGraphAdapter(accessor).adapt()
+    weight_fn = dwg.get_edge_weight_fn("SatD", "SatC")
+
+    assert np.shares_memory(weight_fn.samples, accessor.columnar_data["distances"])
+    assert weight_fn(12.0) == float(np.float32(3782.735))
+    assert weight_fn.evaluate(np.array([12.0])).dtype == np.float64
+
+
+def test_adapt_is_lazy():
+    """
+    Verify that the file is only read when the graph is adapted, so that a
+    selection made after the adapter is built still applies
+    """
+
+    accessor = DistancesSoapAccessor(filepath=FIXTURE_PATH)
+    adapter = DistancesSoapToDynamicWeightedGraphAdapter(accessor)
+
+    assert accessor.columnar_data["pairs"] == []
+
+    accessor.select(satellites=["SatC", "SatD"])
+    dwg = adapter.adapt()
+
+    assert dwg.vertex_set == {"SatC", "SatD"}
+    assert len(dwg.get_edges()) == 1
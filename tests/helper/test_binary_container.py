@@ -0,0 +1,88 @@
+"""
+This module tests the binary container of arrays and metadata
+"""
+
+import struct
+import numpy as np
+import pytest
+from sumgraph.helper.binary_container import (
+    ARRAY_ALIGNMENT,
+    PREFIX_FORMAT,
+    read_container,
+    write_container,
+)
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_round_trip(tmp_path, mmap):
+    """
+    Verify that arrays of any dtype and shape, including empty ones, and
+    metadata come back as they were written
+    """
+
+    filepath = str(tmp_path / "container.bin")
+    arrays = {
+        "floats": np.linspace(0, 1, 7, dtype=np.float32).reshape(7, 1),
+        "ints": np.arange(10, dtype=np.int64).reshape(2, 5),
+        "empty": np.zeros((0, 3)),
+        "transposed": np.arange(6.0).reshape(2, 3).T,
+    }
+    metadata = {"name": "test", "vertices": ["A", "B", "Zürich"]}
+    write_container(filepath, kind="test", metadata=metadata, arrays=arrays)
+
+    (read_metadata, read_arrays) = read_container(filepath, kind="test", mmap=mmap)
+
+    assert read_metadata == metadata
+    assert list(read_arrays) == list(arrays)
+    for name, array in arrays.items():
+        assert read_arrays[name].dtype == array.dtype
+        np.testing.assert_array_equal(read_arrays[name], array)
+
+    assert isinstance(read_arrays["ints"], np.memmap) == mmap
+    assert read_arrays["ints"].ctypes.data % ARRAY_ALIGNMENT == 0 or not mmap
+
+
+def test_mmap_is_copy_on_write(tmp_path):
+    """
+    Verify that writing to a memory-mapped array does not change the file
+    """
+
+    filepath = str(tmp_path / "container.bin")
+    write_container(filepath, kind="test", metadata={}, arrays={"a": np.zeros(4)})
+
+    (_, arrays) = read_container(filepath, kind="test")
+    arrays["a"][0] = 1.0
+
+    (_, arrays) = read_container(filepath, kind="test")
+    assert arrays["a"][0] == 0.0
+
+
+def test_rejects_other_files(tmp_path):
+    """
+    Verify that files that are not containers, containers of another format
+    version and containers of another kind of object are rejected
+    """
+
+    filepath = str(tmp_path / "container.bin")
+    with open(filepath, "wb") as file:
+        file.write(b"not a container")
+    with pytest.raises(ValueError, match="not a sumgraph binary file"):
+        read_container(filepath, kind="test")
+
+    write_container(filepath, kind="test", metadata={}, arrays={"a": np.zeros(4)})
+    with pytest.raises(ValueError, match="holds a test"):
+        read_container(filepath, kind="other")
+
+    with open(filepath, "r+b") as file:
+        (magic, version, header_length) = struct.unpack(
+            PREFIX_FORMAT, file.read(struct.calcsize(PREFIX_FORMAT))
+        )
+        file.seek(0)
+        file.write(struct.pack(PREFIX_FORMAT, magic, version + 1, header_length))
+    with pytest.raises(ValueError, match="format version"):
+        read_container(filepath, kind="test")
+
+    with pytest.raises(ValueError, match="not numeric"):
+        write_container(
+            filepath, kind="test", metadata={}, arrays={"a": np.array(["x"], object)}
+        )
@@ -2,7 +2,12 @@
 This module tests the closest_sorted_array_search
 """
 
-from sumgraph.helper.closest_sorted_array_search import closest_sorted_array_search
+import numpy as np
+import pytest
+from sumgraph.helper.closest_sorted_array_search import (
+    closest_sorted_array_search,
+    closest_sorted_array_search_batch,
+)
 
 
 def test_basic():
@@ -39,3 +44,55 @@ def test_one_element_array():
 
     assert actual_index == expected_index
     assert actual_value == expected_value
+
+
+def test_ties_prefer_the_earlier_middle():
+    """
+    Ties are broken the same way as a recursive bisection that prefers the
+    middle value at every level
+    """
+    array = [1.0, 2.0, 3.0]
+
+    assert closest_sorted_array_search(array=array, target=1.5) == (1, 2.0)
+    assert closest_sorted_array_search(array=array, target=2.5) == (1, 2.0)
+
+
+def test_does_not_copy():
+    """
+    A lookup into a numpy array should work without slicing it
+    """
+    array = np.arange(1_000_000, dtype=float)
+
+    (actual_index, actual_value) = closest_sorted_array_search(
+        array=array, target=123456.7
+    )
+
+    assert actual_index == 123457
+    assert actual_value == 123457.0
+
+
+def test_batch_matches_scalar():
+    """
+    The batched search returns the same indices and values as the scalar one
+    """
+    array = [0.0, 1.0, 1.0, 2.5, 4.0, 7.0, 7.5, 10.0]
+    targets = np.linspace(-2.0, 12.0, 57)
+
+    (actual_indices, actual_values) = closest_sorted_array_search_batch(
+        array=array, targets=targets
+    )
+
+    for target, actual_index, actual_value in zip(
+        targets, actual_indices, actual_values
+    ):
+        assert (actual_index, actual_value) == closest_sorted_array_search(
+            array=array, target=target
+        )
+
+
+def test_batch_empty_array():
+    """
+    An empty array cannot be searched
+    """
+    with pytest.raises(ValueError):
+        closest_sorted_array_search_batch(array=[], targets=[1.0])
@@ -3,9 +3,13 @@ This module tests the find_integral_bound function.
 """
 
 from math import sqrt, inf
-from typing import Callable
+from typing import Callable, List
 import pytest
-from sumgraph.helper.find_integral_bound import find_integral_bound
+from sumgraph.helper.find_integral_bound import (
+    CumulativeIntegral,
+    find_integral_bound,
+    find_integral_bounds,
+)
 
 
 def test_basic():
@@ -94,3 +98,122 @@ def test_max_iterations():
             target_value=target_value,
             numerical_options={"max_iterations": 1},
         )
+
+
+def test_cumulative_integral_reuses_known_limits():
+    """
+    Ensure that the cumulative integral only integrates new sub-intervals
+    """
+
+    evaluated_points: List[float] = []
+
+    def integrable_function(input_x: float) -> float:
+        evaluated_points.append(input_x)
+        return 2 * input_x
+
+    get_integral_value = CumulativeIntegral(
+        integrable_function=integrable_function, lower_bound=1
+    )
+
+    (value, _) = get_integral_value(4)
+    assert pytest.approx(value) == 15  # type: ignore
+
+    evaluated_points.clear()
+    (value, _) = get_integral_value(3)
+    assert pytest.approx(value) == 8  # type: ignore
+    assert min(evaluated_points) >= 1 and max(evaluated_points) <= 3
+
+    evaluated_points.clear()
+    (value, _) = get_integral_value(3.5)
+    assert pytest.approx(value) == 11.25  # type: ignore
+    assert min(evaluated_points) >= 3 and max(evaluated_points) <= 3.5
+
+    evaluated_points.clear()
+    (value, _) = get_integral_value(4)
+    assert pytest.approx(value) == 15  # type: ignore
+    assert not evaluated_points
+
+
+def test_batch_matches_single_queries():
+    """
+    Ensure that the batched solver agrees with one call per query
+    """
+
+    integrable_function: Callable[[float], float] = lambda x: x
+
+    lower_bounds = [0, 1, 2.5, 10]
+    target_values = [1, 2, 0.5, 40]
+
+    actual_upper_bounds = find_integral_bounds(
+        integrable_functions=integrable_function,
+        lower_bounds=lower_bounds,
+        target_values=target_values,
+        numerical_options={"tolerance": 0.0000001},
+    )
+
+    for actual_upper_bound, lower_bound, target_value in zip(
+        actual_upper_bounds, lower_bounds, target_values
+    ):
+        assert pytest.approx(actual_upper_bound) == sqrt(  # type: ignore
+            lower_bound**2 + 2 * target_value
+        )
+
+
+def test_batch_many_integrands():
+    """
+    Ensure that every query is solved against its own integrand
+    """
+
+    def indicator_fn(input_x: float) -> float:
+        """
+        A basic indicator function
+        """
+        if 5 <= input_x <= 10:
+            return 1
+
+        return 0
+
+    constant_fn: Callable[[float], float] = lambda _: 2
+
+    actual_upper_bounds = find_integral_bounds(
+        integrable_functions=[indicator_fn, constant_fn, indicator_fn],
+        lower_bounds=[0, 0, 6],
+        target_values=1,
+        numerical_options={"tolerance": 0.0000001},
+    )
+
+    assert pytest.approx(list(actual_upper_bounds)) == [6, 0.5, 7]  # type: ignore
+
+
+def test_batch_infinite_bound():
+    """
+    Ensure that infinity is returned only for queries that exceed the max bound
+    """
+
+    integrable_function: Callable[[float], float] = lambda x: x
+
+    actual_upper_bounds = find_integral_bounds(
+        integrable_functions=integrable_function,
+        lower_bounds=[0, 0],
+        target_values=[2, 100],
+        numerical_options={"max_upper_bound": 5},
+    )
+
+    assert pytest.approx(actual_upper_bounds[0], abs=0.001) == 2  # type: ignore
+    assert actual_upper_bounds[1] == inf
+
+
+def test_batch_max_iterations():
+    """
+    Ensure that a proper warning is raised when max iterations would be reached
+    """
+
+    integrable_function: Callable[[float], float] = lambda x: x
+
+    with pytest.raises(RuntimeWarning):
+        find_integral_bounds(
+            integrable_functions=integrable_function,
+            lower_bounds=[0],
+            target_values=[100],
+            numerical_options={"max_iterations": 1},
+        )
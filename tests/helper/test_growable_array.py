@@ -0,0 +1,36 @@
+"""
+This module tests the GrowableArray buffer
+"""
+
+import numpy as np
+import pytest
+from sumgraph.helper.growable_array import GrowableArray
+
+
+def test_append_and_finish():
+    """
+    Verify that appended blocks come back in order after the buffer grows
+    """
+
+    buffer = GrowableArray(column_count=2, initial_capacity=2)
+    blocks = [np.arange(2 * rows, dtype=float).reshape(rows, 2) for rows in [1, 3, 5]]
+    for block in blocks:
+        buffer.append(block)
+
+    assert len(buffer) == 9
+    assert buffer.capacity >= 9
+
+    array = buffer.finish()
+    assert array.shape == (9, 2)
+    np.testing.assert_array_equal(array, np.concatenate(blocks))
+
+
+def test_append_validates_columns():
+    """
+    Verify that rows with the wrong number of columns are rejected
+    """
+
+    buffer = GrowableArray(column_count=2)
+
+    with pytest.raises(ValueError):
+        buffer.append(np.zeros((3, 3)))
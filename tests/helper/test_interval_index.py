@@ -0,0 +1,132 @@
+"""
+This module tests the IntervalIndex
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sumgraph.data_handler.data_accessor.connections_soap_accessor import (
+    ConnectionsSoapAccessor,
+)
+from sumgraph.helper.interval_index import IntervalIndex
+
+
+def test_from_connections_merges_windows():
+    """
+    Verify that the windows stored under both directions of a pair, and
+    windows that overlap or touch, are merged, and that empty windows are
+    dropped
+    """
+
+    dataframe = pd.DataFrame(
+        {
+            "Analysis": ["A sees B", "B sees A", "A sees B", "A sees C", "B sees C"],
+            "Rise": [0.0, 5.0, 20.0, 3.0, 7.0],
+            "Set": [10.0, 20.0, 30.0, 3.0, 9.0],
+        }
+    )
+    data = ConnectionsSoapAccessor.convert_dataframe_to_data(dataframe)
+    index = IntervalIndex.from_connections(data["connections"])
+
+    assert index.interval_count == 2
+    for pair in [("A", "B"), ("B", "A")]:
+        (starts, ends) = index.get_intervals(*pair)
+        np.testing.assert_array_equal(starts, [0.0])
+        np.testing.assert_array_equal(ends, [30.0])
+
+    assert len(index.get_intervals("A", "C")[0]) == 0
+    assert not index.is_active("C", "A", 3.0)
+    np.testing.assert_array_equal(index.get_intervals("C", "B")[0], [7.0])
+
+
+def test_point_queries_are_half_open():
+    """
+    Verify that a pair is linked from the start of a window up to, but not
+    at, its end
+    """
+
+    index = IntervalIndex.from_connections(
+        {"A": {"B": [(0.0, 10.0), (20.0, 30.0)]}, "B": {"A": [(20.0, 30.0)]}}
+    )
+
+    assert index.is_active("A", "B", 0.0)
+    assert index.is_active("B", "A", 25.0)
+    assert not index.is_active("A", "B", 10.0)
+    assert not index.is_active("A", "B", -1.0)
+    assert not index.is_active("A", "B", 30.0)
+    np.testing.assert_array_equal(
+        index.are_active("A", "B", np.array([-5.0, 0.0, 9.5, 10.0, 20.0, 35.0])),
+        [False, True, True, False, True, False],
+    )
+
+    assert index.active_pairs(0.0) == [("A", "B")]
+    assert index.active_pairs(10.0) == []
+    assert index.active_pairs_in_window(10.0, 20.0) == []
+    assert index.active_pairs_in_window(10.0, 20.5) == [("A", "B")]
+
+
+def test_queries_match_brute_force():
+    """
+    Verify that the pairs linked at a time or during a window are the ones a
+    scan of every window finds
+    """
+
+    rng = np.random.default_rng(0)
+    pair_count = 50
+    pair_ids = rng.integers(0, pair_count, size=1000)
+    starts = rng.uniform(0.0, 1000.0, size=1000).round()
+    ends = starts + rng.uniform(0.0, 30.0, size=1000).round()
+    index = IntervalIndex(
+        [("S%d" % pair_id, "T%d" % pair_id) for pair_id in range(pair_count)],
+        pair_ids,
+        starts,
+        ends,
+    )
+
+    for time in rng.uniform(-10.0, 1040.0, size=50).round().tolist() + [0.0]:
+        expected = np.unique(pair_ids[(starts <= time) & (time < ends)])
+        np.testing.assert_array_equal(index.active_pair_ids(time), expected)
+
+    for window_start in rng.uniform(-10.0, 1040.0, size=50).round().tolist():
+        window_end = window_start + 5.0
+        expected = np.unique(
+            pair_ids[(starts < window_end) & (window_start < ends) & (starts < ends)]
+        )
+        np.testing.assert_array_equal(
+            index.active_pair_ids_in_window(window_start, window_end), expected
+        )
+
+
+def test_validation():
+    """
+    Verify that arrays of different lengths and windows that end before they
+    start are rejected
+    """
+
+    with pytest.raises(ValueError):
+        IntervalIndex([("A", "B")], np.zeros(2), np.zeros(2), np.zeros(1))
+
+    index = IntervalIndex([("A", "B")], np.zeros(1), np.zeros(1), np.ones(1))
+    with pytest.raises(ValueError):
+        index.find_intervals(1.0, 0.0)
+
+
+@pytest.mark.parametrize(
+    "connections",
+    [{}, {"A": {"B": [(3.0, 3.0)]}, "B": {"A": [(5.0, 5.0)], "C": [(7.0, 7.0)]}}],
+)
+def test_empty_index(connections):
+    """
+    Verify that an index with no connections, or with only empty windows,
+    finds nothing
+    """
+
+    index = IntervalIndex.from_connections(connections)
+
+    assert index.interval_count == 0
+    np.testing.assert_array_equal(index.offsets, np.zeros(len(index.pairs) + 1))
+    assert index.active_pairs(3.0) == []
+    assert index.active_pairs_in_window(0.0, 10.0) == []
+    assert len(index.find_intervals(0.0, 10.0)) == 0
+    for pair in index.pairs:
+        assert not index.are_active(*pair, np.array([3.0, 5.0, 7.0])).any()
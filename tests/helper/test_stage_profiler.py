@@ -0,0 +1,30 @@
+"""
+This module tests the stage profiler
+"""
+
+import pytest
+from sumgraph.helper.stage_profiler import StageProfiler
+
+
+def test_stages():
+    """
+    Verify that every stage is recorded in order, even one that fails, and
+    reported on its own line
+    """
+
+    profiler = StageProfiler()
+
+    with profiler.stage("read", "rows") as record:
+        record["items"] = 10
+
+    with pytest.raises(ValueError):
+        with profiler.stage("write", "rows"):
+            raise ValueError("failed")
+
+    assert [record["name"] for record in profiler.records] == ["read", "write"]
+    assert profiler.records[0]["items"] == 10
+    assert all(record["seconds"] >= 0 for record in profiler.records)
+
+    report = profiler.format_report().splitlines()
+    assert len(report) == 3
+    assert report[1].startswith("read")
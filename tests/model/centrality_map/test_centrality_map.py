@@ -0,0 +1,42 @@
+"""
+This module tests the CentralityMap class
+"""
+
+import pytest
+from sumgraph.model.centrality_map.centrality_map import (
+    DEFAULT_VERTEX_WEIGHT,
+    CentralityMap,
+)
+
+
+def test_add_vertex():
+    """
+    Verify that an added vertex starts with the default weight
+    """
+
+    centrality_map = CentralityMap(name="test")
+    centrality_map.add_vertex("A")
+
+    assert centrality_map.get_vertex_weight("A") == DEFAULT_VERTEX_WEIGHT
+
+    centrality_map.set_vertex_weight("A", 2.5)
+    assert centrality_map.get_vertex_weight("A") == 2.5
+
+    with pytest.raises(ValueError):
+        centrality_map.add_vertex("A")
+
+    with pytest.raises(ValueError):
+        centrality_map.get_vertex_weight("B")
+
+
+def test_from_vertex_weights():
+    """
+    Verify that a map can be built in bulk
+    """
+
+    centrality_map = CentralityMap.from_vertex_weights(
+        name="test", vertex_weights={"A": 1.0, "B": 2.0}
+    )
+
+    assert centrality_map.vertex_set == {"A", "B"}
+    assert centrality_map.get_vertex_weight("B") == 2.0
@@ -2,10 +2,15 @@
 This module tests the DynamicWeightedGraph class for all operations
 """
 
+import math
+import numpy as np
 from sumgraph.model.dynamic_weighted_graph.convention_enum import ConventionEnum
 from sumgraph.model.dynamic_weighted_graph.dynamic_weighted_graph import (
     DynamicWeightedGraph,
 )
+from sumgraph.model.dynamic_weighted_graph.nearest_sample_edge_weight_fn import (
+    NearestSampleEdgeWeightFn,
+)
 
 
 def test_constructor():
@@ -19,3 +24,102 @@ def test_constructor():
     assert dwg.name == "test"
     assert dwg.convention == ConventionEnum.CAPACITY
     assert dwg.directed is True
+
+
+def test_get_edges_undirected():
+    """
+    Verify that an undirected edge is only listed once
+    """
+
+    dwg = DynamicWeightedGraph(name="test")
+    for vertex in ["A", "B", "C"]:
+        dwg.add_vertex(vertex)
+
+    dwg.define_edge_weight(
+        source_vertex="A", target_vertex="B", weight_function=lambda t: t
+    )
+    dwg.define_edge_weight(
+        source_vertex="C", target_vertex="B", weight_function=lambda t: 2 * t
+    )
+
+    assert dwg.get_edges() == [("A", "B"), ("B", "C")]
+
+
+def test_evaluate_edge_weights():
+    """
+    Verify that edge weights are evaluated over a grid of times in one call
+    """
+
+    dwg = DynamicWeightedGraph(name="test", directed=True)
+    for vertex in ["A", "B", "C"]:
+        dwg.add_vertex(vertex)
+
+    dwg.define_edge_weight(
+        source_vertex="A", target_vertex="B", weight_function=lambda t: t
+    )
+    dwg.define_edge_weight(
+        source_vertex="B",
+        target_vertex="C",
+        weight_function=NearestSampleEdgeWeightFn(
+            sample_times=[0.0, 10.0], samples=[1.0, 2.0]
+        ),
+    )
+
+    times = [0.0, 4.0, 6.0]
+    weights = dwg.evaluate_edge_weights(
+        times=times, edges=[("A", "B"), ("B", "C"), ("C", "A")]
+    )
+
+    assert weights.shape == (3, 3)
+    np.testing.assert_array_equal(weights[0], [0.0, 4.0, 6.0])
+    np.testing.assert_array_equal(weights[1], [1.0, 1.0, 2.0])
+    np.testing.assert_array_equal(weights[2], [math.inf, math.inf, math.inf])
+
+
+def test_snapshot():
+    """
+    Verify that a snapshot is a dense matrix with convention defaults
+    """
+
+    dwg = DynamicWeightedGraph(name="test")
+    for vertex in ["C", "A", "B"]:
+        dwg.add_vertex(vertex)
+
+    dwg.define_edge_weight(
+        source_vertex="A", target_vertex="C", weight_function=lambda t: t + 1
+    )
+
+    vertex_index = dwg.get_vertex_index()
+    snapshot = dwg.snapshot(time=2.0)
+
+    assert vertex_index == {"A": 0, "B": 1, "C": 2}
+    np.testing.assert_array_equal(
+        snapshot,
+        [
+            [math.inf, math.inf, 3.0],
+            [math.inf, math.inf, math.inf],
+            [3.0, math.inf, math.inf],
+        ],
+    )
+
+
+def test_snapshots_directed_capacity():
+    """
+    Verify that stacked snapshots respect direction and capacity defaults
+    """
+
+    dwg = DynamicWeightedGraph(
+        name="test", convention=ConventionEnum.CAPACITY, directed=True
+    )
+    for vertex in ["A", "B"]:
+        dwg.add_vertex(vertex)
+
+    dwg.define_edge_weight(
+        source_vertex="B", target_vertex="A", weight_function=lambda t: 10 * t
+    )
+
+    snapshots = dwg.snapshots(times=[1.0, 2.0, 3.0])
+
+    assert snapshots.shape == (3, 2, 2)
+    np.testing.assert_array_equal(snapshots[:, 1, 0], [10.0, 20.0, 30.0])
+    np.testing.assert_array_equal(snapshots[:, 0, 1], [0.0, 0.0, 0.0])
@@ -0,0 +1,50 @@
+"""
+This module tests the edge weight function helpers
+"""
+
+import math
+import numpy as np
+from sumgraph.model.dynamic_weighted_graph.convention_enum import ConventionEnum
+from sumgraph.model.dynamic_weighted_graph.edge_weight_fn import (
+    ConstantEdgeWeightFn,
+    evaluate_edge_weight_fn,
+    get_default_edge_weight_fn,
+)
+
+
+def test_default_edge_weights():
+    """
+    Verify that the defaults work on both single times and arrays of times
+    """
+
+    traversal_time_fn = get_default_edge_weight_fn(ConventionEnum.TRAVERSAL_TIME)
+    capacity_fn = get_default_edge_weight_fn(ConventionEnum.CAPACITY)
+    times = np.array([0.0, 1.0, 2.0])
+
+    assert traversal_time_fn(1.0) == math.inf
+    assert capacity_fn(1.0) == 0
+    np.testing.assert_array_equal(
+        evaluate_edge_weight_fn(traversal_time_fn, times), [math.inf] * 3
+    )
+    np.testing.assert_array_equal(evaluate_edge_weight_fn(capacity_fn, times), [0] * 3)
+
+
+def test_constant_edge_weight_fn():
+    """
+    Verify that a constant edge weight function keeps the shape of its input
+    """
+
+    weight_fn = ConstantEdgeWeightFn(3.0)
+
+    assert weight_fn(10.0) == 3.0
+    assert weight_fn.evaluate(np.zeros((2, 4))).shape == (2, 4)
+
+
+def test_evaluate_scalar_fallback():
+    """
+    Verify that plain scalar callables are evaluated one time at a time
+    """
+
+    weights = evaluate_edge_weight_fn(lambda t: t**2, np.array([1.0, 2.0, 3.0]))
+
+    np.testing.assert_array_equal(weights, [1.0, 4.0, 9.0])
@@ -0,0 +1,79 @@
+"""
+This module tests the IntervalEdgeWeightFn
+"""
+
+import numpy as np
+import pytest
+from sumgraph.model.dynamic_weighted_graph.interval_edge_weight_fn import (
+    IntervalEdgeWeightFn,
+)
+
+
+def test_scalar_and_vectorized_agree():
+    """
+    Verify that the edge is up from the start of every interval up to, but
+    not at, its end, one time at a time and over an array
+    """
+
+    weight_fn = IntervalEdgeWeightFn(starts=[0.0, 20.0], ends=[10.0, 30.0])
+
+    assert weight_fn(-1.0) == 0.0
+    assert weight_fn(0.0) == 1.0
+    assert weight_fn(10.0) == 0.0
+    assert weight_fn(29.9) == 1.0
+    assert weight_fn(30.0) == 0.0
+
+    times = np.linspace(-10, 40, 501)
+    expected = np.array([weight_fn(time) for time in times])
+    np.testing.assert_array_equal(weight_fn.evaluate(times), expected)
+
+
+def test_integrals():
+    """
+    Verify that the integral counts the time the edge is up, and that its
+    inverse finds when a given amount of up time has passed
+    """
+
+    weight_fn = IntervalEdgeWeightFn(starts=[0.0, 20.0], ends=[10.0, 30.0])
+
+    np.testing.assert_allclose(
+        weight_fn.cumulative_integral(np.array([-5.0, 5.0, 15.0, 25.0, 50.0])),
+        [0.0, 5.0, 10.0, 15.0, 20.0],
+    )
+    np.testing.assert_allclose(
+        weight_fn.find_integral_bounds(np.array([5.0, 12.0]), np.array([10.0, 5.0])),
+        [25.0, 25.0],
+    )
+    assert weight_fn.find_integral_bounds(np.array([0.0]), np.array([21.0]))[
+        0
+    ] == pytest.approx(np.inf)
+
+
+def test_custom_values_and_no_intervals():
+    """
+    Verify that the values while up and down can be chosen, and that an edge
+    without intervals is always down
+    """
+
+    weight_fn = IntervalEdgeWeightFn(
+        starts=[0.0], ends=[1.0], up_value=5.0, down_value=np.inf
+    )
+    np.testing.assert_array_equal(weight_fn.evaluate(np.array([0.5, 2.0])), [5, np.inf])
+
+    never_up = IntervalEdgeWeightFn(starts=[], ends=[])
+    np.testing.assert_array_equal(never_up.evaluate(np.array([0.0, 1.0])), [0, 0])
+
+
+def test_validation():
+    """
+    Verify that mismatched, empty, unsorted or touching intervals are rejected
+    """
+
+    for starts, ends in [
+        ([0.0], []),
+        ([1.0], [1.0]),
+        ([5.0, 0.0], [6.0, 1.0]),
+        ([0.0, 1.0], [1.0, 2.0]),
+    ]:
+        with pytest.raises(ValueError):
+            IntervalEdgeWeightFn(starts=starts, ends=ends)
@@ -0,0 +1,44 @@
+"""
+This module tests the NearestSampleEdgeWeightFn
+"""
+
+import numpy as np
+import pytest
+from sumgraph.model.dynamic_weighted_graph.nearest_sample_edge_weight_fn import (
+    NearestSampleEdgeWeightFn,
+)
+
+
+def test_scalar_and_vectorized_agree():
+    """
+    Verify that evaluating one time at a time matches evaluating an array
+    """
+
+    sample_times = np.linspace(0, 100, 37)
+    samples = np.sin(sample_times)
+    weight_fn = NearestSampleEdgeWeightFn(sample_times=sample_times, samples=samples)
+
+    times = np.linspace(-10, 110, 1001)
+    expected = np.array([weight_fn(time) for time in times])
+
+    np.testing.assert_array_equal(weight_fn.evaluate(times), expected)
+
+
+def test_single_sample():
+    """
+    Verify that a single sample is returned for every time
+    """
+
+    weight_fn = NearestSampleEdgeWeightFn(sample_times=[5.0], samples=[2.0])
+
+    assert weight_fn(0.0) == 2.0
+    np.testing.assert_array_equal(weight_fn.evaluate(np.array([0.0, 9.0])), [2, 2])
+
+
+def test_mismatched_lengths():
+    """
+    Verify that sample times and samples must have the same length
+    """
+
+    with pytest.raises(ValueError):
+        NearestSampleEdgeWeightFn(sample_times=[1.0, 2.0], samples=[1.0])
@@ -0,0 +1,130 @@
+"""
+This module tests the piecewise edge weight functions
+"""
+
+from math import inf
+import numpy as np
+import pytest
+from scipy import integrate  # type: ignore
+from sumgraph.helper.find_integral_bound import (
+    find_integral_bound,
+    find_integral_bounds,
+)
+from sumgraph.model.dynamic_weighted_graph.nearest_sample_edge_weight_fn import (
+    NearestSampleEdgeWeightFn,
+)
+from sumgraph.model.dynamic_weighted_graph.piecewise_edge_weight_fn import (
+    PiecewiseConstantEdgeWeightFn,
+    PiecewiseLinearEdgeWeightFn,
+)
+
+
+def test_piecewise_constant_evaluate():
+    """
+    Verify that values switch at each breakpoint
+    """
+    weight_fn = PiecewiseConstantEdgeWeightFn(breakpoints=[5, 10], values=[0, 1, 2])
+
+    np.testing.assert_array_equal(
+        weight_fn.evaluate(np.array([0, 4.9, 5, 9.9, 10, 20])), [0, 0, 1, 1, 2, 2]
+    )
+    assert weight_fn(7) == 1
+
+
+def test_piecewise_constant_integral():
+    """
+    Verify the exact cumulative integral and its inverse
+    """
+    weight_fn = PiecewiseConstantEdgeWeightFn(breakpoints=[5, 10], values=[1, 0, 2])
+    times = np.array([0.0, 5.0, 7.0, 10.0, 12.0])
+
+    np.testing.assert_allclose(
+        weight_fn.cumulative_integral(times), [-5.0, 0.0, 0.0, 0.0, 4.0]
+    )
+    np.testing.assert_allclose(
+        weight_fn.inverse_cumulative_integral(np.array([-5.0, -1.0, 0.5, 4.0])),
+        [0.0, 4.0, 10.25, 12.0],
+    )
+
+
+def test_piecewise_constant_without_breakpoints():
+    """
+    Verify that a function without breakpoints is constant
+    """
+    weight_fn = PiecewiseConstantEdgeWeightFn(breakpoints=[], values=[3])
+
+    assert weight_fn(-100) == 3
+    assert weight_fn.find_integral_bounds(np.array([1.0]), np.array([6.0]))[0] == 3
+
+
+def test_piecewise_constant_never_reached():
+    """
+    Verify that a target past a final zero value is never reached
+    """
+    weight_fn = PiecewiseConstantEdgeWeightFn(breakpoints=[0, 1], values=[0, 1, 0])
+
+    np.testing.assert_array_equal(
+        weight_fn.find_integral_bounds(np.array([0.0, 0.0]), np.array([0.5, 2.0])),
+        [0.5, inf],
+    )
+
+
+def test_piecewise_linear_integral():
+    """
+    Verify the exact cumulative integral and its inverse against quadrature
+    """
+    weight_fn = PiecewiseLinearEdgeWeightFn(
+        knots=[0, 2, 5, 6], values=[1.0, 3.0, 0.0, 2.0]
+    )
+    times = np.linspace(-1, 8, 37)
+
+    expected = [
+        integrate.quad(weight_fn, 0, time, points=[2, 5, 6])[0] for time in times
+    ]
+    actual = weight_fn.cumulative_integral(times)
+    np.testing.assert_allclose(actual, expected, atol=1e-9)
+
+    np.testing.assert_allclose(
+        weight_fn.inverse_cumulative_integral(actual[actual > 0]),
+        times[actual > 0],
+        atol=1e-9,
+    )
+
+
+def test_find_integral_bound_uses_exact_path():
+    """
+    Verify that find_integral_bound solves piecewise functions exactly
+    """
+    weight_fn = PiecewiseConstantEdgeWeightFn(breakpoints=[5, 10], values=[0, 1, 0])
+
+    assert find_integral_bound(weight_fn, lower_bound=0, target_value=1) == 6
+    assert find_integral_bound(weight_fn, lower_bound=0, target_value=10) == inf
+    assert (
+        find_integral_bound(
+            weight_fn,
+            lower_bound=0,
+            target_value=1,
+            numerical_options={"max_upper_bound": 5.5},
+        )
+        == inf
+    )
+
+    upper_bounds = find_integral_bounds(
+        [weight_fn, weight_fn, weight_fn, lambda t: 1],
+        lower_bounds=[0, 7, 7, 0],
+        target_values=[1, 2, 4, 2],
+    )
+    np.testing.assert_array_equal(upper_bounds[:3], [6, 9, inf])
+    assert pytest.approx(upper_bounds[3], abs=1e-4) == 2  # type: ignore
+
+
+def test_nearest_sample_integral():
+    """
+    Verify that nearest-sample functions integrate as step functions
+    """
+    weight_fn = NearestSampleEdgeWeightFn(sample_times=[0, 10, 20], samples=[1, 2, 3])
+
+    np.testing.assert_allclose(
+        weight_fn.cumulative_integral(np.array([5.0, 15.0, 30.0])), [0.0, 20.0, 65.0]
+    )
+    assert find_integral_bound(weight_fn, lower_bound=0, target_value=20) == 12.5
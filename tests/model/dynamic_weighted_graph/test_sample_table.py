@@ -0,0 +1,74 @@
+"""
+This module tests the SampleTable
+"""
+
+import numpy as np
+import pytest
+from sumgraph.helper.closest_sorted_array_search import closest_sorted_array_search
+from sumgraph.model.dynamic_weighted_graph.sample_table import SampleTable
+
+
+def test_resolve_matches_search():
+    """
+    Verify that a time resolves to the closest sample time, with the same
+    tie-breaking as closest_sorted_array_search, whether it was queried before
+    or not
+    """
+
+    sample_times = np.array([0.0, 10.0, 20.0, 30.0])
+    table = SampleTable(sample_times, np.arange(8.0).reshape(4, 2))
+
+    times = np.array([-5.0, 5.0, 14.0, 15.0, 25.0, 40.0])
+    expected = [
+        closest_sorted_array_search(array=sample_times, target=time)[0]
+        for time in times
+    ]
+    for _ in range(2):
+        assert [table.resolve(time) for time in times] == expected
+
+    np.testing.assert_array_equal(table.resolve_batch(times), expected)
+
+
+def test_resolved_times_are_bounded():
+    """
+    Verify that only the most recently queried times are remembered
+    """
+
+    table = SampleTable([0.0, 1.0], np.zeros((2, 1)), resolved_time_count=2)
+    for time in [0.0, 1.0, 0.0, 2.0]:
+        table.resolve(time)
+
+    # pylint: disable=protected-access
+    assert list(table._resolved_times) == [0.0, 2.0]
+
+
+def test_row_and_columns():
+    """
+    Verify that a row holds the sample of every edge at a time, and that
+    columns are gathered as an (edges x times) array
+    """
+
+    samples = np.array([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]], dtype=np.float32)
+    table = SampleTable([0.0, 10.0], samples)
+
+    assert table.column_count == 3
+    np.testing.assert_array_equal(table.row(8.0), [4.0, 5.0, 6.0])
+    assert table.row(8.0).dtype == np.float64
+
+    times = np.array([0.0, 9.0, 2.0])
+    np.testing.assert_array_equal(
+        table.evaluate_columns(times, [2, 0]), [[3, 6, 3], [1, 4, 1]]
+    )
+    assert table.evaluate_columns(times).shape == (3, 3)
+
+
+def test_shape_validation():
+    """
+    Verify that samples must have one row per sample time
+    """
+
+    with pytest.raises(ValueError):
+        SampleTable([0.0, 1.0], np.zeros((3, 2)))
+
+    with pytest.raises(ValueError):
+        SampleTable([0.0, 1.0], np.zeros(2))
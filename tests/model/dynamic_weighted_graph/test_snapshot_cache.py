@@ -0,0 +1,131 @@
+"""
+This module tests the SnapshotCache and its use by DynamicWeightedGraph
+"""
+
+import numpy as np
+import pytest
+from sumgraph.model.dynamic_weighted_graph.dynamic_weighted_graph import (
+    DynamicWeightedGraph,
+)
+from sumgraph.model.dynamic_weighted_graph.snapshot_cache import SnapshotCache
+
+
+def build_counting_graph():
+    """
+    Build a graph with a single edge whose weight is the time, along with the
+    list of times the edge was evaluated at
+    """
+
+    calls = []
+
+    def weight_function(time: float) -> float:
+        calls.append(time)
+        return time
+
+    dwg = DynamicWeightedGraph(name="test")
+    for vertex in ["A", "B"]:
+        dwg.add_vertex(vertex)
+    dwg.define_edge_weight("A", "B", weight_function)
+
+    return (dwg, calls)
+
+
+def test_hits_and_misses():
+    """
+    Verify that a snapshot taken again comes from the cache, read-only, and
+    that snapshots only computes the times that are not cached
+    """
+
+    (dwg, calls) = build_counting_graph()
+    cache = dwg.enable_snapshot_cache()
+
+    first = dwg.snapshot(1.0)
+    assert dwg.snapshot(1.0) is first
+    assert not first.flags.writeable
+    assert calls == [1.0]
+
+    tensor = dwg.snapshots([1.0, 2.0, 2.0, 3.0])
+    assert calls == [1.0, 2.0, 3.0]
+    np.testing.assert_array_equal(tensor[:, 0, 1], [1.0, 2.0, 2.0, 3.0])
+    assert cache.stats == {
+        "hits": 2,
+        "misses": 3,
+        "evictions": 0,
+        "invalidations": 0,
+        "entries": 3,
+        "bytes": 3 * first.nbytes,
+    }
+
+
+def test_time_buckets():
+    """
+    Verify that every time in a bucket shares the snapshot taken at the start
+    of the bucket
+    """
+
+    (dwg, calls) = build_counting_graph()
+    dwg.enable_snapshot_cache(time_bucket=10.0)
+
+    assert dwg.snapshot(12.0)[0, 1] == 10.0
+    assert dwg.snapshot(19.5)[0, 1] == 10.0
+    assert dwg.snapshot(-0.5)[0, 1] == -10.0
+    assert calls == [10.0, -10.0]
+
+
+def test_eviction():
+    """
+    Verify that the least recently used snapshots are evicted once there are
+    too many of them or they take too many bytes
+    """
+
+    (dwg, calls) = build_counting_graph()
+    cache = dwg.enable_snapshot_cache(max_entries=2)
+    for time in [1.0, 2.0, 1.0, 3.0, 1.0, 2.0]:
+        dwg.snapshot(time)
+
+    assert calls == [1.0, 2.0, 3.0, 2.0]
+    assert cache.stats["evictions"] == 2
+
+    (dwg, calls) = build_counting_graph()
+    cache = dwg.enable_snapshot_cache(max_bytes=2 * dwg.snapshot(0.0).nbytes)
+    for time in [1.0, 2.0, 3.0, 1.0]:
+        dwg.snapshot(time)
+
+    assert calls == [0.0, 1.0, 2.0, 3.0, 1.0]
+    assert cache.stats["entries"] == 2
+    assert cache.stats["bytes"] <= 2 * dwg.snapshot(0.0).nbytes
+
+
+def test_invalidation():
+    """
+    Verify that adding a vertex or defining an edge weight drops every cached
+    snapshot
+    """
+
+    (dwg, calls) = build_counting_graph()
+    cache = dwg.enable_snapshot_cache()
+    dwg.snapshot(1.0)
+
+    dwg.add_vertex("C")
+    assert dwg.snapshot(1.0).shape == (3, 3)
+
+    dwg.define_edge_weight("B", "C", lambda time: 5.0)
+    assert dwg.snapshot(1.0)[1, 2] == 5.0
+
+    assert calls == [1.0, 1.0, 1.0]
+    assert cache.stats["invalidations"] == 2
+
+    dwg.disable_snapshot_cache()
+    assert dwg.snapshot(1.0).flags.writeable
+
+
+def test_validation():
+    """
+    Verify that budgets and buckets must be positive
+    """
+
+    with pytest.raises(ValueError):
+        SnapshotCache(max_entries=0)
+
+    with pytest.raises(ValueError):
+        SnapshotCache(time_bucket=0.0)
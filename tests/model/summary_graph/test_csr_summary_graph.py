@@ -0,0 +1,117 @@
+"""
+This module tests the CsrSummaryGraph class for all operations
+"""
+
+import numpy as np
+import pytest
+from sumgraph.model.summary_graph.csr_summary_graph import CsrSummaryGraph
+from sumgraph.model.summary_graph.summary_graph import SummaryGraph
+
+
+def build_graph() -> CsrSummaryGraph:
+    """
+    Build a small graph from COO triples
+    """
+    return CsrSummaryGraph.from_coo(
+        name="test",
+        vertices=["A", "B", "C", "D"],
+        sources=[2, 0, 0, 1],
+        targets=[0, 2, 1, 2],
+        weights=[5.0, 2.0, 1.0, 3.0],
+    )
+
+
+def test_from_coo():
+    """
+    Verify that the bulk builder produces sorted CSR arrays
+    """
+    graph = build_graph()
+
+    np.testing.assert_array_equal(graph.offsets, [0, 2, 3, 4, 4])
+    np.testing.assert_array_equal(graph.indices, [1, 2, 2, 0])
+    np.testing.assert_array_equal(graph.weights, [1.0, 2.0, 3.0, 5.0])
+
+
+def test_vertices_from_array():
+    """
+    Verify that the vertices can be given as a numpy array, even an empty one
+    """
+    graph = CsrSummaryGraph(name="test", vertices=np.array(["A", "B"]))
+
+    assert graph.vertices == ["A", "B"]
+    assert graph.vertex_index == {"A": 0, "B": 1}
+    assert CsrSummaryGraph(name="test", vertices=np.array([])).vertex_count == 0
+
+
+def test_from_coo_duplicate_edge():
+    """
+    Verify that an edge cannot be defined twice
+    """
+    with pytest.raises(ValueError):
+        CsrSummaryGraph.from_coo(
+            name="test",
+            vertices=["A", "B"],
+            sources=[0, 0],
+            targets=[1, 1],
+            weights=[1.0, 2.0],
+        )
+
+
+def test_public_methods():
+    """
+    Verify that the SummaryGraph methods work on top of the arrays
+    """
+    graph = build_graph()
+
+    assert graph.has_edge_weight(source_vertex="A", target_vertex="C")
+    assert graph.has_edge_weight(source_vertex="C", target_vertex="A")
+    assert not graph.has_edge_weight(source_vertex="D", target_vertex="A")
+    assert graph.get_edge_weight(source_vertex="B", target_vertex="C") == 3.0
+    assert graph.get_edge_weight(source_vertex="D", target_vertex="A") == 0
+
+    graph.add_vertex("E")
+    graph.set_edge_weight(source_vertex="B", target_vertex="A", weight=7.0)
+    graph.set_edge_weight(source_vertex="E", target_vertex="D", weight=4.0)
+
+    assert graph.get_edge_weight(source_vertex="B", target_vertex="A") == 7.0
+    assert graph.get_edge_weight(source_vertex="E", target_vertex="D") == 4.0
+    assert graph.get_edge_weight(source_vertex="C", target_vertex="A") == 5.0
+
+    with pytest.raises(ValueError):
+        graph.set_edge_weight(source_vertex="A", target_vertex="B", weight=1.0)
+
+    with pytest.raises(ValueError):
+        graph.get_edge_weight(source_vertex="A", target_vertex="Z")
+
+
+def test_row_queries():
+    """
+    Verify row slicing, out-degree and weight-sum queries
+    """
+    graph = build_graph()
+
+    (row_indices, row_weights) = graph.get_row("A")
+    np.testing.assert_array_equal(row_indices, [1, 2])
+    np.testing.assert_array_equal(row_weights, [1.0, 2.0])
+
+    assert graph.out_degree("A") == 2
+    assert graph.weight_sum("A") == 3.0
+    np.testing.assert_array_equal(graph.out_degrees(), [2, 1, 1, 0])
+    np.testing.assert_array_equal(graph.weight_sums(), [3.0, 3.0, 5.0, 0.0])
+
+
+def test_summary_graph_round_trip():
+    """
+    Verify conversion to and from a dict-backed SummaryGraph
+    """
+    summary_graph = SummaryGraph(name="test")
+    for vertex in ["A", "B", "C"]:
+        summary_graph.add_vertex(vertex)
+    summary_graph.set_edge_weight(source_vertex="A", target_vertex="B", weight=1.5)
+    summary_graph.set_edge_weight(source_vertex="C", target_vertex="A", weight=2.5)
+
+    graph = CsrSummaryGraph.from_summary_graph(summary_graph)
+
+    assert graph.vertex_set == summary_graph.vertex_set
+    assert graph.edge_set == summary_graph.edge_set
+    assert graph.to_summary_graph().edge_set == summary_graph.edge_set
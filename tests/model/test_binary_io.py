@@ -0,0 +1,164 @@
+"""
+This module tests saving and loading graphs and centrality maps
+"""
+
+import numpy as np
+import pytest
+from sumgraph.data_handler.data_accessor.distances_soap_accessor import (
+    DistancesSoapAccessor,
+)
+from sumgraph.data_handler.data_adapter.distances_soap_to_dynamic_weighted_graph_adapter import (
+    DistancesSoapToDynamicWeightedGraphAdapter,
+)
+from sumgraph.model.binary_io import (
+    load_centrality_map,
+    load_dynamic_weighted_graph,
+    load_summary_graph,
+    save_centrality_map,
+    save_dynamic_weighted_graph,
+    save_summary_graph,
+)
+from sumgraph.model.centrality_map.centrality_map import CentralityMap
+from sumgraph.model.dynamic_weighted_graph.convention_enum import ConventionEnum
+from sumgraph.model.dynamic_weighted_graph.dynamic_weighted_graph import (
+    DynamicWeightedGraph,
+)
+from sumgraph.model.dynamic_weighted_graph.edge_weight_fn import ConstantEdgeWeightFn
+from sumgraph.model.dynamic_weighted_graph.interval_edge_weight_fn import (
+    IntervalEdgeWeightFn,
+)
+from sumgraph.model.dynamic_weighted_graph.nearest_sample_edge_weight_fn import (
+    NearestSampleEdgeWeightFn,
+)
+from sumgraph.model.dynamic_weighted_graph.piecewise_edge_weight_fn import (
+    PiecewiseConstantEdgeWeightFn,
+    PiecewiseLinearEdgeWeightFn,
+)
+from sumgraph.model.summary_graph.summary_graph import SummaryGraph
+
+
+FIXTURE_PATH = "tests/data_handler/data_accessor/$.fixture/sample_soap_distances.csv"
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_adapted_graph_round_trip(tmp_path, mmap):
+    """
+    Verify that a graph adapted from distances data comes back with the same
+    weights, and with its edges still sharing one sample table
+    """
+
+    dwg = DistancesSoapToDynamicWeightedGraphAdapter(
+        DistancesSoapAccessor(filepath=FIXTURE_PATH)
+    ).adapt()
+    filepath = str(tmp_path / "graph.bin")
+    save_dynamic_weighted_graph(dwg, filepath)
+
+    loaded = load_dynamic_weighted_graph(filepath, mmap=mmap)
+
+    assert loaded.name == dwg.name
+    assert loaded.vertex_set == dwg.vertex_set
+    assert loaded.get_edges() == dwg.get_edges()
+    times = np.linspace(-5, 120, 60)
+    np.testing.assert_array_equal(
+        loaded.evaluate_edge_weights(times), dwg.evaluate_edge_weights(times)
+    )
+    tables = {id(loaded.get_edge_weight_fn(*edge).table) for edge in loaded.get_edges()}
+    assert len(tables) == 1
+
+
+def test_every_kind_of_edge_round_trips(tmp_path):
+    """
+    Verify that every data-backed kind of edge weight function, the
+    convention and the direction of the graph come back as they were
+    """
+
+    dwg = DynamicWeightedGraph(
+        name="kinds", convention=ConventionEnum.CAPACITY, directed=True
+    )
+    for vertex in ["A", "B", "C"]:
+        dwg.add_vertex(vertex)
+    weight_functions = {
+        ("A", "B"): NearestSampleEdgeWeightFn([0.0, 10.0], [1.0, 2.0]),
+        ("B", "A"): PiecewiseConstantEdgeWeightFn([5.0, 8.0], [0.0, 3.0, 1.0]),
+        ("B", "C"): PiecewiseLinearEdgeWeightFn([0.0, 4.0, 9.0], [1.0, 5.0, 2.0]),
+        ("C", "A"): IntervalEdgeWeightFn([1.0, 6.0], [3.0, 7.0], up_value=4.0),
+        ("A", "C"): ConstantEdgeWeightFn(2.5),
+    }
+    for (source, target), weight_function in weight_functions.items():
+        dwg.define_edge_weight(source, target, weight_function)
+
+    filepath = str(tmp_path / "graph.bin")
+    save_dynamic_weighted_graph(dwg, filepath)
+    loaded = load_dynamic_weighted_graph(filepath)
+
+    assert loaded.convention == ConventionEnum.CAPACITY
+    assert loaded.directed
+    times = np.linspace(-2, 12, 57)
+    for (source, target), weight_function in weight_functions.items():
+        loaded_function = loaded.get_edge_weight_fn(source, target)
+        assert type(loaded_function) is type(weight_function)
+        np.testing.assert_array_equal(
+            loaded_function.evaluate(times), weight_function.evaluate(times)
+        )
+
+
+def test_closures_cannot_be_saved(tmp_path):
+    """
+    Verify that a graph with an edge weight function that is not backed by
+    data is rejected
+    """
+
+    dwg = DynamicWeightedGraph(name="closure")
+    for vertex in ["A", "B"]:
+        dwg.add_vertex(vertex)
+    dwg.define_edge_weight("A", "B", lambda time: time)
+
+    with pytest.raises(ValueError, match="not backed by data"):
+        save_dynamic_weighted_graph(dwg, str(tmp_path / "graph.bin"))
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_summary_graph_round_trip(tmp_path, mmap):
+    """
+    Verify that a summary graph comes back with the same edges, and can still
+    be changed after it is loaded
+    """
+
+    graph = SummaryGraph(name="summary")
+    for vertex in ["A", "B", "C"]:
+        graph.add_vertex(vertex)
+    graph.set_edge_weight("A", "B", 1.5)
+    graph.set_edge_weight("C", "A", 2.0)
+
+    filepath = str(tmp_path / "summary.bin")
+    save_summary_graph(graph, filepath)
+    loaded = load_summary_graph(filepath, mmap=mmap)
+
+    assert loaded.name == "summary"
+    assert loaded.to_summary_graph().edge_set == graph.edge_set
+
+    loaded.add_vertex("D")
+    loaded.set_edge_weight("A", "D", 3.0)
+    assert loaded.get_edge_weight("A", "D") == 3.0
+    assert load_summary_graph(filepath).edge_set == graph.edge_set
+
+
+def test_centrality_map_round_trip(tmp_path):
+    """
+    Verify that a centrality map comes back with the same vertex weights
+    """
+
+    centrality_map = CentralityMap.from_vertex_weights(
+        name="degree", vertex_weights={"A": 1.0, "B": 0.25, "C": 0.0}
+    )
+
+    filepath = str(tmp_path / "centrality.bin")
+    save_centrality_map(centrality_map, filepath)
+    loaded = load_centrality_map(filepath)
+
+    assert loaded.name == "degree"
+    assert loaded.vertex_weights == centrality_map.vertex_weights
+    assert loaded.vertex_set == centrality_map.vertex_set
+
+    with pytest.raises(ValueError, match="holds a centrality_map"):
+        load_summary_graph(filepath)
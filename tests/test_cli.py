@@ -0,0 +1,219 @@
+"""
+This module tests the batch pipeline CLI
+"""
+
+import csv
+import os
+import pytest
+from sumgraph.cli import main
+from sumgraph.model.binary_io import (
+    load_centrality_map,
+    load_dynamic_weighted_graph,
+    load_summary_graph,
+)
+
+
+FIXTURE_PATH = os.path.join(
+    os.path.dirname(__file__),
+    "data_handler",
+    "data_accessor",
+    "$.fixture",
+    "sample_soap_distances.csv",
+)
+
+# A SOAP connections report whose windows all lie between 0 and 50 seconds
+CONNECTIONS_REPORT = """SOAP Connections Report,
+Data for: 2021/08/01 00:00:00,
+
+Generated: 2021/08/14 12:00:00,
+Start: 0.0 Stop: 110.0,
+Analysis,Rise,Set,Duration,
+,Seconds,Seconds,Seconds,
+SatA sees SatB,0,10,10,
+SatB sees SatA,5,15,10,
+SatA sees SatB,40,50,10,
+SatB sees SatC,20,30,10,
+Analysis,SatA,SatB,SatC,
+"""
+
+
+def read_csv(filepath):
+    """
+    Read the rows of a CSV file
+    """
+
+    with open(filepath, encoding="utf-8", newline="") as file:
+        return list(csv.reader(file))
+
+
+def test_run(tmp_path, capsys):
+    """
+    Verify that run writes every output and, with --profile, reports every
+    stage
+    """
+
+    output_dir = str(tmp_path / "out")
+    status = main(
+        [
+            "run",
+            FIXTURE_PATH,
+            "--time-window",
+            "0",
+            "100",
+            "--satellites",
+            "SatA,SatB,SatC",
+            "--measure",
+            "strength",
+            "--output-dir",
+            output_dir,
+            "--profile",
+        ]
+    )
+
+    assert status == 0
+    assert sorted(os.listdir(output_dir)) == [
+        "centrality.bin",
+        "centrality.csv",
+        "graph.bin",
+        "summary.bin",
+        "summary.csv",
+    ]
+
+    dwg = load_dynamic_weighted_graph(os.path.join(output_dir, "graph.bin"))
+    assert dwg.vertex_set == {"SatA", "SatB", "SatC"}
+
+    summary_rows = read_csv(os.path.join(output_dir, "summary.csv"))
+    assert summary_rows[0] == ["source", "target", "weight"]
+    assert len(summary_rows) == 1 + 6
+
+    centrality_map = load_centrality_map(os.path.join(output_dir, "centrality.bin"))
+    centrality_rows = read_csv(os.path.join(output_dir, "centrality.csv"))
+    assert centrality_rows[0] == ["vertex", "weight"]
+    assert {
+        vertex: pytest.approx(float(weight)) for (vertex, weight) in centrality_rows[1:]
+    } == centrality_map.vertex_weights
+
+    report = capsys.readouterr().err.splitlines()
+    assert [line.split()[0] for line in report] == [
+        "stage",
+        "ingest",
+        "adapt",
+        "summarize",
+        "centrality",
+        "save",
+        "export",
+    ]
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        ["--time-window", "200", "300"],
+        ["--time-window", "0", "100", "--satellites", "SatA"],
+    ],
+)
+def test_run_without_connections(tmp_path, filters):
+    """
+    Verify that a connections run whose filters leave no windows gives a
+    summary without edges
+    """
+
+    output_dir = str(tmp_path / "out")
+    filepath = tmp_path / "connections.csv"
+    filepath.write_text(CONNECTIONS_REPORT, encoding="utf-8")
+    status = main(
+        ["run", str(filepath), "--source", "connections", "--output-dir", output_dir]
+        + filters
+        + ["--measure", "betweenness"]
+    )
+
+    assert status == 0
+    assert read_csv(os.path.join(output_dir, "summary.csv")) == [
+        ["source", "target", "weight"]
+    ]
+    assert all(
+        float(weight) == 0.0
+        for (_, weight) in read_csv(os.path.join(output_dir, "centrality.csv"))[1:]
+    )
+
+
+def test_steps(tmp_path):
+    """
+    Verify that running every step on its own gives the same outputs as run
+    """
+
+    graph_path = str(tmp_path / "graph.bin")
+    summary_path = str(tmp_path / "summary.bin")
+    centrality_path = str(tmp_path / "centrality.bin")
+    cache_dir = str(tmp_path / "cache")
+
+    assert (
+        main(["adapt", FIXTURE_PATH, "--cache-dir", cache_dir, "--output", graph_path])
+        == 0
+    )
+    assert (
+        main(
+            [
+                "summarize",
+                graph_path,
+                "--time-window",
+                "0",
+                "100",
+                "--reducer",
+                "existence-fraction",
+                "--output",
+                summary_path,
+            ]
+        )
+        == 0
+    )
+    assert main(["centrality", summary_path, "--output", centrality_path]) == 0
+    assert main(["export", summary_path, "--output", str(tmp_path / "s.csv")]) == 0
+
+    assert (
+        main(
+            [
+                "run",
+                FIXTURE_PATH,
+                "--cache-dir",
+                cache_dir,
+                "--time-window",
+                "0",
+                "100",
+                "--reducer",
+                "existence-fraction",
+                "--output-dir",
+                str(tmp_path / "out"),
+            ]
+        )
+        == 0
+    )
+
+    summary_graph = load_summary_graph(summary_path)
+    assert (
+        summary_graph.edge_set
+        == load_summary_graph(str(tmp_path / "out" / "summary.bin")).edge_set
+    )
+    assert (
+        load_centrality_map(centrality_path).vertex_weights
+        == load_centrality_map(str(tmp_path / "out" / "centrality.bin")).vertex_weights
+    )
+    assert len(read_csv(str(tmp_path / "s.csv"))) == 1 + summary_graph.edge_count
+
+
+def test_errors(tmp_path, capsys):
+    """
+    Verify that bad input ends the run with an error message and status 1
+    """
+
+    with pytest.raises(SystemExit) as error:
+        main(["adapt", str(tmp_path / "*.csv"), "--output", str(tmp_path / "g.bin")])
+
+    assert error.value.code == 1
+    assert "no files match" in capsys.readouterr().err
+
+    with pytest.raises(SystemExit) as error:
+        main(["export", FIXTURE_PATH, "--output", str(tmp_path / "out.csv")])
+
+    assert error.value.code == 1
+    assert "not a sumgraph binary file" in capsys.readouterr().err